@@ -26,9 +26,20 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import json
+import pickle
+import sqlite3
+import sys
 import time
 from collections import OrderedDict
+from copy import copy
+from os import makedirs
+from os.path import dirname
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from neon_utils.logger import LOG
 
 
 class LRUCache:
@@ -116,3 +127,797 @@ class LRUCache:
         data["missed"] = self.missed
         data["size"] = self._capacity
         return json.dumps(data)
+
+
+_MISSING = object()
+
+
+def _get_share(total: int, parts: int, index: int) -> int:
+    """
+    Get one part of `total` split into `parts` parts that sum to `total`
+    """
+    return total // parts + (1 if index < total % parts else 0)
+
+
+class _CacheShard:
+    """
+    A single LRU segment of a ShardedLRUCache, guarded by its own lock
+    """
+    def __init__(self, capacity: int, max_bytes: Optional[int]):
+        self.entries = OrderedDict()  # key: (value, expiration, size)
+        self.lock = Lock()
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.missed = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def remove(self, key):
+        _, _, size = self.entries.pop(key)
+        self.bytes -= size
+
+    def evict(self):
+        while len(self.entries) > self.capacity or \
+                (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "missed": self.missed,
+                "evictions": self.evictions, "expirations": self.expirations,
+                "entries": len(self.entries), "bytes": self.bytes}
+
+
+class ShardedLRUCache:
+    def __init__(self, capacity: int = 128, shards: int = 8,
+                 ttl: Optional[float] = None, max_bytes: Optional[int] = None,
+                 sizer: Callable[[Any], int] = sys.getsizeof):
+        """
+        Thread-safe LRU cache split into independently locked shards.
+        `capacity` and `max_bytes` are divided across shards, so each shard
+        holds its share of entries and the totals never exceed either limit.
+        Args:
+            capacity: max number of entries in the cache
+            shards: number of shards (locks) to split entries across, at
+                most `capacity`
+            ttl: default seconds an entry is valid for, None to never expire
+            max_bytes: max total size of cached values, None for no limit
+            sizer: function returning the size in bytes of a cached value
+        """
+        if shards < 1:
+            raise ValueError(f"Expected at least one shard, got: {shards}")
+        self._capacity = capacity
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._sizer = sizer
+        shards = max(min(shards, capacity), 1)
+        self._shards = [
+            _CacheShard(_get_share(capacity, shards, i),
+                        _get_share(max_bytes, shards, i)
+                        if max_bytes is not None else None)
+            for i in range(shards)]
+        self._init_time = time.time()
+
+    def _get_shard(self, key: Hashable) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def __len__(self):
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def __contains__(self, key):
+        shard = self._get_shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            return entry is not None and \
+                (entry[1] is None or entry[1] > time.monotonic())
+
+    @property
+    def hits(self):
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def missed(self):
+        return sum(shard.missed for shard in self._shards)
+
+    @property
+    def evictions(self):
+        return sum(shard.evictions for shard in self._shards)
+
+    @property
+    def stats(self) -> list:
+        """
+        Get a list of hit, miss, eviction, and size stats for each shard
+        """
+        stats = list()
+        for shard in self._shards:
+            with shard.lock:
+                stats.append(shard.stats())
+        return stats
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the value of the key from cache.
+        Args:
+            key: a key to look up in cache
+            default: value to return if the key is not cached or expired
+        Returns: value associated with the key or default
+        """
+        return self.get_with_ttl(key, default)[0]
+
+    def get_with_ttl(self, key: Hashable,
+                     default: Any = None) -> Tuple[Any, Optional[float]]:
+        """
+        Return the value of the key from cache and the seconds until it
+        expires.
+        Args:
+            key: a key to look up in cache
+            default: value to return if the key is not cached or expired
+        Returns: (value or default, seconds remaining or None if the entry
+            does not expire or is not cached)
+        """
+        shard = self._get_shard(key)
+        now = time.monotonic()
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.missed += 1
+                return default, None
+            if entry[1] is not None and entry[1] <= now:
+                shard.remove(key)
+                shard.expirations += 1
+                shard.missed += 1
+                return default, None
+            shard.hits += 1
+            shard.entries.move_to_end(key)
+            return entry[0], \
+                entry[1] - now if entry[1] not in (None, float("inf")) \
+                else None
+
+    def put(self, key: Hashable, value: Any,
+            ttl: Optional[float] = None) -> None:
+        """
+        Put a key-value pair into cache, evicting the least recently used
+        entries in the same shard if needed.
+        Args:
+            key: a key to put into cache
+            value: a value to put into cache
+            ttl: seconds this entry is valid for (default is the cache ttl)
+        """
+        ttl = ttl if ttl is not None else self._ttl
+        expiration = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizer(value) if self._max_bytes is not None else 0
+        shard = self._get_shard(key)
+        with shard.lock:
+            if key in shard.entries:
+                shard.remove(key)
+            if shard.max_bytes is not None and size > shard.max_bytes:
+                # Value can never fit in this shard
+                shard.evictions += 1
+                return
+            shard.entries[key] = (value, expiration, size)
+            shard.bytes += size
+            shard.evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Remove a key from cache
+        Args:
+            key: a key to remove from cache
+            default: value to return if the key is not cached
+        Returns: value associated with the removed key or default
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
+            if key not in shard.entries:
+                return default
+            value = shard.entries[key][0]
+            shard.remove(key)
+            return value
+
+    def items(self) -> list:
+        """
+        Get a list of (key, value) pairs for unexpired cache entries
+        """
+        now = time.monotonic()
+        items = list()
+        for shard in self._shards:
+            with shard.lock:
+                items.extend((key, value) for key, (value, expiration, _)
+                             in shard.entries.items()
+                             if expiration is None or expiration > now)
+        return items
+
+    def clear(self):
+        """
+        Clear all cached entries
+        """
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = 0
+
+    def clear_full(self):
+        """
+        Clear all cached entries, reset stats and initialization time
+        """
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = 0
+                shard.hits = shard.missed = 0
+                shard.evictions = shard.expirations = 0
+        self._init_time = time.time()
+
+    def jsonify(self):
+        """
+        Dump unexpired cache entries into json
+        Returns: json-string
+        """
+        return json.dumps(dict(self.items()))
+
+    def jsonify_metrics(self):
+        """
+        Dump cache metrics into json
+        Returns: json-string
+        """
+        data = dict()
+        data["cache"] = dict(self.items())
+        data["hits"] = self.hits
+        data["missed"] = self.missed
+        data["evictions"] = self.evictions
+        data["size"] = self._capacity
+        data["shards"] = self.stats
+        return json.dumps(data)
+
+
+def _dump_key(key: Hashable):
+    """
+    Get the value used to store a cache key in sqlite. Strings are stored as
+    text; other keys are pickled and stored as blobs, which never compare
+    equal to text.
+    """
+    if isinstance(key, str):
+        return key
+    return pickle.dumps(key, protocol=4)
+
+
+def _load_key(key) -> Hashable:
+    """
+    Get a cache key from the value stored in sqlite
+    """
+    if isinstance(key, bytes):
+        return pickle.loads(key)
+    return key
+
+
+class DiskCacheStore:
+    def __init__(self, db_path: str):
+        """
+        Persistent key-value store backed by a sqlite database. Values are
+        pickled and may have an expiration time. Keys may be any picklable
+        hashable; database errors are logged and treated as cache misses.
+        Args:
+            db_path: path to the sqlite database file
+        """
+        self.db_path = db_path
+        makedirs(dirname(db_path) or ".", exist_ok=True)
+        self._lock = Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache ("
+                             "key TEXT PRIMARY KEY, value BLOB, "
+                             "expiration REAL, updated REAL)")
+            self._db.commit()
+
+    def __len__(self):
+        try:
+            with self._lock:
+                return self._db.execute(
+                    "SELECT COUNT(*) FROM cache").fetchone()[0]
+        except sqlite3.Error as e:
+            LOG.warning(f"Unable to count cache entries: {e}")
+            return 0
+
+    def get(self, key: Hashable) -> tuple:
+        """
+        Get a value and its expiration from the store.
+        Args:
+            key: a key to look up
+        Returns: (value, expiration epoch time or None), (None, None) if the
+            key is not stored or expired
+        """
+        try:
+            db_key = _dump_key(key)
+            with self._lock:
+                row = self._db.execute("SELECT value, expiration FROM cache "
+                                       "WHERE key = ?", (db_key,)).fetchone()
+        except Exception as e:
+            LOG.warning(f"Unable to read {key} from disk: {e}")
+            return None, None
+        if not row:
+            return None, None
+        value, expiration = row
+        if expiration is not None and expiration <= time.time():
+            self.pop(key)
+            return None, None
+        try:
+            return pickle.loads(value), expiration
+        except Exception as e:
+            LOG.warning(f"Removing invalid cache entry for {key}: {e}")
+            self.pop(key)
+            return None, None
+
+    def put(self, key: Hashable, value: Any,
+            expiration: Optional[float] = None):
+        """
+        Write a value to the store.
+        Args:
+            key: a key to write
+            value: a picklable value to write
+            expiration: epoch time after which the value is expired
+        """
+        try:
+            db_key = _dump_key(key)
+            serialized = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            LOG.warning(f"Not writing {key} to disk: {e}")
+            return
+        try:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO cache VALUES "
+                                 "(?, ?, ?, ?)",
+                                 (db_key, serialized, expiration, time.time()))
+                self._db.commit()
+        except sqlite3.Error as e:
+            LOG.warning(f"Failed to write {key} to disk: {e}")
+
+    def pop(self, key: Hashable):
+        """
+        Remove a key from the store.
+        Args:
+            key: a key to remove
+        """
+        try:
+            db_key = _dump_key(key)
+            with self._lock:
+                self._db.execute("DELETE FROM cache WHERE key = ?", (db_key,))
+                self._db.commit()
+        except Exception as e:
+            LOG.warning(f"Failed to remove {key} from disk: {e}")
+
+    def items(self, limit: Optional[int] = None) -> list:
+        """
+        Get unexpired entries, most recently written first.
+        Args:
+            limit: max number of entries to return
+        Returns: list of (key, value, expiration) tuples
+        """
+        try:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT key, value, expiration FROM cache WHERE "
+                    "expiration IS NULL OR expiration > ? "
+                    "ORDER BY updated DESC LIMIT ?",
+                    (time.time(),
+                     -1 if limit is None else limit)).fetchall()
+        except sqlite3.Error as e:
+            LOG.warning(f"Unable to read cache entries: {e}")
+            return list()
+        items = list()
+        for key, value, expiration in rows:
+            try:
+                items.append((_load_key(key), pickle.loads(value),
+                              expiration))
+            except Exception as e:
+                LOG.warning(f"Skipping invalid cache entry for {key}: {e}")
+        return items
+
+    def prune(self) -> int:
+        """
+        Remove expired entries from the store.
+        Returns: number of entries removed
+        """
+        try:
+            with self._lock:
+                removed = self._db.execute("DELETE FROM cache WHERE "
+                                           "expiration <= ?",
+                                           (time.time(),)).rowcount
+                self._db.commit()
+        except sqlite3.Error as e:
+            LOG.warning(f"Failed to prune cache entries: {e}")
+            return 0
+        return removed
+
+    def clear(self):
+        """
+        Remove all entries from the store.
+        """
+        try:
+            with self._lock:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+        except sqlite3.Error as e:
+            LOG.warning(f"Failed to clear cache entries: {e}")
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._db.close()
+
+
+class PersistentLRUCache(ShardedLRUCache):
+    def __init__(self, db_path: Optional[str] = None, **kwargs):
+        """
+        ShardedLRUCache backed by a DiskCacheStore. Entries are written
+        through to disk and memory misses are read from disk, so cached values
+        persist between restarts until they expire.
+        Args:
+            db_path: path to the sqlite database; if None, the cache is
+                memory-only until `attach_disk` is called
+            kwargs: ShardedLRUCache arguments
+        """
+        ShardedLRUCache.__init__(self, **kwargs)
+        self._disk = None
+        if db_path:
+            self.attach_disk(db_path)
+
+    @property
+    def disk(self) -> Optional[DiskCacheStore]:
+        return self._disk
+
+    def attach_disk(self, db_path: str, warm_load: bool = True):
+        """
+        Back this cache with a disk store, optionally loading the most
+        recently written entries into memory.
+        Args:
+            db_path: path to the sqlite database
+            warm_load: if True, load stored entries into memory
+        """
+        if self._disk is not None:
+            self._disk.close()
+        self._disk = DiskCacheStore(db_path)
+        for key, value in self.items():
+            self._disk.put(key, value, self._get_expiration(key))
+        if warm_load:
+            self.warm_load()
+
+    def warm_load(self) -> int:
+        """
+        Load the most recently written unexpired disk entries into memory.
+        Returns: number of entries loaded
+        """
+        if self._disk is None:
+            return 0
+        entries = self._disk.items(limit=self._capacity)
+        # Put the most recent entries last so they are evicted last
+        for key, value, expiration in reversed(entries):
+            ShardedLRUCache.put(self, key, value,
+                                self._get_ttl(expiration))
+        return len(entries)
+
+    def get_with_ttl(self, key: Hashable,
+                     default: Any = None) -> Tuple[Any, Optional[float]]:
+        """
+        Return the value of the key from memory, falling back to disk, and
+        the seconds until it expires.
+        Args:
+            key: a key to look up in cache
+            default: value to return if the key is not cached or expired
+        Returns: (value or default, seconds remaining or None if the entry
+            does not expire or is not cached)
+        """
+        value, ttl = ShardedLRUCache.get_with_ttl(self, key, _MISSING)
+        if value is not _MISSING:
+            return value, ttl
+        if self._disk is None:
+            return default, None
+        value, expiration = self._disk.get(key)
+        if value is None:
+            return default, None
+        ttl = self._get_ttl(expiration)
+        ShardedLRUCache.put(self, key, value, ttl)
+        return value, ttl if ttl != float("inf") else None
+
+    def put(self, key: Hashable, value: Any,
+            ttl: Optional[float] = None) -> None:
+        """
+        Put a key-value pair into cache and write it through to disk.
+        Args:
+            key: a key to put into cache
+            value: a value to put into cache
+            ttl: seconds this entry is valid for (default is the cache ttl)
+        """
+        ShardedLRUCache.put(self, key, value, ttl)
+        if self._disk is not None:
+            ttl = ttl if ttl is not None else self._ttl
+            self._disk.put(key, value, time.time() + ttl
+                           if ttl not in (None, float("inf")) else None)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        value = ShardedLRUCache.pop(self, key, default)
+        if self._disk is not None:
+            self._disk.pop(key)
+        return value
+
+    def prune(self) -> int:
+        """
+        Remove expired entries from disk.
+        Returns: number of entries removed
+        """
+        return self._disk.prune() if self._disk is not None else 0
+
+    def clear_disk(self):
+        """
+        Remove all entries from memory and disk
+        """
+        self.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def _get_expiration(self, key: Hashable) -> Optional[float]:
+        """
+        Get the epoch expiration time of a key cached in memory
+        """
+        shard = self._get_shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+        if not entry or entry[1] in (None, float("inf")):
+            return None
+        return time.time() + entry[1] - time.monotonic()
+
+    @staticmethod
+    def _get_ttl(expiration: Optional[float]) -> Optional[float]:
+        """
+        Get the remaining ttl for an epoch expiration time
+        """
+        return expiration - time.time() if expiration is not None \
+            else float("inf")
+
+
+def _raise_shared_error(error: Exception):
+    """
+    Raise an exception shared by multiple callers. Each caller raises its own
+    copy, chained to the original exception, so tracebacks from each caller
+    are not added to the shared exception.
+    """
+    try:
+        copied = copy(error)
+    except Exception as e:
+        LOG.debug(f"Unable to copy {error!r}: {e}")
+        raise error
+    raise copied from error
+
+
+class _FlightCall:
+    """
+    A pending call shared by all SingleFlight callers of the same key
+    """
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.completed = False
+
+    def raise_error(self):
+        """
+        Raise the exception from this call in a waiting thread
+        """
+        if not isinstance(self.error, Exception):
+            raise RuntimeError("Shared call did not complete") from self.error
+        _raise_shared_error(self.error)
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent calls with the same key into a single call whose
+        result (or exception) is shared by all waiting threads.
+        """
+        self._lock = Lock()
+        self._calls = dict()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Check if a call for the given key is pending
+        """
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call `func`, or wait for a pending call with the same key to finish.
+        Args:
+            key: key identifying equivalent calls
+            func: function to call
+            args: positional arguments to pass to `func`
+            kwargs: keyword arguments to pass to `func`
+        Returns: value returned by the shared call of `func`
+        Raises: exception raised by the shared call of `func`; waiting
+            threads raise a copy of it, or RuntimeError if the call was
+            interrupted by a BaseException
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _FlightCall()
+        if leader:
+            try:
+                call.result = func(*args, **kwargs)
+                call.completed = True
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key)
+                call.done.set()
+            return call.result
+        call.done.wait()
+        if not call.completed:
+            call.raise_error()
+        return call.result
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        """
+        Coalesce concurrent coroutine calls with the same key into a single
+        task whose result (or exception) is shared by all awaiting callers.
+        Calls are only coalesced within the same event loop.
+        """
+        self._tasks = dict()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """
+        Check if a call for the given key is pending in the running loop
+        """
+        return (asyncio.get_running_loop(), key) in self._tasks
+
+    async def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Await `func`, or a pending call with the same key.
+        Args:
+            key: key identifying equivalent calls
+            func: coroutine function to call
+            args: positional arguments to pass to `func`
+            kwargs: keyword arguments to pass to `func`
+        Returns: value returned by the shared call of `func`
+        Raises: exception raised by the shared call of `func`
+        """
+        task_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(
+                lambda _: self._tasks.pop(task_key, None))
+        # Cancelling one caller should not cancel the call for the others
+        return await asyncio.shield(task)
+
+
+class SingleFlightCache:
+    def __init__(self, cache: ShardedLRUCache, negative_ttl: float = 10,
+                 stale_ttl: float = 0):
+        """
+        Cache results of expensive calls, coalescing concurrent calls for the
+        same key into one call.
+        Args:
+            cache: cache to store results in
+            negative_ttl: seconds to cache exceptions for, so failing calls
+                are not repeated by every caller (0 to disable)
+            stale_ttl: seconds at the end of an entry's lifetime during which
+                the cached value is returned while a call to refresh it runs
+                in the background (0 to disable)
+        """
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self._errors = ShardedLRUCache(capacity=128, shards=1,
+                                       ttl=negative_ttl)
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._background_tasks = set()
+
+    def _lookup(self, key: Hashable) -> Tuple[Any, bool]:
+        """
+        Get a cached value and whether it should be refreshed.
+        Raises: cached exception from a recent call for this key
+        """
+        value, ttl = self.cache.get_with_ttl(key)
+        if value:
+            return value, ttl is not None and ttl <= self.stale_ttl
+        error = self._errors.get(key)
+        if error:
+            _raise_shared_error(error)
+        return None, False
+
+    def _store(self, key: Hashable, value: Any):
+        if value:
+            ttl = self.cache._ttl
+            self.cache.put(key, value,
+                           ttl + self.stale_ttl if ttl is not None else None)
+
+    def _store_error(self, key: Hashable, error: Exception):
+        if self.negative_ttl:
+            self._errors.put(key, error)
+
+    def _refresh(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        try:
+            value = func(*args, **kwargs)
+        except Exception as e:
+            self._store_error(key, e)
+            raise
+        self._store(key, value)
+        return value
+
+    async def _refresh_async(self, key: Hashable, func: Callable,
+                             *args, **kwargs) -> Any:
+        try:
+            value = await func(*args, **kwargs)
+        except Exception as e:
+            self._store_error(key, e)
+            raise
+        self._store(key, value)
+        return value
+
+    def _revalidate(self, key: Hashable, func: Callable, *args, **kwargs):
+        try:
+            self._flight.do(key, self._refresh, key, func, *args, **kwargs)
+        except Exception as e:
+            LOG.warning(f"Failed to refresh {key}: {e}")
+
+    async def _revalidate_async(self, key: Hashable, func: Callable,
+                                *args, **kwargs):
+        try:
+            await self._async_flight.do(key, self._refresh_async, key, func,
+                                        *args, **kwargs)
+        except Exception as e:
+            LOG.warning(f"Failed to refresh {key}: {e}")
+
+    def call(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        """
+        Get the cached result for `key`, or call `func` to get it.
+        Args:
+            key: cache key for the result of this call
+            func: function to call on a cache miss
+            args: positional arguments to pass to `func`
+            kwargs: keyword arguments to pass to `func`
+        Returns: cached or new result of `func`
+        """
+        value, stale = self._lookup(key)
+        if value:
+            if stale and not self._flight.in_flight(key):
+                Thread(target=self._revalidate, args=(key, func, *args),
+                       kwargs=kwargs, daemon=True).start()
+            return value
+        return self._flight.do(key, self._refresh, key, func, *args, **kwargs)
+
+    async def call_async(self, key: Hashable, func: Callable,
+                         *args, **kwargs) -> Any:
+        """
+        Get the cached result for `key`, or await `func` to get it.
+        Args:
+            key: cache key for the result of this call
+            func: coroutine function to call on a cache miss
+            args: positional arguments to pass to `func`
+            kwargs: keyword arguments to pass to `func`
+        Returns: cached or new result of `func`
+        """
+        value, stale = self._lookup(key)
+        if value:
+            if stale and not self._async_flight.in_flight(key):
+                task = asyncio.ensure_future(
+                    self._revalidate_async(key, func, *args, **kwargs))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return value
+        return await self._async_flight.do(key, self._refresh_async, key,
+                                           func, *args, **kwargs)
@@ -0,0 +1,216 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import ast
+import base64
+import json
+
+from typing import Union
+
+from neon_utils.logger import LOG
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Legacy base64 payloads never contain a null byte
+MAGIC = b"\x00NC"
+CODEC_VERSION = 1
+LEGACY_VERSION = 0
+
+SERIALIZER_MSGPACK = 1
+# orjson and json payloads are both plain JSON, readable by any peer
+SERIALIZER_ORJSON = 2
+SERIALIZER_JSON = 3
+_COMPRESSED = 0x10
+
+# Optional formats a peer can decode; peers that have not advertised any are
+# sent uncompressed JSON
+CAPABILITY_MSGPACK = 0x01
+CAPABILITY_ZSTD = 0x02
+_HEADER_SIZE = len(MAGIC) + 2
+
+# Payloads at least this many bytes are compressed if zstandard is available
+COMPRESS_THRESHOLD = 4096
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def get_capabilities() -> int:
+    """
+    Get the optional formats this process can decode, to advertise to peers
+    :return: bitmask of `CAPABILITY_*` values
+    """
+    capabilities = 0
+    if msgpack:
+        capabilities |= CAPABILITY_MSGPACK
+    if zstandard:
+        capabilities |= CAPABILITY_ZSTD
+    return capabilities
+
+
+def _get_serializer(peer_capabilities: int = 0) -> int:
+    if msgpack and peer_capabilities & CAPABILITY_MSGPACK:
+        return SERIALIZER_MSGPACK
+    if orjson:
+        return SERIALIZER_ORJSON
+    return SERIALIZER_JSON
+
+
+def _check_json_keys(data):
+    """
+    Raise TypeError for non-str keys, which `json` would silently convert to
+    str, so stdlib JSON accepts the same data as orjson
+    """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Dict key must be str, not {type(key)}")
+            _check_json_keys(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            _check_json_keys(value)
+
+
+def _serialize(data: dict, serializer: int) -> bytes:
+    if serializer == SERIALIZER_MSGPACK:
+        return msgpack.packb(data, use_bin_type=True)
+    if serializer == SERIALIZER_ORJSON:
+        return orjson.dumps(data)
+    _check_json_keys(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _deserialize(payload: BytesLike, serializer: int) -> dict:
+    if serializer == SERIALIZER_MSGPACK:
+        if not msgpack:
+            raise ValueError("msgpack is required to decode this data")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if serializer in (SERIALIZER_ORJSON, SERIALIZER_JSON):
+        if orjson:
+            return orjson.loads(payload)
+        return json.loads(bytes(payload))
+    raise ValueError(f"Unknown serializer: {serializer}")
+
+
+def encode_legacy(data: dict, charset: str = "utf-8") -> bytes:
+    """
+    Encode a dict in the legacy base64 format readable by all peers
+    :param data: dict to encode
+    :param charset: character set encoding to use
+    :return: base64 encoded bytes
+    """
+    return base64.b64encode(json.dumps(str(data)).encode(charset))
+
+
+def decode_legacy(data: BytesLike, charset: str = "utf-8") -> dict:
+    """
+    Decode a dict from the legacy base64 format. Values are parsed as Python
+    literals and never evaluated.
+    :param data: base64 encoded bytes
+    :param charset: character set encoding to use
+    :return: decoded dict
+    """
+    return ast.literal_eval(json.loads(base64.b64decode(data).decode(charset)))
+
+
+def encode(data: dict, version: int = CODEC_VERSION,
+           compress_threshold: int = COMPRESS_THRESHOLD,
+           peer_capabilities: int = 0) -> bytes:
+    """
+    Encode a dict for transport. Data is serialized as JSON (with orjson if
+    available), or with msgpack if the peer can decode it. Data larger than
+    `compress_threshold` is compressed with zstandard if the peer can decode
+    it. Data that cannot be serialized (i.e. bytes or non-str keys without
+    msgpack) is encoded in the legacy format. Tuples are decoded as lists
+    unless the data is encoded in the legacy format.
+    :param data: dict to encode
+    :param version: codec version to encode, `LEGACY_VERSION` for peers that
+        do not support the current version
+    :param compress_threshold: min serialized size in bytes to compress
+    :param peer_capabilities: `CAPABILITY_*` bitmask advertised by the peer
+        (see `get_capabilities`)
+    :return: encoded bytes
+    """
+    if version == LEGACY_VERSION:
+        return encode_legacy(data)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported codec version: {version}")
+    serializer = _get_serializer(peer_capabilities)
+    try:
+        payload = _serialize(data, serializer)
+    except TypeError as e:
+        LOG.debug(f"Falling back to legacy encoding: {e}")
+        return encode_legacy(data)
+    flags = serializer
+    if zstandard and peer_capabilities & CAPABILITY_ZSTD and \
+            len(payload) >= compress_threshold:
+        payload = zstandard.ZstdCompressor().compress(payload)
+        flags |= _COMPRESSED
+    return MAGIC + bytes((version, flags)) + payload
+
+
+def is_legacy(data: BytesLike) -> bool:
+    """
+    Check if encoded data is in the legacy format
+    :param data: encoded bytes
+    :return: True if `data` is not in a versioned format
+    """
+    return bytes(data[:len(MAGIC)]) != MAGIC
+
+
+def decode(data: BytesLike) -> dict:
+    """
+    Decode a dict encoded in any supported format. Uncompressed payloads in
+    a memoryview are decoded without copying.
+    :param data: encoded bytes
+    :return: decoded dict
+    """
+    view = memoryview(data)
+    if is_legacy(view):
+        return decode_legacy(view)
+    version, flags = view[len(MAGIC)], view[len(MAGIC) + 1]
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported codec version: {version}")
+    payload = view[_HEADER_SIZE:]
+    if flags & _COMPRESSED:
+        if not zstandard:
+            raise ValueError("zstandard is required to decode this data")
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    return _deserialize(payload, flags & ~_COMPRESSED)
@@ -26,12 +26,18 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import atexit
+import hashlib
 import importlib
+import marshal
 import re
 import json
 import os
 import sys
 import shutil
+import weakref
+from tempfile import mkstemp
+from threading import RLock, Lock, Timer
 from time import sleep
 
 import yaml
@@ -40,10 +46,11 @@ from copy import deepcopy
 from os.path import *
 from collections.abc import MutableMapping
 from contextlib import suppress
+from contextvars import ContextVar
 
 from ovos_utils.json_helper import load_commented_json
 from ovos_utils.log import deprecated, log_deprecation
-from ovos_utils.xdg_utils import xdg_config_home
+from ovos_utils.xdg_utils import xdg_config_home, xdg_cache_home
 from typing import Optional
 from combo_lock import NamedLock
 
@@ -54,17 +61,529 @@ from neon_utils.file_utils import path_is_read_writable, create_file
 from neon_utils.packaging_utils import get_package_version_spec
 
 
+# Use LibYAML bindings to write config when available. Config is still read
+# with the Python loader, since LibYAML accepts some legacy (ruamel) files that
+# should be handled by the ruamel fallback and parses their values differently
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+_YAML_CACHE_VERSION = 1
+
+
+def _get_yaml_cache_path(file_path: str) -> str:
+    """
+    Get the path to the parsed config cache for the specified yml file
+    :param file_path: path to yml file
+    :returns: path to the cache file for `file_path`
+    """
+    path_hash = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+    return join(xdg_cache_home(), "neon", "yaml_cache", f"{path_hash}.marshal")
+
+
+def _yaml_cache_key(file_path: str, stat: os.stat_result) -> tuple:
+    return (_YAML_CACHE_VERSION, yaml.__version__, os.path.abspath(file_path),
+            stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _read_yaml_cache(file_path: str,
+                     stat: os.stat_result) -> Optional[dict]:
+    """
+    Read parsed contents of a yml file from cache if the cache is valid
+    :param file_path: path to yml file
+    :param stat: `os.stat` result for `file_path`
+    :returns: cached parsed contents, None if no valid cache exists
+    """
+    try:
+        with open(_get_yaml_cache_path(file_path), 'rb') as f:
+            cache_key, content = marshal.load(f)
+        if cache_key == _yaml_cache_key(file_path, stat):
+            return content
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        LOG.debug(f"Ignoring invalid yaml cache for {file_path}: {e}")
+    return None
+
+
+def _write_yaml_cache(file_path: str, stat: os.stat_result, content: dict):
+    """
+    Write parsed contents of a yml file to cache
+    :param file_path: path to yml file `content` was loaded from
+    :param stat: `os.stat` result for `file_path` when `content` was loaded
+    :param content: parsed contents of `file_path`
+    """
+    cache_file = _get_yaml_cache_path(file_path)
+    try:
+        serialized = marshal.dumps((_yaml_cache_key(file_path, stat), content))
+    except ValueError:
+        # Content includes types marshal can't serialize (i.e. datetime)
+        return
+    try:
+        os.makedirs(dirname(cache_file), exist_ok=True)
+        fd, tmp_file = mkstemp(dir=dirname(cache_file), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(serialized)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        LOG.debug(f"Unable to write yaml cache for {file_path}: {e}")
+
+
+class TrackedDict(dict):
+    """
+    Dict that tracks which keys have been modified since it was last marked
+    clean. Changes to nested dicts and lists are propagated to their parent,
+    so checking for changes does not require comparing the whole object.
+    """
+    def __init__(self, content: Optional[MutableMapping] = None,
+                 _parent=None, _parent_key=None):
+        super().__init__()
+        self._parent = _parent
+        self._parent_key = _parent_key
+        self._dirty_keys = set()
+        self._assigned_keys = set()
+        self._version = 0
+        for key, value in (content or dict()).items():
+            dict.__setitem__(self, key, _track_value(value, self, key))
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True if this dict has been modified since it was last marked clean
+        """
+        return bool(self._dirty_keys)
+
+    @property
+    def dirty_keys(self) -> set:
+        """
+        Set of top-level keys modified since this dict was last marked clean
+        """
+        return set(self._dirty_keys)
+
+    @property
+    def version(self) -> int:
+        """
+        Counter incremented on every change to this dict or its children
+        """
+        return self._version
+
+    def mark_dirty(self):
+        """
+        Mark all keys in this dict as modified
+        """
+        self._dirty_keys.update(self.keys())
+        self._assigned_keys.update(self.keys())
+        self._version += 1
+        if self._parent is not None:
+            self._parent._changed(self._parent_key)
+
+    def clear_dirty(self):
+        """
+        Mark this dict and any modified children as unmodified
+        """
+        for key in self._dirty_keys:
+            value = dict.get(self, key)
+            if isinstance(value, (TrackedDict, TrackedList)):
+                value.clear_dirty()
+        self._dirty_keys.clear()
+        self._assigned_keys.clear()
+
+    def to_dict(self) -> dict:
+        """
+        Get a copy of this object with all nested containers as builtin types
+        """
+        return {key: _untrack_value(value) for key, value in self.items()}
+
+    def _changed(self, key):
+        self._dirty_keys.add(key)
+        self._version += 1
+        if self._parent is not None:
+            self._parent._changed(self._parent_key)
+
+    def _assigned(self, key):
+        self._assigned_keys.add(key)
+        self._changed(key)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            old_value = dict.__getitem__(self, key)
+            if old_value is value or \
+                    (type(old_value) is type(value) and
+                     not isinstance(value, (MutableMapping, list)) and
+                     old_value == value):
+                return
+            _detach_value(old_value)
+        dict.__setitem__(self, key, _track_value(value, self, key))
+        self._assigned(key)
+
+    def __delitem__(self, key):
+        _detach_value(dict.pop(self, key))
+        self._assigned(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, key, *args):
+        if key not in self:
+            return dict.pop(self, key, *args)
+        value = dict.pop(self, key)
+        _detach_value(value)
+        self._assigned(key)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        _detach_value(value)
+        self._assigned(key)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        for key in list(self.keys()):
+            del self[key]
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {deepcopy(key, memo): deepcopy(value, memo)
+                for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+
+
+class TrackedList(list):
+    """
+    List that notifies its parent TrackedDict when it or any nested
+    containers are modified.
+    """
+    def __init__(self, content=(), _parent=None, _parent_key=None):
+        super().__init__(_track_value(value, self, None) for value in content)
+        self._parent = _parent
+        self._parent_key = _parent_key
+        self._dirty = False
+
+    @property
+    def dirty(self) -> bool:
+        """
+        True if this list has been modified since it was last marked clean
+        """
+        return self._dirty
+
+    def clear_dirty(self):
+        """
+        Mark this list and any children as unmodified
+        """
+        if self._dirty:
+            for value in self:
+                if isinstance(value, (TrackedDict, TrackedList)):
+                    value.clear_dirty()
+        self._dirty = False
+
+    def to_list(self) -> list:
+        """
+        Get a copy of this object with all nested containers as builtin types
+        """
+        return [_untrack_value(value) for value in self]
+
+    def _changed(self, _=None):
+        self._dirty = True
+        if self._parent is not None:
+            self._parent._changed(self._parent_key)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index,
+                             [_track_value(v, self, None) for v in value])
+        else:
+            list.__setitem__(self, index, _track_value(value, self, None))
+        self._changed()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, other):
+        list.__imul__(self, other)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, _track_value(value, self, None))
+        self._changed()
+
+    def extend(self, values):
+        list.extend(self, [_track_value(v, self, None) for v in values])
+        self._changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, _track_value(value, self, None))
+        self._changed()
+
+    def pop(self, *args):
+        value = list.pop(self, *args)
+        _detach_value(value)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        list.clear(self)
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (self.to_list(),)
+
+
+def _track_value(value, parent, key):
+    """
+    Get a tracked copy of a dict or list value to be added to `parent`
+    """
+    if isinstance(value, MutableMapping):
+        return TrackedDict(value, parent, key)
+    if isinstance(value, list):
+        return TrackedList(value, parent, key)
+    return value
+
+
+def _untrack_value(value):
+    """
+    Get a copy of a tracked value as builtin types
+    """
+    if isinstance(value, TrackedDict):
+        return value.to_dict()
+    if isinstance(value, TrackedList):
+        return value.to_list()
+    return value
+
+
+def _detach_value(value):
+    """
+    Stop a value removed from a tracked container from notifying its parent
+    """
+    if isinstance(value, (TrackedDict, TrackedList)):
+        value._parent = None
+
+
+def _get_changed_keys(content: TrackedDict) -> dict:
+    """
+    Get a tree of the keys modified in `content`. Keys that were assigned or
+    removed map to None; sections modified in place map to a tree of their
+    modified keys.
+    """
+    changed = dict()
+    for key in content.dirty_keys:
+        value = dict.get(content, key)
+        if key not in content._assigned_keys and \
+                isinstance(value, TrackedDict):
+            changed[key] = _get_changed_keys(value)
+        else:
+            changed[key] = None
+    return changed
+
+
+def _merge_changed_keys(config: dict, content: dict, changed: dict) -> dict:
+    """
+    Apply the values of changed keys in `content` to `config`
+    :param config: configuration to update (i.e. contents of a file on disk)
+    :param content: configuration containing changes
+    :param changed: tree of changed keys from `_get_changed_keys`
+    :return: updated `config`
+    """
+    for key, nested in changed.items():
+        if key not in content:
+            config.pop(key, None)
+        elif nested is not None and isinstance(config.get(key), dict) and \
+                isinstance(content[key], dict):
+            _merge_changed_keys(config[key], content[key], nested)
+        else:
+            config[key] = content[key]
+    return config
+
+
+def _mark_changed_keys(content: TrackedDict, changed: dict):
+    """
+    Mark keys in `content` as modified
+    :param content: configuration to mark modified keys in
+    :param changed: tree of changed keys from `_get_changed_keys`
+    """
+    for key, nested in changed.items():
+        value = dict.get(content, key)
+        if nested and isinstance(value, TrackedDict):
+            _mark_changed_keys(value, nested)
+        else:
+            content._assigned(key)
+
+
+for _dumper in (yaml.SafeDumper, yaml.Dumper,
+                getattr(yaml, "CSafeDumper", None),
+                getattr(yaml, "CDumper", None)):
+    if _dumper:
+        yaml.add_representer(TrackedDict,
+                             yaml.representer.SafeRepresenter.represent_dict,
+                             Dumper=_dumper)
+        yaml.add_representer(TrackedList,
+                             yaml.representer.SafeRepresenter.represent_list,
+                             Dumper=_dumper)
+
+
+class _ConfigFileWatcher:
+    """
+    Watches configuration directories for file changes and flags registered
+    NGIConfig objects as changed so reads can skip checking file modified time.
+    Uses inotify where available, with a polling fallback.
+    """
+    def __init__(self):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(handler, event):
+                if not event.is_directory:
+                    self._on_file_event(event)
+
+        self._handler = _Handler()
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.start()
+        self._watches = dict()
+        self._configs = dict()
+        self._lock = RLock()
+
+    def register(self, config):
+        """
+        Start watching the file backing the passed configuration
+        :param config: NGIConfig object to notify of file changes
+        """
+        file_path = os.path.abspath(config.file_path)
+        watch_dir = dirname(file_path)
+        with self._lock:
+            if watch_dir not in self._watches:
+                try:
+                    self._watches[watch_dir] = \
+                        self._observer.schedule(self._handler, watch_dir)
+                except OSError as e:
+                    # inotify watch limit reached or not supported
+                    LOG.warning(f"Falling back to polling {watch_dir}: {e}")
+                    self._watches[watch_dir] = self._schedule_polling(
+                        watch_dir)
+            self._configs.setdefault(file_path, weakref.WeakSet()).add(config)
+
+    def unregister(self, config):
+        """
+        Stop notifying the passed configuration of file changes
+        :param config: NGIConfig object to stop notifying
+        """
+        file_path = os.path.abspath(config.file_path)
+        with self._lock:
+            if file_path in self._configs:
+                self._configs[file_path].discard(config)
+
+    def _schedule_polling(self, watch_dir: str):
+        from watchdog.observers.polling import PollingObserver
+        if not hasattr(self, "_polling_observer"):
+            self._polling_observer = PollingObserver()
+            self._polling_observer.daemon = True
+            self._polling_observer.start()
+        return self._polling_observer.schedule(self._handler, watch_dir)
+
+    def _on_file_event(self, event):
+        paths = (event.src_path, getattr(event, "dest_path", None))
+        with self._lock:
+            for path in paths:
+                for config in list(self._configs.get(path) or []):
+                    config._file_changed = True
+
+
+_config_watcher: Optional[_ConfigFileWatcher] = None
+
+
+def _get_config_watcher() -> Optional[_ConfigFileWatcher]:
+    """
+    Get a process-wide configuration file watcher, creating it if necessary
+    :returns: _ConfigFileWatcher object, None if file watching is unavailable
+    """
+    global _config_watcher
+    if not _config_watcher:
+        try:
+            _config_watcher = _ConfigFileWatcher()
+        except ImportError:
+            LOG.error("watchdog not available; config changes will be "
+                      "detected by file modified time. "
+                      "pip install neon-utils[configuration]")
+    return _config_watcher
+
+
+_write_behind_configs = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_writes():
+    """
+    Write any changes queued by write-behind configuration objects to disk
+    """
+    for config in list(_write_behind_configs):
+        try:
+            config.flush()
+        except Exception as e:
+            LOG.error(f"Failed to flush {config.name}: {e}")
+
+
 class NGIConfig:
     configuration_list = dict()
     # configuration_locks = dict()
 
-    def __init__(self, name, path=None, force_reload: bool = False):
+    def __init__(self, name, path=None, force_reload: bool = False,
+                 watch: bool = False, write_delay: float = 0):
+        """
+        Create an object representing a yml configuration file
+        :param name: configuration name (yml file basename)
+        :param path: directory containing the configuration file
+        :param force_reload: if True, ignore any cached configuration object
+        :param watch: if True, watch the file for changes instead of checking
+            its modified time on every read
+        :param write_delay: seconds to queue changes before writing them to
+            disk in a single write. If 0, changes are written immediately
+        """
         from ovos_config.locations import get_xdg_config_save_path
         self.name = name
         self.path = path or get_xdg_config_save_path()
         lock_filename = join(self.path, f".{self.name}.lock")
         self.lock = NamedLock(lock_filename)
         self._pending_write = False
+        self._watched = False
+        self._file_changed = False
+        self._write_delay = write_delay
+        self._write_timer = None
+        self._write_timer_lock = Lock()
         self._content = dict()
         self._loaded = os.path.getmtime(self.file_path)
         if not force_reload and self.__repr__() in NGIConfig.configuration_list:
@@ -74,8 +593,26 @@ class NGIConfig:
         else:
             with self.lock:
                 self._content = self._load_yaml_file()
+                self._content.clear_dirty()
             NGIConfig.configuration_list[self.__repr__()] = self
-        self._disk_content_hash = hash(repr(self._content))
+        if watch:
+            self.start_watching()
+
+    @property
+    def _content(self) -> TrackedDict:
+        return self._tracked_content
+
+    @_content.setter
+    def _content(self, content: MutableMapping):
+        """
+        Set the content of this configuration. Assigned content is considered
+        modified unless it is already tracked by a configuration object.
+        """
+        if not isinstance(content, TrackedDict) or \
+                content._parent is not None:
+            content = TrackedDict(content)
+            content.mark_dirty()
+        self._tracked_content = content
 
     @property
     def file_path(self):
@@ -103,26 +640,98 @@ class NGIConfig:
     def check_reload(self):
         """
         Conditionally calls `self.check_for_updates` if `self.requires_reload` returns True.
+        If this config is watched, the file is only checked after a change event.
         """
+        if self._watched:
+            if not self._file_changed:
+                return
+            self._file_changed = False
         if self.requires_reload:
             self.check_for_updates()
 
+    def start_watching(self) -> bool:
+        """
+        Watch the file backing this configuration for changes so that reads
+        only check the file on disk after it has been modified.
+        :returns: True if this configuration is watched
+        """
+        if self._watched:
+            return True
+        watcher = _get_config_watcher()
+        if not watcher:
+            return False
+        watcher.register(self)
+        # Check once to catch any changes made before the watch started
+        self._file_changed = True
+        self._watched = True
+        return True
+
+    def stop_watching(self):
+        """
+        Stop watching the file backing this configuration; reads will check
+        the file modified time.
+        """
+        if not self._watched:
+            return
+        self._watched = False
+        if _config_watcher:
+            _config_watcher.unregister(self)
+
     def write_changes(self) -> bool:
         """
-        Writes any changes to disk. If disk contents have changed, this config object will not modify config files
-        :return: True if changes were written, False if disk config has been updated.
+        Writes any changes to disk. If disk contents have changed, this config object will not modify config files.
+        With a `write_delay`, changes are queued and merged with any changes on disk when they are written.
+        :return: True if changes were written or queued, False if disk config has been updated.
         """
         # TODO: Add some param to force overwrite? DM
-        if self._pending_write or self._disk_content_hash != hash(repr(self._content)):
+        if self._pending_write or self._content.dirty:
+            if self._write_delay > 0:
+                return self._schedule_write()
             return self._write_yaml_file()
 
+    def flush(self) -> bool:
+        """
+        Immediately write any changes queued by a `write_delay` to disk.
+        :return: True if changes were written, False if nothing was written
+        """
+        with self._write_timer_lock:
+            if self._write_timer:
+                self._write_timer.cancel()
+                self._write_timer = None
+            _write_behind_configs.discard(self)
+            if not self._pending_write and not self._content.dirty:
+                return False
+            version = self._content.version
+            to_write = self._content.to_dict()
+        if self._write_queued_changes(to_write, version):
+            return True
+        LOG.error(f"Failed to write {self.name}; changes are still pending")
+        self._pending_write = True
+        _write_behind_configs.add(self)
+        return False
+
+    def _schedule_write(self) -> bool:
+        """
+        Queue a write of this configuration so changes made within
+        `write_delay` seconds are written to disk together.
+        :return: True if a write is queued
+        """
+        self._pending_write = True
+        with self._write_timer_lock:
+            if not self._write_timer:
+                self._write_timer = Timer(self._write_delay, self.flush)
+                self._write_timer.daemon = True
+                self._write_timer.start()
+                _write_behind_configs.add(self)
+        return True
+
     def populate(self, content, check_existing=False):
         if not check_existing:
             self.__add__(content)
             return
-        old_content = deepcopy(self._content)
-        self._content = dict_merge(content, self._content)  # to_change, one_with_all_keys
-        if old_content == self._content:
+        version = self._content.version
+        _add_missing_keys(self._content, content)
+        if version == self._content.version:
             LOG.warning(f"Update called with no change: {self.file_path}")
             return
         if not self.write_changes():
@@ -142,11 +751,11 @@ class NGIConfig:
             depth: int depth to recurse (0 includes top-level keys only)
         """
         with self.lock:
-            old_content = deepcopy(self._content)
+            version = self._content.version
             if not recursive:
                 depth = 0
-            self._content = dict_make_equal_keys(self._content, other, depth)
-            if old_content == self._content:
+            dict_make_equal_keys(self._content, other, depth)
+            if version == self._content.version:
                 return
 
         if not self.write_changes():
@@ -154,9 +763,9 @@ class NGIConfig:
             LOG.warning("Disk contents are newer than this config object, changes were not written.")
             self.check_reload()
             with self.lock:
-                old_content = deepcopy(self._content)
-                self._content = dict_make_equal_keys(self._content, other, depth)
-            if old_content != self._content:
+                version = self._content.version
+                dict_make_equal_keys(self._content, other, depth)
+            if version != self._content.version:
                 LOG.error("Still found changes, writing them")
                 success = self.write_changes()
                 if not success:
@@ -170,9 +779,9 @@ class NGIConfig:
             other: dict of keys and default values this should be added to this configuration
         """
         with self.lock:
-            old_content = deepcopy(self._content)
-            self._content = dict_update_keys(self._content, other)  # to_change, one_with_all_keys
-        if old_content == self._content:
+            version = self._content.version
+            dict_update_keys(self._content, other)  # to_change, one_with_all_keys
+        if version == self._content.version:
             LOG.warning(f"Update called with no change: {self.file_path}")
             return
 
@@ -181,9 +790,9 @@ class NGIConfig:
             LOG.warning("Disk contents are newer than this config object, changes were not written.")
             self.check_reload()
             with self.lock:
-                old_content = deepcopy(self._content)
-                self._content = dict_update_keys(old_content, other)
-            if old_content != self._content:
+                version = self._content.version
+                dict_update_keys(self._content, other)
+            if version != self._content.version:
                 LOG.error("Still found changes, writing them")
                 success = self.write_changes()
                 if not success:
@@ -198,7 +807,12 @@ class NGIConfig:
             new_content = self._load_yaml_file()
             if new_content:
                 LOG.debug(f"{self.name} Checked for Updates")
-                self._content = new_content
+                if self._write_delay > 0 and self._content.dirty:
+                    # Keep changes queued for write-behind
+                    self._merge_content(new_content)
+                else:
+                    self._content = new_content
+                    self._content.clear_dirty()
             elif self._content:
                 LOG.error("new_content is empty! keeping current config")
         return self._content
@@ -291,9 +905,16 @@ class NGIConfig:
                  selected YAML.
         """
         try:
-            with open(self.file_path, 'r') as f:
+            file_path = self.file_path
+            stat = os.stat(file_path)
+            config = _read_yaml_cache(file_path, stat)
+            if config is not None:
+                self._loaded = stat.st_mtime
+                return config or dict()
+            with open(file_path, 'r') as f:
                 try:
                     config = yaml.safe_load(f)
+                    _write_yaml_cache(file_path, stat, config)
                 except Exception as e:
                     LOG.error(e)
                     sleep(1)
@@ -308,7 +929,7 @@ class NGIConfig:
             if not config:
                 LOG.debug(f"Empty config file found at: {self.file_path}")
                 config = dict()
-            self._loaded = os.path.getmtime(self.file_path)
+            self._loaded = stat.st_mtime
             return config
         except FileNotFoundError:
             LOG.error(f"Configuration file not found! ({self.file_path})")
@@ -323,7 +944,8 @@ class NGIConfig:
         Overwrites and/or updates the YML at the specified file_path.
         :return: True if changes were written to disk, else False
         """
-        to_write = deepcopy(self._content)
+        version = self._content.version
+        to_write = self._content.to_dict()
         if not to_write:
             LOG.error(f"Config content empty! Skipping write to disk and reloading")
             return False
@@ -339,18 +961,98 @@ class NGIConfig:
             shutil.copy2(self.file_path, tmp_filename)
             try:
                 with open(self.file_path, 'w+') as f:
-                    yaml.safe_dump(to_write, f, allow_unicode=True,
-                           default_flow_style=False, sort_keys=False)
+                    yaml.dump(to_write, f, Dumper=_YAML_DUMPER,
+                              allow_unicode=True, default_flow_style=False,
+                              sort_keys=False)
                 LOG.debug(f"YAML updated {self.name}")
-                self._loaded = os.path.getmtime(self.file_path)
-                self._pending_write = False
-                self._disk_content_hash = hash(repr(self._content))
+                stat = os.stat(self.file_path)
+                self._loaded = stat.st_mtime
+                _write_yaml_cache(self.file_path, stat, to_write)
+                self._mark_written(version)
             except Exception as e:
                 LOG.error(e)
                 LOG.info(f"Restoring config from tmp file backup")
                 shutil.copy2(tmp_filename, self.file_path)
             return True
 
+    def _merge_content(self, new_content: dict):
+        """
+        Replace this configuration's content with `new_content`, keeping any
+        changes that have not been written to disk.
+        NOTE: This should be called with `self.lock` held
+        :param new_content: configuration loaded from disk
+        """
+        changed = _get_changed_keys(self._content)
+        self._content = _merge_changed_keys(new_content,
+                                            self._content.to_dict(), changed)
+        self._content.clear_dirty()
+        _mark_changed_keys(self._content, changed)
+
+    def _write_queued_changes(self, to_write: dict, version: int) -> bool:
+        """
+        Atomically write changes queued by a `write_delay`. If the file on disk
+        was modified since it was loaded, queued changes are merged with it.
+        :param to_write: configuration content to write
+        :param version: content version `to_write` was copied from
+        :return: True if changes were written to disk, else False
+        """
+        if not to_write:
+            LOG.error(f"Config content empty! Skipping write to disk")
+            return False
+        if not path_is_read_writable(self.file_path):
+            LOG.warning(f"Insufficient write permissions: {self.file_path}")
+            return False
+        with self.lock:
+            if self._loaded != os.path.getmtime(self.file_path):
+                LOG.info(f"File on disk modified! Merging changes to "
+                         f"{self.file_path}")
+                new_content = self._load_yaml_file()
+                if not new_content:
+                    LOG.error(f"Unable to load {self.file_path} to merge")
+                    return False
+                self._merge_content(new_content)
+                version = self._content.version
+                to_write = self._content.to_dict()
+            return self._replace_yaml_file(to_write, version)
+
+    def _replace_yaml_file(self, to_write: dict, version: int) -> bool:
+        """
+        Atomically replace the YML at file_path with the passed content.
+        NOTE: This should be called with `self.lock` held
+        :param to_write: configuration content to write
+        :param version: content version `to_write` was copied from
+        :return: True if changes were written to disk, else False
+        """
+        file_path = self.file_path
+        fd, tmp_filename = mkstemp(dir=self.path, prefix=f".{self.name}.",
+                                   suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                yaml.dump(to_write, f, Dumper=_YAML_DUMPER, allow_unicode=True,
+                          default_flow_style=False, sort_keys=False)
+            shutil.copymode(file_path, tmp_filename)
+            os.replace(tmp_filename, file_path)
+        except Exception as e:
+            LOG.error(e)
+            with suppress(FileNotFoundError):
+                os.remove(tmp_filename)
+            return False
+        LOG.debug(f"YAML updated {self.name}")
+        stat = os.stat(file_path)
+        self._loaded = stat.st_mtime
+        _write_yaml_cache(file_path, stat, to_write)
+        self._mark_written(version)
+        return True
+
+    def _mark_written(self, version: int):
+        """
+        Mark content as unmodified after it has been written to disk
+        :param version: content version that was written
+        """
+        self._pending_write = False
+        if self._content.version == version:
+            self._content.clear_dirty()
+
     @property
     def content(self) -> dict:
         """
@@ -397,10 +1099,7 @@ class NGIConfig:
             to_update = other
             if isinstance(other, NGIConfig):
                 to_update = other._content
-            if self._content:
-                self._content.update(to_update)
-            else:
-                self._content = to_update
+            self._content.update(to_update)
         else:
             raise TypeError("__add__ expects an argument other than None")
         if not self.write_changes():
@@ -422,7 +1121,7 @@ class NGIConfig:
                     raise AttributeError("__add__ expects dict, list, str, or config object as the argument")
 
                 if self._content:
-                    self._content = delete_recursive_dictionary_keys(self._content, to_remove)
+                    delete_recursive_dictionary_keys(self._content, to_remove)
                 else:
                     raise TypeError("{} config is empty".format(self.name))
         else:
@@ -431,6 +1130,23 @@ class NGIConfig:
             LOG.error("Disk contents are newer than this config object, changes were not written.")
 
 
+def _add_missing_keys(dct_to_change: MutableMapping,
+                      keys_dct: MutableMapping):
+    """
+    Recursively add keys from keys_dct to dct_to_change in place. Existing
+    values in dct_to_change are not modified.
+    Args:
+        dct_to_change: dict to add keys and values to
+        keys_dct: dict with keys and default values to add
+    """
+    for key, value in keys_dct.items():
+        if key not in dct_to_change:
+            dct_to_change[key] = value
+        elif isinstance(value, dict) and \
+                isinstance(dct_to_change[key], MutableMapping):
+            _add_missing_keys(dct_to_change[key], value)
+
+
 def _get_legacy_config_dir(sys_path: Optional[list] = None) -> Optional[str]:
     """
     Get legacy configuration locations based on install directories
@@ -873,9 +1589,8 @@ def get_mycroft_compatible_location(location: dict) -> dict:
     from neon_utils.parse_utils import clean_quotes
     if not any((location.get('lat'), location.get('lng'),
                 location.get('city'), location.get('tz'))):
-        from ovos_config.config import Configuration
         LOG.debug('Neon config empty, return core value')
-        return Configuration().get('location')
+        return _get_core_config().get('location')
 
     location.setdefault('lat', None)
     location.setdefault('lng', None)
@@ -941,15 +1656,81 @@ def get_mycroft_compatible_location(location: dict) -> dict:
     return location
 
 
+class _ConfigBuildContext:
+    """
+    Caches configuration sources while building a compatible configuration so
+    each source is loaded once per build.
+    """
+    def __init__(self):
+        self.core_config = None
+        self.local_configs = dict()
+        self._token = None
+
+    def __enter__(self):
+        self._token = _config_build_context.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _config_build_context.reset(self._token)
+
+
+_config_build_context: ContextVar[Optional[_ConfigBuildContext]] = \
+    ContextVar("config_build_context", default=None)
+_compatible_config_cache = dict()
+
+
+def _get_config_source_mtimes(neon_config_path: Optional[str]) -> tuple:
+    """
+    Get modified times of files used to build a Mycroft-compatible config
+    :param neon_config_path: optional path override to yml config directory
+    :returns: tuple of (file path, modified time or None if missing)
+    """
+    from ovos_config.locations import DEFAULT_CONFIG, SYSTEM_CONFIG, \
+        USER_CONFIG, WEB_CONFIG_CACHE
+    config_dir = neon_config_path or get_config_dir()
+    sources = [join(config_dir, f) for f in ("ngi_local_conf.yml",
+                                             "ngi_user_info.yml",
+                                             "ngi_auth_vars.yml")]
+    sources += [join("/tmp/neon", "ngi_local_conf.yml"),
+                os.getenv("OVOS_DEFAULT_CONFIG") or DEFAULT_CONFIG,
+                SYSTEM_CONFIG, USER_CONFIG, WEB_CONFIG_CACHE]
+    mtimes = list()
+    for source in sources:
+        try:
+            mtimes.append((source, os.path.getmtime(source)))
+        except OSError:
+            mtimes.append((source, None))
+    return tuple(mtimes)
+
+
 def get_mycroft_compatible_config(mycroft_only=False,
-                                  neon_config_path=None) -> dict:
+                                  neon_config_path=None,
+                                  memoize: bool = False) -> dict:
     """
     Get a configuration compatible with mycroft.conf/ovos.conf
     NOTE: This method should only be called at startup to write a .conf file
     :param mycroft_only: if True, ignore Neon configuration files
     :param neon_config_path: optional path override to yml config directory
+    :param memoize: if True, return a copy of a previously built config if
+        none of the source configuration files have been modified
     :returns: dict config compatible with mycroft.conf structure
     """
+    if memoize:
+        cache_key = (mycroft_only, neon_config_path)
+        cached = _compatible_config_cache.get(cache_key)
+        if cached and \
+                cached[0] == _get_config_source_mtimes(neon_config_path):
+            LOG.debug("Configuration sources not modified, using cache")
+            return deepcopy(cached[1])
+        config = get_mycroft_compatible_config(mycroft_only, neon_config_path)
+        # Building config may update source files, so check mtimes after
+        _compatible_config_cache[cache_key] = \
+            (_get_config_source_mtimes(neon_config_path), deepcopy(config))
+        return config
+    if _config_build_context.get() is None:
+        with _ConfigBuildContext():
+            return get_mycroft_compatible_config(mycroft_only,
+                                                 neon_config_path)
     default_config = _safe_mycroft_config()
     if mycroft_only:
         return default_config
@@ -1022,15 +1803,18 @@ def get_mycroft_compatible_config(mycroft_only=False,
     return default_config
 
 
-def write_mycroft_compatible_config(file_to_write: str = None) -> str:
+def write_mycroft_compatible_config(file_to_write: str = None,
+                                    memoize: bool = False) -> str:
     """
     Generates a mycroft-like configuration and writes it to the specified file
     NOTE: This is potentially destructive and will overwrite existing config
     :param file_to_write: config file to write out
+    :param memoize: if True, reuse a previously built configuration if
+        none of the source configuration files have been modified
     :return: path to written config file
     """
     file_to_write = file_to_write or "~/.mycroft/mycroft.conf"
-    configuration = get_mycroft_compatible_config()
+    configuration = get_mycroft_compatible_config(memoize=memoize)
     file_path = os.path.expanduser(file_to_write)
 
     if isfile(file_path):
@@ -1427,9 +2211,25 @@ def _safe_mycroft_config() -> dict:
     Returns:
         dict mycroft configuration
     """
+    return _get_core_config()
+
+
+def _get_core_config() -> dict:
+    """
+    Get a dict copy of the core configuration. If called while building a
+    configuration, `Configuration` is only loaded once per build and each
+    caller gets a deep copy, so changes do not leak between callers.
+    Returns:
+        dict core configuration
+    """
+    context = _config_build_context.get()
+    if context and context.core_config is not None:
+        return deepcopy(context.core_config)
     from ovos_config.config import Configuration
-    config = Configuration()
-    return dict(config)
+    config = dict(Configuration())
+    if context:
+        context.core_config = deepcopy(config)
+    return config
 
 
 @deprecated("Configuration moved to `ovos_config.Configuration`", "2.0.0")
@@ -1553,6 +2353,9 @@ def _get_neon_local_config(path: Optional[str] = None) -> NGIConfig:
     Returns:
         NGIConfig object with local config
     """
+    context = _config_build_context.get()
+    if context and path in context.local_configs:
+        return context.local_configs[path]
     try:
         if isfile(join(path or get_config_dir(), "ngi_local_conf.yml")):
             local_config = NGIConfig("ngi_local_conf", path)
@@ -1573,6 +2376,8 @@ def _get_neon_local_config(path: Optional[str] = None) -> NGIConfig:
 
     # local_config.make_equal_by_keys(default_local_config.content)
     # LOG.info(f"Loaded local config from {local_config.file_path}")
+    if context:
+        context.local_configs[path] = local_config
     return local_config
 
 
@@ -33,11 +33,48 @@ import wave
 
 from tempfile import mkstemp
 
-from typing import Optional, List
+from typing import Iterable, Iterator, Optional, List, Union
 from ovos_utils.signal import ensure_directory_exists
 
 from neon_utils.logger import LOG
 
+# Chunk sizes must be multiples of 3 (raw) and 4 (encoded) bytes so chunks
+# encode and decode independently
+_B64_RAW_CHUNK_SIZE = 3 * 65536
+_B64_ENCODED_CHUNK_SIZE = 4 * 65536
+_B64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz" \
+                b"0123456789+/="
+_NON_B64_BYTES = bytes(c for c in range(256) if c not in _B64_ALPHABET)
+
+
+def iter_file_base64_chunks(path: str,
+                            chunk_size: int = _B64_RAW_CHUNK_SIZE) -> \
+        Iterator[str]:
+    """
+    Encodes a file to base64 in chunks that concatenate to the full encoded
+    string, so files can be encoded and sent without loading them in memory
+    :param path: Path to file to be encoded
+    :param chunk_size: bytes of file to encode per chunk, rounded down to a
+        multiple of 3
+    :return: iterator of encoded string chunks
+    """
+    if not isinstance(path, str):
+        raise TypeError
+    path = os.path.expanduser(path)
+    if not os.path.isfile(path):
+        LOG.error(f"File Not Found: {path}")
+        raise FileNotFoundError
+    chunk_size = max(chunk_size - chunk_size % 3, 3)
+
+    def _iter_chunks():
+        with open(path, "rb") as file_in:
+            while True:
+                chunk = file_in.read(chunk_size)
+                if not chunk:
+                    return
+                yield base64.b64encode(chunk).decode("ascii")
+    return _iter_chunks()
+
 
 def encode_file_to_base64_string(path: str) -> str:
     """
@@ -51,16 +88,67 @@ def encode_file_to_base64_string(path: str) -> str:
     if not os.path.isfile(path):
         LOG.error(f"File Not Found: {path}")
         raise FileNotFoundError
+    # Encode into a preallocated buffer to avoid holding the whole file and
+    # intermediate encoded copies in memory
+    size = os.path.getsize(path)
+    encoded = bytearray(4 * -(-size // 3))
+    position = 0
     with open(path, "rb") as file_in:
-        encoded = base64.b64encode(file_in.read()).decode("utf-8")
-    return encoded
-
-
-def decode_base64_string_to_file(encoded_string: str, output_path: str) -> str:
+        while True:
+            chunk = file_in.read(_B64_RAW_CHUNK_SIZE)
+            if not chunk:
+                break
+            encoded_chunk = base64.b64encode(chunk)
+            encoded[position:position + len(encoded_chunk)] = encoded_chunk
+            position += len(encoded_chunk)
+    if position != len(encoded):
+        # File changed while reading
+        del encoded[position:]
+    return encoded.decode("utf-8")
+
+
+def _iter_aligned_base64(encoded: Union[str, bytes, Iterable[Union[str, bytes]]],
+                         chunk_size: int) -> Iterator[bytes]:
     """
-    Writes out a base64 string to a file object at the specified path
-    :param encoded_string: Base64 encoded string
+    Split base64 data into chunks of `chunk_size` characters, ignoring
+    characters outside the base64 alphabet
+    """
+    if isinstance(encoded, (str, bytes)):
+        pieces = (encoded[i:i + chunk_size]
+                  for i in range(0, len(encoded), chunk_size))
+    else:
+        pieces = encoded
+    pending = list()
+    pending_size = 0
+    for piece in pieces:
+        if isinstance(piece, str):
+            piece = piece.encode("utf-8")
+        piece = bytes(piece).translate(None, _NON_B64_BYTES)
+        pending.append(piece)
+        pending_size += len(piece)
+        aligned = pending_size - pending_size % 4
+        if aligned >= chunk_size:
+            # Join pieces once per chunk so each byte is only copied once
+            data = b"".join(pending)
+            yield data[:aligned]
+            pending = [data[aligned:]] if aligned < pending_size else []
+            pending_size -= aligned
+    if pending_size:
+        yield b"".join(pending)
+
+
+def decode_base64_stream_to_file(encoded: Union[str, bytes,
+                                                Iterable[Union[str, bytes]]],
+                                 output_path: str,
+                                 chunk_size: int = _B64_ENCODED_CHUNK_SIZE) -> \
+        str:
+    """
+    Writes out base64 data to a file at the specified path, decoding and
+    writing it in chunks so the decoded data is never held in memory
+    :param encoded: Base64 encoded string or iterable of string chunks
     :param output_path: Path to file to write (throws exception if file exists)
+    :param chunk_size: characters of encoded data to decode per chunk, rounded
+        down to a multiple of 4
     :return: Path to output file
     """
     if not isinstance(output_path, str):
@@ -70,12 +158,23 @@ def decode_base64_string_to_file(encoded_string: str, output_path: str) -> str:
         LOG.error(f"File already exists: {output_path}")
         raise FileExistsError
     ensure_directory_exists(os.path.dirname(output_path))
+    chunk_size = max(chunk_size - chunk_size % 4, 4)
     with open(output_path, "wb+") as file_out:
-        byte_data = base64.b64decode(encoded_string.encode("utf-8"))
-        file_out.write(byte_data)
+        for chunk in _iter_aligned_base64(encoded, chunk_size):
+            file_out.write(base64.b64decode(chunk))
     return output_path
 
 
+def decode_base64_string_to_file(encoded_string: str, output_path: str) -> str:
+    """
+    Writes out a base64 string to a file object at the specified path
+    :param encoded_string: Base64 encoded string
+    :param output_path: Path to file to write (throws exception if file exists)
+    :return: Path to output file
+    """
+    return decode_base64_stream_to_file(encoded_string, output_path)
+
+
 def get_most_recent_file_in_dir(path: str, ext: Optional[str] = None) -> Optional[str]:
     """
     Gets the most recently created file in the specified path
@@ -26,19 +26,37 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import requests
 import json
 
-from typing import Optional
-from os import makedirs, remove
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from copy import deepcopy
+from random import uniform
+from tempfile import mkstemp
+from threading import Lock, RLock, Timer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, \
+    Union
+from os import fdopen, makedirs, remove, replace
 from os.path import join, isfile, isdir, dirname
 from time import time
 from ovos_utils.log import LOG
 from ovos_utils.xdg_utils import xdg_cache_home
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from neon_utils.cache_utils import PersistentLRUCache, SingleFlight
 
 _DEFAULT_BACKEND_URL = None
-_client_config = {}
-_headers = {}
+_clients = dict()
+_async_clients = dict()
+_clients_lock = Lock()
+
+# Seconds to cache responses from idempotent endpoints, by endpoint prefix
+DEFAULT_RESPONSE_TTLS = {
+    "proxy/geolocation/": 7 * 24 * 60 * 60,
+}
 
 
 def set_default_backend_url(url: Optional[str] = None):
@@ -54,10 +72,6 @@ def set_default_backend_url(url: Optional[str] = None):
     if url and url != _DEFAULT_BACKEND_URL:
         LOG.info(f"Updating HANA backend URL to {url}")
         _DEFAULT_BACKEND_URL = url
-        global _client_config
-        global _headers
-        _client_config = {}
-        _headers = {}
 
 
 def _get_client_config_path(url: str):
@@ -69,6 +83,499 @@ class ServerException(Exception):
     """Exception class representing a backend server communication error"""
 
 
+class _JitteredRetry(Retry):
+    """
+    Retry policy that adds random jitter to the exponential backoff so that
+    clients retrying at the same time spread out their requests
+    """
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return uniform(backoff / 2, backoff) if backoff else backoff
+
+
+def _normalize_payload(data: Any) -> Any:
+    """
+    Normalize request data so equivalent requests share a cache key
+    """
+    if isinstance(data, dict):
+        return {str(k): _normalize_payload(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_normalize_payload(v) for v in data]
+    if isinstance(data, str):
+        return data.strip()
+    if isinstance(data, float):
+        # Round off floating point noise (~0.1m for coordinates)
+        return round(data, 6)
+    return data
+
+
+class ResponseCache:
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 capacity: int = 1024, db_path: Optional[str] = None):
+        """
+        Cache of responses from idempotent backend endpoints, keyed by
+        endpoint and normalized request data. Responses are held in a memory
+        LRU with an optional sqlite tier that persists between restarts.
+        @param ttls: dict of endpoint prefix to seconds responses are valid
+            for; endpoints not matching any prefix are not cached. Default is
+            `DEFAULT_RESPONSE_TTLS`
+        @param capacity: max number of responses to keep in memory
+        @param db_path: path to a sqlite database to persist responses to
+        """
+        self.ttls = dict(DEFAULT_RESPONSE_TTLS if ttls is None else ttls)
+        self._cache = PersistentLRUCache(db_path, capacity=capacity)
+        self._flight = SingleFlight()
+        self._metrics = dict()
+        self._metrics_lock = Lock()
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get a dict of endpoint to `hits` and `misses` counts
+        """
+        with self._metrics_lock:
+            return {endpoint: dict(counts)
+                    for endpoint, counts in self._metrics.items()}
+
+    def attach_disk(self, db_path: str):
+        """
+        Persist cached responses to a sqlite database
+        @param db_path: path to the sqlite database
+        """
+        self._cache.attach_disk(db_path)
+
+    def get_ttl(self, endpoint: str) -> Optional[float]:
+        """
+        Get the seconds responses from an endpoint are cached for
+        @param endpoint: server endpoint
+        @returns: ttl of the longest matching prefix, None if not cacheable
+        """
+        endpoint = endpoint.strip('/')
+        matches = [prefix for prefix in self.ttls
+                   if endpoint.startswith(prefix.lstrip('/'))]
+        if not matches:
+            return None
+        return self.ttls[max(matches, key=len)]
+
+    @staticmethod
+    def get_key(endpoint: str, request_data: dict) -> str:
+        """
+        Get the cache key for a request
+        @param endpoint: server endpoint
+        @param request_data: dict data sent in the request body
+        @returns: string cache key
+        """
+        payload = json.dumps(_normalize_payload(request_data), sort_keys=True,
+                             separators=(',', ':'), default=str)
+        return f"{endpoint.strip('/')}:{payload}"
+
+    def _count(self, endpoint: str, metric: str):
+        with self._metrics_lock:
+            counts = self._metrics.setdefault(endpoint.strip('/'),
+                                              {"hits": 0, "misses": 0})
+            counts[metric] += 1
+
+    def _fetch(self, key: str, ttl: float, func: Callable, endpoint: str,
+               request_data: dict) -> dict:
+        response = func(endpoint, request_data)
+        self._cache.put(key, deepcopy(response), ttl)
+        return response
+
+    def call(self, endpoint: str, request_data: dict,
+             func: Callable[[str, dict], dict]) -> dict:
+        """
+        Get a cached response, or call `func` to make the request. Concurrent
+        requests for the same uncached key make only one call.
+        @param endpoint: server endpoint to query
+        @param request_data: dict data to send in request body
+        @param func: function accepting `endpoint` and `request_data` that
+            makes the request
+        @returns: dict response
+        """
+        ttl = self.get_ttl(endpoint)
+        if not ttl:
+            return func(endpoint, request_data)
+        key = self.get_key(endpoint, request_data)
+        response = self._cache.get(key)
+        if response is not None:
+            self._count(endpoint, "hits")
+        else:
+            self._count(endpoint, "misses")
+            response = self._flight.do(key, self._fetch, key, ttl, func,
+                                       endpoint, request_data)
+        # Callers may modify the response
+        return deepcopy(response)
+
+    def clear(self):
+        """
+        Remove all cached responses from memory and disk
+        """
+        self._cache.clear_disk()
+
+
+class HanaClient:
+    def __init__(self, server_url: str, ssl_verify: bool = True,
+                 pool_size: int = 10,
+                 timeout: Union[float, Tuple[float, float]] = (10, 60),
+                 retries: int = 3, backoff_factor: float = 0.5,
+                 refresh_margin: float = 60,
+                 response_cache: Optional[ResponseCache] = None):
+        """
+        Client for a HANA backend server that reuses pooled connections and
+        manages auth tokens. Tokens are refreshed in a background thread
+        ahead of their expiration so requests do not wait on a refresh.
+        @param server_url: Base URL of HANA server to query
+        @param ssl_verify: If False, disables SSL verification
+        @param pool_size: max number of connections to keep open
+        @param timeout: seconds to wait for a connection and response, or a
+            tuple of (connect timeout, read timeout)
+        @param retries: max number of retries for failed connections and
+            502, 503, and 504 responses
+        @param backoff_factor: base seconds between retries, doubled for each
+            retry with random jitter
+        @param refresh_margin: seconds before token expiration to refresh it
+            in the background; if <= 0, tokens are only refreshed inline
+        @param response_cache: cache for responses from idempotent endpoints
+        """
+        self.server_url = server_url.rstrip('/')
+        self.ssl_verify = ssl_verify
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.client_config = dict()
+        self.headers = dict()
+        self.refresh_margin = refresh_margin
+        self.response_cache = response_cache
+        self._token_lock = RLock()
+        self._refresh_timer: Optional[Timer] = None
+        retry = _JitteredRetry(total=retries, connect=retries, read=0,
+                               status=retries, backoff_factor=backoff_factor,
+                               status_forcelist=(502, 503, 504),
+                               allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _post(self, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Make a POST request to this client's server
+        @param endpoint: server endpoint to query
+        @returns: server response
+        """
+        try:
+            return self.session.post(
+                f"{self.server_url}/{endpoint.lstrip('/')}",
+                verify=self.ssl_verify, timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise ServerException(f"Error connecting to {self.server_url}: "
+                                  f"{e}") from e
+
+    def _write_client_config(self):
+        """
+        Atomically replace the local cache with the current auth tokens.
+        NOTE: This should be called with `self._token_lock` held
+        """
+        client_config_path = _get_client_config_path(self.server_url)
+        cache_dir = dirname(client_config_path)
+        if not isdir(cache_dir):
+            makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = mkstemp(dir=cache_dir, prefix=".hana_token_",
+                               suffix=".tmp")
+        try:
+            with fdopen(fd, 'w') as f:
+                json.dump(self.client_config, f, indent=2)
+            replace(tmp_path, client_config_path)
+        except Exception:
+            with suppress(FileNotFoundError):
+                remove(tmp_path)
+            raise
+
+    def _schedule_refresh(self):
+        """
+        Schedule a background token refresh `refresh_margin` seconds before
+        the current token expires, replacing any previously scheduled refresh.
+        NOTE: This should be called with `self._token_lock` held
+        """
+        self._cancel_refresh()
+        if self.refresh_margin <= 0:
+            return
+        delay = self.client_config.get("expiration", 0) - time() - \
+            self.refresh_margin
+        if delay <= 0:
+            # Token is already within the margin; the next request refreshes
+            return
+        self._refresh_timer = Timer(delay, self._background_refresh)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _cancel_refresh(self):
+        """
+        Cancel any scheduled background token refresh
+        """
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    def _background_refresh(self):
+        """
+        Refresh tokens ahead of expiration, falling back to a new login if
+        the refresh token is rejected. Errors are logged and left for the next
+        request to handle inline.
+        """
+        with self._token_lock:
+            self._refresh_timer = None
+            if not self.client_config:
+                # Client was reset or closed since this refresh was scheduled
+                return
+            try:
+                self.refresh_token()
+            except ServerException as e:
+                LOG.warning(f"Background token refresh failed: {e}")
+                try:
+                    self.get_token()
+                except ServerException as e:
+                    LOG.error(f"Background login failed: {e}")
+
+    def init_client(self):
+        """
+        Initialize request headers for making backend requests. If a local
+        cache is available it will be used, otherwise an auth request will be
+        made to the server
+        """
+        # TODO: Config on disk could be invalid here; consider validating tokens now
+        #   instead of waiting for exception handling with a failed request
+        with self._token_lock:
+            if not self.client_config:
+                client_config_path = _get_client_config_path(self.server_url)
+                if isfile(client_config_path):
+                    with open(client_config_path) as f:
+                        self.client_config = json.load(f)
+                    self._schedule_refresh()
+                else:
+                    self.get_token()
+
+            if not self.headers:
+                self.headers = {"Authorization":
+                                f"Bearer {self.client_config['access_token']}"}
+
+    def get_token(self, username: str = "guest", password: str = "password"):
+        """
+        Get new auth tokens from the server. This will cache the returned
+        token, overwriting any previous data at the cache path.
+        @param username: Username to authorize
+        @param password: Password for specified username
+        """
+        # TODO: username/password from configuration
+        with self._token_lock:
+            resp = self._post("auth/login", json={"username": username,
+                                                  "password": password})
+            if not resp.ok:
+                raise ServerException(f"Error logging into {self.server_url}. "
+                                      f"{resp.status_code}: {resp.text}")
+            self.client_config = resp.json()
+            self.headers = {}
+            self._write_client_config()
+            self._schedule_refresh()
+
+    def refresh_token(self):
+        """
+        Get new tokens from the server using an existing refresh token (if it
+        exists). This will update the cached tokens and associated metadata.
+        """
+        with self._token_lock:
+            self.init_client()
+            update = self._post("auth/refresh", json={
+                "access_token": self.client_config.get("access_token"),
+                "refresh_token": self.client_config.get("refresh_token"),
+                "client_id": self.client_config.get("client_id")})
+            if not update.ok:
+                raise ServerException(f"Error updating token from "
+                                      f"{self.server_url}. "
+                                      f"{update.status_code}: {update.text}")
+            self.client_config = update.json()
+
+            # Update request headers with new token
+            self.headers = {"Authorization":
+                            f"Bearer {self.client_config['access_token']}"}
+            self._write_client_config()
+            self._schedule_refresh()
+
+    def reset(self):
+        """
+        Clear cached tokens to force re-evaluation on the next request
+        """
+        with self._token_lock:
+            self._cancel_refresh()
+            self.client_config = {}
+            self.headers = {}
+
+    def request(self, endpoint: str, request_data: dict,
+                use_cache: bool = True) -> dict:
+        """
+        Make a request to the server and return the json response
+        @param endpoint: server endpoint to query
+        @param request_data: dict data to send in request body
+        @param use_cache: if False, skip the response cache
+        @returns: dict response
+        """
+        if use_cache and self.response_cache is not None:
+            return self.response_cache.call(endpoint, request_data,
+                                            self._request)
+        return self._request(endpoint, request_data)
+
+    def _request(self, endpoint: str, request_data: dict) -> dict:
+        """
+        Make a request to the server, refreshing auth tokens if needed
+        @param endpoint: server endpoint to query
+        @param request_data: dict data to send in request body
+        @returns: dict response
+        """
+        headers = self.headers
+        if not headers or self.client_config.get("expiration", 0) - time() < 30:
+            # Token is missing or expiring and was not refreshed in the
+            # background; a valid token is used without waiting on the lock
+            with self._token_lock:
+                self.init_client()
+                if self.client_config.get("expiration", 0) - time() < 30:
+                    try:
+                        self.refresh_token()
+                    except ServerException as e:
+                        LOG.error(e)
+                        self.get_token()
+                        self.init_client()
+                headers = self.headers
+        resp = self._post(endpoint, json=request_data, headers=headers)
+        if resp.ok:
+            return resp.json()
+        else:
+            try:
+                error = resp.json()["detail"]
+                # Token is actually expired, refresh and retry
+                if error == "Invalid or expired token.":
+                    LOG.warning(f"Token is expired. time={time()}|"
+                                f"expiration="
+                                f"{self.client_config.get('expiration')}")
+                    with self._token_lock:
+                        # Another thread may have refreshed already
+                        if self.headers is headers:
+                            self.refresh_token()
+                        headers = self.headers
+                    resp = self._post(endpoint, json=request_data,
+                                      headers=headers)
+                    if resp.ok:
+                        return resp.json()
+            except Exception as e:
+                LOG.error(e)
+                self.reset()
+                if resp.status_code == 403:
+                    # Invalid token supplied; remove it from local cache
+                    config_file = _get_client_config_path(self.server_url)
+                    if isfile(config_file):
+                        LOG.warning(f"Removing invalid token cache: "
+                                    f"{config_file}")
+                        remove(config_file)
+            raise ServerException(f"Error response {resp.status_code}: "
+                                  f"{resp.text}")
+
+    def close(self):
+        """
+        Cancel any scheduled token refresh and close pooled connections
+        """
+        with self._token_lock:
+            self._cancel_refresh()
+        self.session.close()
+
+
+def get_client(server_url: Optional[str] = None,
+               ssl_verify: bool = True) -> HanaClient:
+    """
+    Get a shared HanaClient for the specified server
+    @param server_url: Base URL of Hana server, else the default backend URL
+    @param ssl_verify: If False, disables SSL verification
+    @returns: HanaClient for the requested server
+    """
+    if not server_url:
+        if not _DEFAULT_BACKEND_URL:
+            set_default_backend_url()
+        server_url = _DEFAULT_BACKEND_URL
+    key = (server_url.rstrip('/'), ssl_verify)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = HanaClient(server_url, ssl_verify=ssl_verify,
+                                       response_cache=ResponseCache())
+        return _clients[key]
+
+
+class AsyncHanaClient:
+    def __init__(self, client: HanaClient):
+        """
+        Asyncio interface to a HanaClient. Requests share the HanaClient's
+        auth tokens and connection pool and run in a thread pool sized to the
+        connection pool.
+        @param client: HanaClient to make requests with
+        """
+        self.client = client
+        self._executor = ThreadPoolExecutor(
+            max_workers=client.pool_size,
+            thread_name_prefix=f"hana_{client.server_url.split('/')[2]}")
+
+    async def request(self, endpoint: str, request_data: dict) -> dict:
+        """
+        Make a request to the server and return the json response
+        @param endpoint: server endpoint to query
+        @param request_data: dict data to send in request body
+        @returns: dict response
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.client.request, endpoint, request_data)
+
+    async def request_many(self, requests_to_send: Iterable[Tuple[str, dict]],
+                           max_concurrency: Optional[int] = None,
+                           return_exceptions: bool = False) -> List[dict]:
+        """
+        Make several requests to the server concurrently
+        @param requests_to_send: iterable of (endpoint, request_data) pairs
+        @param max_concurrency: max number of requests in flight at once,
+            default is the client connection pool size
+        @param return_exceptions: if True, exceptions are returned in place of
+            failed responses instead of raised
+        @returns: list of dict responses in the order requested
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or
+                                      self.client.pool_size)
+
+        async def _request(endpoint: str, request_data: dict) -> dict:
+            async with semaphore:
+                return await self.request(endpoint, request_data)
+
+        return await asyncio.gather(*[_request(endpoint, data) for
+                                      endpoint, data in requests_to_send],
+                                    return_exceptions=return_exceptions)
+
+    def close(self):
+        """
+        Shutdown the thread pool used for requests
+        """
+        self._executor.shutdown(wait=False)
+
+
+def get_async_client(server_url: Optional[str] = None,
+                     ssl_verify: bool = True) -> AsyncHanaClient:
+    """
+    Get a shared AsyncHanaClient for the specified server
+    @param server_url: Base URL of Hana server, else the default backend URL
+    @param ssl_verify: If False, disables SSL verification
+    @returns: AsyncHanaClient for the requested server
+    """
+    client = get_client(server_url, ssl_verify)
+    with _clients_lock:
+        async_client = _async_clients.get(client)
+        if async_client is None:
+            async_client = _async_clients[client] = AsyncHanaClient(client)
+        return async_client
+
+
 def _init_client(backend_address: str, ssl_verify: bool = True):
     """
     Initialize request headers for making backend requests. If a local cache is
@@ -76,20 +583,7 @@ def _init_client(backend_address: str, ssl_verify: bool = True):
     specified backend server
     @param backend_address: Hana server URL to connect to
     """
-    global _client_config
-    global _headers
-    # TODO: Config on disk could be invalid here; consider validating tokens now
-    #   instead of waiting for exception handling with a failed request
-    if not _client_config:
-        client_config_path = _get_client_config_path(backend_address)
-        if isfile(client_config_path):
-            with open(client_config_path) as f:
-                _client_config = json.load(f)
-        else:
-            _get_token(backend_address, ssl_verify=ssl_verify)
-
-    if not _headers:
-        _headers = {"Authorization": f"Bearer {_client_config['access_token']}"}
+    get_client(backend_address, ssl_verify).init_client()
 
 
 def _get_token(backend_address: str, username: str = "guest",
@@ -102,21 +596,7 @@ def _get_token(backend_address: str, username: str = "guest",
     @param username: Username to authorize
     @param password: Password for specified username
     """
-    global _client_config
-    # TODO: username/password from configuration
-    resp = requests.post(f"{backend_address}/auth/login",
-                         json={"username": username,
-                               "password": password},
-                         verify=ssl_verify)
-    if not resp.ok:
-        raise ServerException(f"Error logging into {backend_address}. "
-                              f"{resp.status_code}: {resp.text}")
-    _client_config = resp.json()
-    client_config_path = _get_client_config_path(backend_address)
-    if not isdir(dirname(client_config_path)):
-        makedirs(dirname(client_config_path))
-    with open(client_config_path, "w+") as f:
-        json.dump(_client_config, f, indent=2)
+    get_client(backend_address, ssl_verify).get_token(username, password)
 
 
 def _refresh_token(backend_address: str, ssl_verify: bool = True):
@@ -125,83 +605,54 @@ def _refresh_token(backend_address: str, ssl_verify: bool = True):
     (if it exists). This will update the cached tokens and associated metadata.
     @param backend_address: Hana server URL to connect to
     """
-    global _client_config
-    _init_client(backend_address)
-    update = requests.post(f"{backend_address}/auth/refresh", json={
-        "access_token": _client_config.get("access_token"),
-        "refresh_token": _client_config.get("refresh_token"),
-        "client_id": _client_config.get("client_id")},
-        verify=ssl_verify)
-    if not update.ok:
-        raise ServerException(f"Error updating token from {backend_address}. "
-                              f"{update.status_code}: {update.text}")
-    _client_config = update.json()
-
-    # Update request headers with new token
-    global _headers
-    _headers['Authorization'] = f"Bearer {_client_config['access_token']}"
-
-    client_config_path = _get_client_config_path(backend_address)
-    with open(client_config_path, "w+") as f:
-        json.dump(_client_config, f, indent=2)
+    get_client(backend_address, ssl_verify).refresh_token()
 
 
 def request_backend(endpoint: str, request_data: dict,
                     server_url: str = _DEFAULT_BACKEND_URL,
-                    ssl_verify: bool = True) -> dict:
+                    ssl_verify: bool = True, use_cache: bool = True) -> dict:
     """
     Make a request to a Hana backend server and return the json response
     @param endpoint: server endpoint to query
     @param request_data: dict data to send in request body
     @param server_url: Base URL of Hana server to query
     @param ssl_verify: If False, disables SSL verification
+    @param use_cache: if False, skip the response cache
     @returns: dict response
     """
-    global _client_config
-    global _headers
-    if not server_url:
-        set_default_backend_url()
-        server_url = _DEFAULT_BACKEND_URL
-    if server_url != _DEFAULT_BACKEND_URL and _client_config:
-        LOG.info(f"Using new remote: {server_url}")
-        _client_config = {}
-        _headers = {}
-    _init_client(server_url, ssl_verify=ssl_verify)
-    if _client_config.get("expiration", 0) - time() < 30:
-        try:
-            _refresh_token(server_url, ssl_verify=ssl_verify)
-        except ServerException as e:
-            LOG.error(e)
-            _get_token(server_url, ssl_verify=ssl_verify)
-    request_kwargs = {"url": f"{server_url}/{endpoint.lstrip('/')}",
-                      "json": request_data, "headers": _headers,
-                      "verify": ssl_verify}
-    resp = requests.post(**request_kwargs)
-    if resp.status_code == 502:
-        # This is raised occasionally on valid requests. Need to resolve in HANA
-        resp = requests.post(**request_kwargs)
-    if resp.ok:
-        return resp.json()
-    else:
-        try:
-            error = resp.json()["detail"]
-            # Token is actually expired, refresh and retry
-            if error == "Invalid or expired token.":
-                LOG.warning(f"Token is expired. time={time()}|"
-                            f"expiration={_client_config.get('expiration')}")
-                _refresh_token(server_url, ssl_verify=ssl_verify)
-                resp = requests.post(**request_kwargs)
-                if resp.ok:
-                    return resp.json()
-        except Exception as e:
-            LOG.error(e)
-            # Clear cached config to force re-evaluation on next request
-            _client_config = {}
-            _headers = {}
-            if resp.status_code == 403:
-                # Invalid token supplied; remove it from local cache
-                config_file = _get_client_config_path(server_url)
-                if isfile(config_file):
-                    LOG.warning(f"Removing invalid token cache: {config_file}")
-                    remove(config_file)
-        raise ServerException(f"Error response {resp.status_code}: {resp.text}")
+    return get_client(server_url, ssl_verify).request(endpoint, request_data,
+                                                      use_cache)
+
+
+async def request_backend_async(endpoint: str, request_data: dict,
+                                server_url: Optional[str] = None,
+                                ssl_verify: bool = True) -> dict:
+    """
+    Make a request to a Hana backend server and return the json response
+    @param endpoint: server endpoint to query
+    @param request_data: dict data to send in request body
+    @param server_url: Base URL of Hana server to query
+    @param ssl_verify: If False, disables SSL verification
+    @returns: dict response
+    """
+    return await get_async_client(server_url, ssl_verify).request(
+        endpoint, request_data)
+
+
+async def request_many(requests_to_send: Iterable[Tuple[str, dict]],
+                       server_url: Optional[str] = None,
+                       ssl_verify: bool = True,
+                       max_concurrency: Optional[int] = None,
+                       return_exceptions: bool = False) -> List[dict]:
+    """
+    Make several requests to a Hana backend server concurrently
+    @param requests_to_send: iterable of (endpoint, request_data) pairs
+    @param server_url: Base URL of Hana server to query
+    @param ssl_verify: If False, disables SSL verification
+    @param max_concurrency: max number of requests in flight at once
+    @param return_exceptions: if True, exceptions are returned in place of
+        failed responses instead of raised
+    @returns: list of dict responses in the order requested
+    """
+    return await get_async_client(server_url, ssl_verify).request_many(
+        requests_to_send, max_concurrency, return_exceptions)
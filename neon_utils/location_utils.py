@@ -25,23 +25,39 @@
 # LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+import csv
+import sqlite3
+
+from math import asin, ceil, cos, floor, radians, sin, sqrt
 from time import time
 
 import pytz
 
 from datetime import datetime
-from typing import Optional, Union
+from os import makedirs, remove, replace
+from os.path import dirname, isfile
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple, Union
 
 from dateutil.tz import tzlocal
 from timezonefinder import TimezoneFinder
 from re import sub
 from ovos_utils.log import LOG
 
+from neon_utils.cache_utils import ShardedLRUCache
 from neon_utils.hana_utils import request_backend
 
 # geocode.maps.co nominatim.openstreetmap.org
 _NOMINATIM_DOMAIN = "nominatim.openstreetmap.org"
 
+_tz_finder: Optional[TimezoneFinder] = None
+_tz_finder_lock = Lock()
+# Coordinates are rounded to this many decimal places (~11m) for caching
+_TZ_COORD_PRECISION = 4
+_tz_cache = ShardedLRUCache(capacity=4096)
+
+_gazetteer = None
+
 
 def set_nominatim_domain(domain: str):
     """
@@ -54,6 +70,186 @@ def set_nominatim_domain(domain: str):
     _NOMINATIM_DOMAIN = domain
 
 
+class Gazetteer:
+    # Size in degrees of the grid cells places are indexed in (~55km)
+    CELL_SIZE = 0.5
+    _COLUMNS = ("name", "lat", "lon", "county", "state", "country",
+                "timezone", "population")
+
+    def __init__(self, index_path: str, max_distance_km: float = 30):
+        """
+        Offline index of places for geocoding without network access. Places
+        are stored in a sqlite database with a name index for prefix lookups
+        and a grid index for nearest-neighbor lookups.
+        :param index_path: path to an index created with `Gazetteer.build`
+        :param max_distance_km: max distance to a place for reverse lookups
+        """
+        if not isfile(index_path):
+            raise FileNotFoundError(index_path)
+        self.index_path = index_path
+        self.max_distance_km = max_distance_km
+        self._lock = Lock()
+        self._db = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True,
+                                   check_same_thread=False)
+
+    @classmethod
+    def build(cls, source_path: str, index_path: str) -> int:
+        """
+        Build an index from a CSV file of places. The CSV must have a header
+        with `name`, `lat`, and `lon` columns and may have `county`, `state`,
+        `country`, `timezone`, and `population` columns.
+        :param source_path: path to the CSV file to index
+        :param index_path: path to write the index to
+        :return: number of places indexed
+        """
+        makedirs(dirname(index_path) or ".", exist_ok=True)
+        tmp_path = f"{index_path}.tmp"
+        if isfile(tmp_path):
+            remove(tmp_path)
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.execute("CREATE TABLE places (name TEXT, lat REAL, lon REAL, "
+                       "county TEXT, state TEXT, country TEXT, timezone TEXT, "
+                       "population INTEGER, name_key TEXT, cell INTEGER)")
+            with open(source_path, newline='') as f:
+                rows = ((row["name"], float(row["lat"]), float(row["lon"]),
+                         row.get("county") or None, row.get("state") or None,
+                         row.get("country") or None,
+                         row.get("timezone") or None,
+                         int(row.get("population") or 0),
+                         cls._name_key(row["name"]),
+                         cls._get_cell(float(row["lat"]), float(row["lon"])))
+                        for row in csv.DictReader(f))
+                count = db.executemany("INSERT INTO places VALUES "
+                                       "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                       rows).rowcount
+            db.execute("CREATE INDEX places_name ON places (name_key)")
+            db.execute("CREATE INDEX places_cell ON places (cell)")
+            db.commit()
+            db.execute("VACUUM")
+        finally:
+            db.close()
+        replace(tmp_path, index_path)
+        return count
+
+    @staticmethod
+    def _name_key(name: str) -> str:
+        return name.strip().casefold()
+
+    @classmethod
+    def _get_cell(cls, lat: float, lon: float) -> int:
+        row = floor((lat + 90) / cls.CELL_SIZE)
+        col = floor((lon + 180) / cls.CELL_SIZE) % round(360 / cls.CELL_SIZE)
+        return row * round(360 / cls.CELL_SIZE) + col
+
+    @staticmethod
+    def _distance_km(lat1: float, lon1: float,
+                     lat2: float, lon2: float) -> float:
+        lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+        a = sin((lat2 - lat1) / 2) ** 2 + \
+            cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+        return 12742 * asin(sqrt(a))
+
+    def _query(self, where: str, args: tuple, limit: int = -1) -> List[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM places WHERE {where} "
+                f"ORDER BY population DESC LIMIT ?", (*args, limit)).fetchall()
+        return [dict(zip(self._COLUMNS, row)) for row in rows]
+
+    def search(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Get places with names starting with `prefix`, most populous first
+        :param prefix: case-insensitive name prefix to search for
+        :param limit: max number of places to return
+        :return: list of dict places
+        """
+        key = self._name_key(prefix)
+        if not key:
+            return []
+        return self._query("name_key >= ? AND name_key < ?",
+                           (key, key + chr(0x10FFFF)), limit)
+
+    def geocode(self, city: str, state: Optional[str] = None,
+                country: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the most populous place matching the specified names
+        :param city: case-insensitive place name
+        :param state: optional case-insensitive state name
+        :param country: optional case-insensitive country name
+        :return: dict place if found, else None
+        """
+        for place in self._query("name_key = ?", (self._name_key(city),)):
+            if state and self._name_key(place["state"] or "") != \
+                    self._name_key(state):
+                continue
+            if country and self._name_key(place["country"] or "") != \
+                    self._name_key(country):
+                continue
+            return place
+        return None
+
+    def reverse(self, lat: float, lon: float,
+                max_distance_km: Optional[float] = None) -> Optional[dict]:
+        """
+        Get the place nearest to the specified coordinates
+        :param lat: latitude
+        :param lon: longitude
+        :param max_distance_km: max distance to the returned place (default
+            is the gazetteer max distance)
+        :return: dict place with `distance_km` if found, else None
+        """
+        lat, lon = float(lat), float(lon)
+        max_distance = max_distance_km or self.max_distance_km
+        lat_cells = ceil(max_distance / (111.2 * self.CELL_SIZE))
+        lon_cells = ceil(max_distance /
+                         (111.2 * self.CELL_SIZE *
+                          max(cos(radians(min(abs(lat) + self.CELL_SIZE *
+                                              lat_cells, 90))), 0.01)))
+        lon_cells = min(lon_cells, round(180 / self.CELL_SIZE))
+        cells = {self._get_cell(lat + i * self.CELL_SIZE,
+                                lon + j * self.CELL_SIZE)
+                 for i in range(-lat_cells, lat_cells + 1)
+                 if -90 <= lat + i * self.CELL_SIZE <= 90
+                 for j in range(-lon_cells, lon_cells + 1)}
+        places = self._query(f"cell IN ({', '.join('?' * len(cells))})",
+                             tuple(cells))
+        nearest = None
+        for place in places:
+            place["distance_km"] = self._distance_km(lat, lon, place["lat"],
+                                                     place["lon"])
+            if place["distance_km"] <= max_distance and \
+                    (not nearest or
+                     place["distance_km"] < nearest["distance_km"]):
+                nearest = place
+        return nearest
+
+    def close(self):
+        """
+        Close the index database
+        """
+        with self._lock:
+            self._db.close()
+
+
+def set_gazetteer(index_path: Optional[str],
+                  max_distance_km: float = 30) -> Optional[Gazetteer]:
+    """
+    Configure an offline gazetteer to resolve `get_coordinates` and
+    `get_location` lookups before requesting them from the backend
+    :param index_path: path to an index created with `Gazetteer.build`, or
+        None to disable offline lookups
+    :param max_distance_km: max distance to a place for reverse lookups
+    :return: configured Gazetteer
+    """
+    global _gazetteer
+    if _gazetteer:
+        _gazetteer.close()
+    _gazetteer = Gazetteer(index_path, max_distance_km) if index_path \
+        else None
+    return _gazetteer
+
+
 def get_full_location(address: Union[str, tuple],
                       lang: Optional[str] = None) -> Optional[dict]:
     """
@@ -99,6 +295,14 @@ def get_coordinates(gps_loc: dict) -> (float, float):
     :param gps_loc: dict of "city", "state", "country"
     :return: lat, lng float values
     """
+    if _gazetteer and gps_loc.get('city'):
+        try:
+            place = _gazetteer.geocode(gps_loc['city'], gps_loc.get('state'),
+                                       gps_loc.get('country'))
+            if place:
+                return place['lat'], place['lon']
+        except Exception as e:
+            LOG.error(f"Offline geocoding failed: {e}")
     try:
         request_str = ', '.join((x for x in [gps_loc.get('city'),
                                              gps_loc.get('state'),
@@ -120,6 +324,14 @@ def get_location(lat, lng) -> (str, str, str, str):
     :param lng: longitude
     :return: city, county, state, country
     """
+    if _gazetteer:
+        try:
+            place = _gazetteer.reverse(lat, lng)
+            if place:
+                return place['name'], place['county'], place['state'], \
+                    place['country']
+        except Exception as e:
+            LOG.error(f"Offline reverse geocoding failed: {e}")
     try:
         location = request_backend("proxy/geolocation/reverse",
                                    {"lat": lat, "lon": lng})
@@ -139,6 +351,50 @@ def get_location(lat, lng) -> (str, str, str, str):
     return city, county, state, country
 
 
+def init_timezone_finder(in_memory: bool = False) -> TimezoneFinder:
+    """
+    Initialize the TimezoneFinder shared by timezone lookups
+    :param in_memory: if True, load all timezone data into memory for faster
+        lookups at the cost of memory usage
+    :return: initialized TimezoneFinder
+    """
+    global _tz_finder
+    with _tz_finder_lock:
+        _tz_finder = TimezoneFinder(in_memory=in_memory)
+        _tz_cache.clear()
+        return _tz_finder
+
+
+def _get_timezone_finder() -> TimezoneFinder:
+    """
+    Get the shared TimezoneFinder, initializing it if necessary
+    """
+    global _tz_finder
+    if _tz_finder is None:
+        with _tz_finder_lock:
+            if _tz_finder is None:
+                _tz_finder = TimezoneFinder()
+    return _tz_finder
+
+
+def _get_timezone_name(lat: float, lng: float) -> str:
+    """
+    Get the timezone name for the passed coordinates, using cached results
+    for nearby coordinates
+    """
+    key = (round(float(lat), _TZ_COORD_PRECISION),
+           round(float(lng), _TZ_COORD_PRECISION))
+    timezone = _tz_cache.get(key)
+    if timezone is None:
+        timezone = _get_timezone_finder().timezone_at(lng=key[1], lat=key[0])
+        _tz_cache.put(key, timezone)
+    return timezone
+
+
+def _get_utc_offset(timezone: str, now: datetime) -> float:
+    return pytz.timezone(timezone).utcoffset(now).total_seconds() / 3600
+
+
 def get_timezone(lat, lng) -> (str, float):
     """
     Gets timezone information for the passed coordinates.
@@ -147,10 +403,32 @@ def get_timezone(lat, lng) -> (str, float):
     :param lng: longitude
     :return: timezone name, offset in hours from UTC
     """
-    timezone = TimezoneFinder().timezone_at(lng=float(lng), lat=float(lat))
-    offset = pytz.timezone(timezone).utcoffset(
-        datetime.now()).total_seconds() / 3600
-    return timezone, offset
+    timezone = _get_timezone_name(lat, lng)
+    return timezone, _get_utc_offset(timezone, datetime.now())
+
+
+def get_timezones(coords: Iterable[Tuple[float, float]]) -> \
+        List[Tuple[str, float]]:
+    """
+    Gets timezone information for many coordinates. Each distinct timezone
+    and (rounded) coordinate is only resolved once.
+    :param coords: iterable of (latitude, longitude) pairs
+    :return: list of (timezone name, offset in hours from UTC) in the order
+        of `coords`
+    """
+    now = datetime.now()
+    names = dict()
+    offsets = dict()
+    results = list()
+    for lat, lng in coords:
+        key = (lat, lng)
+        if key not in names:
+            names[key] = _get_timezone_name(lat, lng)
+        timezone = names[key]
+        if timezone not in offsets:
+            offsets[timezone] = _get_utc_offset(timezone, now)
+        results.append((timezone, offsets[timezone]))
+    return results
 
 
 def to_system_time(dt: datetime) -> datetime:
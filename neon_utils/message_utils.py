@@ -28,8 +28,11 @@
 
 import base64
 import inspect
+import sys
 
+from contextvars import ContextVar, Token
 from enum import Enum
+from functools import wraps
 from time import time
 from typing import Optional, Union
 from ovos_bus_client import Message
@@ -37,6 +40,23 @@ from ovos_utils.log import deprecated
 
 from neon_utils.logger import LOG
 
+_current_message: ContextVar[Optional[Message]] = \
+    ContextVar("current_message", default=None)
+
+try:
+    from mycroft_bus_client.message import Message as _MycroftMessage
+    _MESSAGE_TYPES = (Message, _MycroftMessage)
+except ImportError:
+    _MESSAGE_TYPES = (Message,)
+
+
+def _is_message(obj) -> bool:
+    """
+    Check if an object is a Message. `isinstance(obj, Message)` attempts to
+    import `mycroft_bus_client` on every call, so compare types directly.
+    """
+    return issubclass(type(obj), _MESSAGE_TYPES)
+
 
 class MessageKind(Enum):
     SPEAK = "speak"
@@ -119,52 +139,93 @@ def decode_b64_string_to_bytes(data: str, charset: str = "utf-8") -> bytes:
     return encoded
 
 
+def get_current_message() -> Optional[Message]:
+    """
+    Get the Message currently being handled in this context
+    :return: Message set with `set_current_message` if any, else None
+    """
+    return _current_message.get()
+
+
+def set_current_message(message: Optional[Message]) -> Token:
+    """
+    Set the Message being handled in this context, so it can be resolved
+    without digging through the stack
+    :param message: Message being handled
+    :return: Token to pass to `reset_current_message` when handling is done
+    """
+    return _current_message.set(message)
+
+
+def reset_current_message(token: Token):
+    """
+    Restore the current Message to its value before `set_current_message`
+    :param token: Token returned by `set_current_message`
+    """
+    _current_message.reset(token)
+
+
 def dig_for_message(max_records: int = 10) -> Optional[Message]:
     """
-    Dig Through the stack for message. Looks at the current stack for a passed argument of type 'Message'
+    Dig Through the stack for message. Returns the current message if one is
+    set, else looks at the current stack for a passed argument of type 'Message'
     :param max_records: Maximum number of stack records to look through
     :return: Message if found in args, else None
     """
-    stack = inspect.stack()[1:]  # First frame will be this function call
-    stack = stack if len(stack) <= max_records else stack[:max_records]
-    for record in stack:
-        args = inspect.getargvalues(record.frame)
-        if args.args:
-            for arg in args.args:
-                if isinstance(args.locals[arg], Message):
-                    return args.locals[arg]
-    return None
+    message = _current_message.get()
+    if message is not None:
+        return message
+    frame = sys._getframe(1)  # Skip this function call
+    try:
+        for _ in range(max_records):
+            if frame is None:
+                break
+            code = frame.f_code
+            local_vars = frame.f_locals
+            for arg in code.co_varnames[:code.co_argcount +
+                                        code.co_kwonlyargcount]:
+                if _is_message(local_vars.get(arg)):
+                    return local_vars[arg]
+            frame = frame.f_back
+        return None
+    finally:
+        del frame
 
 
 def resolve_message(function):
     """
     Decorator to try and fill an optional `message` kwarg
     """
+    params = inspect.signature(function).parameters
+    if not any([param in params for param in ("message", "kwargs")]):
+        LOG.warning(f"Decorated function does not expect a `message`: "
+                    f"{function.__qualname__}")
+        return function
+
+    # Index of `message` if it may be passed as a positional arg
+    message_index = None
+    if "message" in params and params["message"].kind in \
+            (inspect.Parameter.POSITIONAL_ONLY,
+             inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        message_index = list(params).index("message")
+
+    @wraps(function)
     def wrapper(*args, **kwargs):
-        params = inspect.signature(function).parameters
-        if not any([param in params for param in ("message", "kwargs")]):
-            LOG.warning("Decorated function does not expect a `message`")
-            return function(*args, **kwargs)
-
-        if "message" in params.keys() and len(args):
-            i = 0
-            for param in params:
+        # Check if 'message' is filled by an arg
+        if message_index is not None and message_index < len(args):
+            if not args[message_index]:
                 args = list(args)
-                # Check if 'message' is filled by an arg
-                if param == "message" and i < len(args):
-                    if not args[i]:
-                        args[i] = dig_for_message(50)
-                        return function(*args, **kwargs)
-                i += 1
-
-        if not kwargs.get("message") and not any([arg for arg in args if
-                                                  isinstance(arg, Message)]):
+                args[message_index] = dig_for_message(50)
+                return function(*args, **kwargs)
+
+        if not kwargs.get("message") and not any(_is_message(arg)
+                                                 for arg in args):
             if LOG.diagnostic_mode:
-                call = inspect.stack()[1]
-                module = inspect.getmodule(call.frame)
-                name = module.__name__ if module else call.filename
+                call = sys._getframe(1)
+                name = call.f_globals.get("__name__") or \
+                    call.f_code.co_filename
                 LOG.debug(f"Digging for requested message arg - "
-                          f"{name}:{call.lineno}")
+                          f"{name}:{call.f_lineno}")
             message = dig_for_message(50)
             kwargs["message"] = message
         return function(*args, **kwargs)
@@ -29,12 +29,19 @@
 import logging
 import uuid
 
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import suppress
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
 from ovos_utils.log import deprecated, log_deprecation
 
 log_deprecation("This module has moved to neon_mq_connector.utils.client_utils",
                 "2.0.0")
 try:
-    from threading import Event
+    import pika
+
+    from threading import Event, Lock, Thread
     from pika.channel import Channel
     from pika.exceptions import ProbableAccessDeniedError, StreamLostError
     from neon_mq_connector.connector import MQConnector
@@ -44,10 +51,17 @@ except ImportError:
                       " pip install neon-utils[network]")
 
 from neon_utils.logger import LOG
+from neon_utils.codec_utils import CODEC_VERSION, LEGACY_VERSION, decode, \
+    encode, get_capabilities, is_legacy
 from neon_utils.socket_utils import b64_to_dict
 
 logging.getLogger("pika").setLevel(logging.CRITICAL)
 
+# Message headers advertising the codec version and `CAPABILITY_*` bitmask
+# the sender can decode
+CODEC_VERSION_HEADER = "codec_version"
+CODEC_CAPABILITIES_HEADER = "codec_capabilities"
+
 _default_mq_config = {
     "server": "mq.neonaiservices.com",
     "port": 5672,
@@ -71,6 +85,257 @@ class NeonMQHandler(MQConnector):
             parameters=self.get_connection_params(vhost))
 
 
+class MQRPCClient:
+    def __init__(self, vhost: str, config: Optional[dict] = None,
+                 service_name: str = "mq_handler",
+                 connection_factory: Optional[Callable] = None,
+                 codec_version: int = LEGACY_VERSION):
+        """
+        Long-lived client for making requests to MQ services. One connection
+        and one exclusive reply queue are shared by all requests, and
+        responses are matched to requests by `message_id`. The connection is
+        opened on the first request and owned by a background I/O thread.
+        :param vhost: vhost to connect to
+        :param config: MQ configuration (default read from Configuration)
+        :param service_name: name of the service user in configuration
+        :param connection_factory: optional callable accepting a vhost and
+            returning a `pika.BlockingConnection`-compatible connection
+        :param codec_version: `neon_utils.codec_utils` version to encode
+            requests with. Requests to a queue that has responded in the
+            current codec version are always encoded with it, using only the
+            optional formats advertised in its responses'
+            `CODEC_CAPABILITIES_HEADER`.
+        """
+        self.vhost = vhost
+        self.config = config if config is not None else \
+            dict(Configuration()).get('MQ') or _default_mq_config
+        self.service_name = service_name
+        self.codec_version = codec_version
+        self._connection_factory = connection_factory or \
+            self._default_connection_factory
+        self.reply_queue = None
+        self._connection = None
+        self._channel = None
+        self._thread = None
+        self._closing = False
+        self._lock = Lock()
+        self._pending: Dict[str, Tuple[Future, str,
+                                       pika.BlockingConnection]] = dict()
+        self._declared_queues = set()
+        self._codec_queues: Dict[str, int] = dict()
+
+    def _default_connection_factory(self, vhost: str) -> \
+            pika.BlockingConnection:
+        params = MQConnector(self.config, self.service_name) \
+            .get_connection_params(vhost)
+        return pika.BlockingConnection(parameters=params)
+
+    def _get_connection(self):
+        """
+        Get the open connection, connecting if necessary.
+        NOTE: This should be called with `self._lock` held
+        """
+        if self._connection is None or not self._connection.is_open:
+            self._start()
+        return self._connection
+
+    def _start(self):
+        """
+        Start the I/O thread and wait for it to connect.
+        NOTE: This should be called with `self._lock` held
+        """
+        ready = Event()
+        errors = list()
+        self._closing = False
+        self._thread = Thread(target=self._run, args=(ready, errors),
+                              daemon=True, name=f"mq_rpc_{self.vhost}")
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+
+    def _run(self, ready: Event, errors: list):
+        """
+        Connect and process connection events until closed. pika connections
+        may only be used by the thread that created them.
+        """
+        try:
+            connection = self._connection_factory(self.vhost)
+            channel = connection.channel()
+            reply_queue = channel.queue_declare(
+                queue='', exclusive=True).method.queue
+            channel.basic_consume(queue=reply_queue,
+                                  on_message_callback=self._on_response,
+                                  auto_ack=True)
+        except Exception as e:
+            errors.append(e)
+            ready.set()
+            return
+        self._connection = connection
+        self._channel = channel
+        self.reply_queue = reply_queue
+        self._declared_queues = set()
+        ready.set()
+        try:
+            while not self._closing and connection.is_open:
+                connection.process_data_events(time_limit=1)
+        except Exception as e:
+            LOG.error(f"MQ connection to {self.vhost} lost: {e}")
+        finally:
+            with self._lock:
+                if self._connection is connection:
+                    self._connection = None
+                    self._channel = None
+                # Requests sent on a newer connection are left pending
+                pending = [self._pending.pop(message_id)[0] for message_id,
+                           (_, _, sent_on) in list(self._pending.items())
+                           if sent_on is connection]
+            for future in pending:
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError(f"MQ connection to {self.vhost} "
+                                        f"closed"))
+            with suppress(Exception):
+                if connection.is_open:
+                    connection.close()
+
+    def _publish(self, target_queue: str, body: bytes, expiration: int,
+                 message_id: str):
+        """
+        Publish a request. This runs in the I/O thread.
+        """
+        try:
+            if target_queue not in self._declared_queues:
+                self._channel.queue_declare(queue=target_queue,
+                                            auto_delete=False)
+                self._declared_queues.add(target_queue)
+            self._channel.basic_publish(
+                exchange='', routing_key=target_queue, body=body,
+                properties=pika.BasicProperties(
+                    expiration=str(expiration),
+                    headers={CODEC_VERSION_HEADER: CODEC_VERSION,
+                             CODEC_CAPABILITIES_HEADER: get_capabilities()}))
+        except Exception as e:
+            LOG.error(f"Failed to publish {message_id}: {e}")
+            with self._lock:
+                future, _, _ = self._pending.pop(message_id,
+                                                 (None, None, None))
+            if future and not future.done():
+                future.set_exception(e)
+
+    def _on_response(self, channel: Channel, method, properties,
+                     body: bytes):
+        """
+        Resolve the pending request a response belongs to
+        """
+        try:
+            response = decode(body)
+        except Exception as e:
+            LOG.error(f"Invalid response on {self.reply_queue}: {e}")
+            return
+        with self._lock:
+            future, target_queue, _ = self._pending.pop(
+                response.get('message_id'), (None, None, None))
+            if future and not is_legacy(body):
+                headers = getattr(properties, "headers", None) or dict()
+                self._codec_queues[target_queue] = \
+                    headers.get(CODEC_CAPABILITIES_HEADER) or 0
+        if future and not future.done():
+            future.set_result(response)
+        else:
+            # Responses to timed out or unknown requests are dropped, not
+            # requeued
+            LOG.debug(f"Ignoring response to: {response.get('message_id')}")
+
+    def _send(self, request_data: dict, target_queue: str, expiration: int,
+              future: Optional[Future] = None) -> str:
+        request_data = dict(request_data)
+        message_id = request_data.get('message_id') or uuid.uuid4().hex
+        request_data['message_id'] = message_id
+        # Register the request with the connection it is sent on, so it fails
+        # as soon as that connection's I/O thread exits
+        with self._lock:
+            connection = self._get_connection()
+            if future:
+                request_data['routing_key'] = self.reply_queue
+                self._pending[message_id] = (future, target_queue,
+                                             connection)
+        peer_capabilities = self._codec_queues.get(target_queue)
+        version = self.codec_version if peer_capabilities is None else \
+            CODEC_VERSION
+        body = encode(request_data, version,
+                      peer_capabilities=peer_capabilities or 0)
+        connection.add_callback_threadsafe(
+            partial(self._publish, target_queue, body, expiration,
+                    message_id))
+        return message_id
+
+    def send(self, request_data: dict, target_queue: str,
+             expiration: int = 1000) -> str:
+        """
+        Send a request without waiting for a response
+        :param request_data: data to post to target_queue
+        :param target_queue: queue to post request to
+        :param expiration: ms before the request expires in the queue
+        :return: message_id of the request
+        """
+        return self._send(request_data, target_queue, expiration)
+
+    def request(self, request_data: dict, target_queue: str,
+                timeout: int = 30, expiration: int = 1000) -> dict:
+        """
+        Send a request and wait for the response
+        :param request_data: data to post to target_queue
+        :param target_queue: queue to post request to
+        :param timeout: time in seconds to wait for a response
+        :param expiration: ms before the request expires in the queue
+        :return: response to request, empty if no response was received
+        """
+        future = Future()
+        message_id = self._send(request_data, target_queue, expiration,
+                                future)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            LOG.error(f"Timeout waiting for response to: {message_id} on "
+                      f"{self.reply_queue}")
+            return dict()
+        finally:
+            with self._lock:
+                self._pending.pop(message_id, None)
+
+    def close(self):
+        """
+        Close the connection; the next request will reconnect
+        """
+        with self._lock:
+            self._closing = True
+            connection = self._connection
+            thread = self._thread
+        if connection:
+            with suppress(Exception):
+                # Wake the I/O thread
+                connection.add_callback_threadsafe(lambda: None)
+        if thread:
+            thread.join()
+
+
+_mq_clients: Dict[str, MQRPCClient] = dict()
+_mq_clients_lock = Lock()
+
+
+def get_mq_client(vhost: str) -> MQRPCClient:
+    """
+    Get a shared MQRPCClient for the specified vhost
+    :param vhost: vhost to connect to
+    :return: MQRPCClient for the requested vhost
+    """
+    with _mq_clients_lock:
+        if vhost not in _mq_clients:
+            _mq_clients[vhost] = MQRPCClient(vhost)
+        return _mq_clients[vhost]
+
+
 @deprecated("Use `neon_mq_connector.client.send_mq_request`", "2.0.0")
 def get_mq_response(vhost: str, request_data: dict, target_queue: str,
                     response_queue: str = None, timeout: int = 30) -> dict:
@@ -92,7 +357,20 @@ def send_mq_request(vhost: str, request_data: dict, target_queue: str,
     :param expect_response: boolean indicating whether or not a response is expected
     :return: response to request
     """
-    response_queue = response_queue or uuid.uuid4().hex
+    if not response_queue:
+        client = None
+        try:
+            client = get_mq_client(vhost)
+            if expect_response:
+                return client.request(request_data, target_queue, timeout)
+            client.send(request_data, target_queue)
+        except ProbableAccessDeniedError:
+            user = client.config.get('users').get('mq_handler').get('user') \
+                if client else None
+            raise ValueError(f"{vhost} is not a valid endpoint for {user}")
+        except Exception as ex:
+            LOG.error(f'Exception occurred while resolving Neon API: {ex}')
+        return dict()
 
     response_event = Event()
     message_id = None
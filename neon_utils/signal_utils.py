@@ -26,14 +26,17 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import inspect
+import sys
 
+from os.path import join, isfile
+from threading import Condition, Lock
 from time import time, sleep
-from typing import Optional, Callable
+from typing import Dict, Optional, Callable
 
 from ovos_bus_client import MessageBusClient, Message
 from ovos_utils.log import log_deprecation
 
+from neon_utils.cache_utils import ShardedLRUCache
 from neon_utils.logger import LOG
 
 try:
@@ -43,12 +46,19 @@ except ImportError:
                       " pip install neon-utils[signal]")
 _BUS: Optional[MessageBusClient] = None
 _MAX_TIMEOUT: Optional[int] = None
+_ATTRIBUTE_CALLERS: bool = True
+_signal_cache: Optional[ShardedLRUCache] = None
+_cached_signals = set()
+_cached_signals_lock = Lock()
 
 _create_signal: Optional[Callable] = None
 _check_for_signal: Optional[Callable] = None
 _wait_for_signal_clear: Optional[Callable] = None
 _wait_for_signal_create: Optional[Callable] = None
 
+_signal_watchers: Dict[str, Optional["_SignalWatcher"]] = dict()
+_signal_watchers_lock = Lock()
+
 
 def create_signal(*args, **kwargs):
     global _create_signal
@@ -108,13 +118,16 @@ def init_signal_handlers():
     global _wait_for_signal_clear
     global _wait_for_signal_create
     global _MAX_TIMEOUT
+    global _ATTRIBUTE_CALLERS
     from ovos_config.config import Configuration
     signal_config = Configuration().get("signal") or dict()
     patch_imports = signal_config.get("patch_imports", True)
     _MAX_TIMEOUT = int(signal_config.get("max_wait_seconds") or 300)
+    _ATTRIBUTE_CALLERS = signal_config.get("caller_attribution", True)
 
     if check_signal_manager_available():
         LOG.info("Signal Manager Available")
+        _init_signal_cache(float(signal_config.get("cache_seconds", 2)))
         _create_signal = _manager_create_signal
         _check_for_signal = _manager_check_for_signal
         _wait_for_signal_clear = _manager_wait_for_signal_clear
@@ -172,19 +185,100 @@ def check_signal_manager_available() -> bool:
     return False
 
 
+def _init_signal_cache(ttl: float):
+    """
+    Initialize a local cache of signal states, kept current by signal manager
+    messages on the bus
+    :param ttl: max seconds to cache a signal state, 0 to disable caching
+    """
+    global _signal_cache
+    for msg_type in ("neon.create_signal", "neon.check_for_signal"):
+        _BUS.remove(msg_type, _on_signal_request)
+    with _cached_signals_lock:
+        for signal_name in _cached_signals:
+            for msg_type in _get_signal_state_events(signal_name):
+                _BUS.remove(msg_type, _on_signal_state)
+        _cached_signals.clear()
+    if ttl <= 0:
+        _signal_cache = None
+        return
+    _signal_cache = ShardedLRUCache(capacity=256, shards=4, ttl=ttl)
+    for msg_type in ("neon.create_signal", "neon.check_for_signal"):
+        _BUS.on(msg_type, _on_signal_request)
+
+
+def _get_signal_state_events(signal_name: str) -> tuple:
+    return (f"neon.create_signal.{signal_name}",
+            f"neon.check_for_signal.{signal_name}",
+            f"neon.wait_for_signal_create.{signal_name}",
+            f"neon.wait_for_signal_clear.{signal_name}")
+
+
+def _watch_signal(signal_name: str):
+    """
+    Listen for signal manager responses reporting the state of a signal
+    :param signal_name: name of signal to cache the state of
+    """
+    with _cached_signals_lock:
+        if signal_name in _cached_signals:
+            return
+        _cached_signals.add(signal_name)
+        for msg_type in _get_signal_state_events(signal_name):
+            _BUS.on(msg_type, _on_signal_state)
+
+
+def _on_signal_request(message: Message):
+    """
+    Invalidate the cached state of a signal that may be changed by a request
+    """
+    cache = _signal_cache
+    if cache is None:
+        return
+    if message.msg_type == "neon.create_signal" or \
+            message.data.get("sec_lifetime", 0) != -1:
+        cache.pop(message.data.get("signal_name"))
+
+
+def _on_signal_state(message: Message):
+    """
+    Cache the state of a signal reported by the signal manager
+    """
+    cache = _signal_cache
+    is_set = message.data.get("is_set")
+    if cache is None or is_set is None:
+        return
+    if is_set and message.msg_type.startswith("neon.check_for_signal."):
+        # A set signal may have been cleared by this check
+        return
+    cache.put(message.data.get("signal_name"), is_set)
+
+
+def _get_origin_context(depth: int = 2) -> dict:
+    """
+    Get message context identifying the caller of a signal method
+    :param depth: number of frames between the caller and this method's caller
+    :return: dict `origin_module` and `origin_line`, empty if disabled
+    """
+    if not _ATTRIBUTE_CALLERS:
+        return dict()
+    try:
+        frame = sys._getframe(depth + 1)
+    except ValueError:
+        return dict()
+    return {"origin_module": frame.f_globals.get("__name__") or
+            frame.f_code.co_filename,
+            "origin_line": frame.f_lineno}
+
+
 def _manager_create_signal(signal_name: str, *_, **__) -> bool:
     """
     Backwards-compatible method for creating a signal
     :param signal_name: named signal to create
     :return: True if signal exists
     """
-    call = inspect.stack()[2]
-    module = inspect.getmodule(call.frame)
-    name = module.__name__ if module else call.filename
     stat = _BUS.wait_for_response(Message("neon.create_signal",
                                           {"signal_name": signal_name},
-                                          {"origin_module": name,
-                                           "origin_line": call.lineno}),
+                                          _get_origin_context()),
                                   f"neon.create_signal.{signal_name}", 10) or \
         Message('')
     return stat.data.get("is_set")
@@ -198,17 +292,24 @@ def _manager_check_for_signal(signal_name: str, sec_lifetime: int = 0, *_, **__)
         returning False
     :return: True if signal exists
     """
-    call = inspect.stack()[2]
-    module = inspect.getmodule(call.frame)
-    name = module.__name__ if module else call.filename
+    # Checks with a lifetime may clear the signal, so only persistent checks
+    # are answered from cache
+    cache = _signal_cache if sec_lifetime == -1 else None
+    if cache is not None:
+        is_set = cache.get(signal_name)
+        if is_set is not None:
+            return is_set
+        _watch_signal(signal_name)
     stat = _BUS.wait_for_response(Message("neon.check_for_signal",
                                           {"signal_name": signal_name,
                                            "sec_lifetime": sec_lifetime},
-                                          {"origin_module": name,
-                                           "origin_line": call.lineno}),
+                                          _get_origin_context()),
                                   f"neon.check_for_signal.{signal_name}",
                                   10) or Message('')
-    return stat.data.get("is_set")
+    is_set = stat.data.get("is_set")
+    if cache is not None and is_set is not None:
+        cache.put(signal_name, is_set)
+    return is_set
 
 
 def _manager_wait_for_signal_create(signal_name: str,
@@ -226,7 +327,7 @@ def _manager_wait_for_signal_create(signal_name: str,
                                           {"signal_name": signal_name,
                                            "timeout": timeout}),
                                   f"neon.wait_for_signal_create.{signal_name}",
-                                  bus_wait_time)
+                                  bus_wait_time) or Message('')
     return stat.data.get("is_set")
 
 
@@ -244,19 +345,94 @@ def _manager_wait_for_signal_clear(signal_name: str, timeout: int = 30) -> bool:
                                           {"signal_name": signal_name,
                                            "timeout": timeout}),
                                   f"neon.wait_for_signal_clear.{signal_name}",
-                                  bus_wait_time)
+                                  bus_wait_time) or Message('')
     return stat.data.get("is_set")
 
 
-def _fs_wait_for_signal_create(signal_name: str, timeout: int = 30):
+class _SignalWatcher:
+    """
+    Watches an FS signal directory and wakes threads waiting on `changed`
+    when a signal is created or removed. Uses inotify where available.
+    """
+    def __init__(self, signal_dir: str):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(handler, event):
+                with self.changed:
+                    self.changed.notify_all()
+
+        self.signal_dir = signal_dir
+        self.changed = Condition()
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.schedule(_Handler(), signal_dir)
+        self._observer.start()
+
+
+def _get_signal_dir() -> str:
+    """
+    Get the directory FS signals are written to
+    """
+    from ovos_config.config import read_mycroft_config
+    from ovos_utils.signal import get_ipc_directory, ensure_directory_exists
+    return ensure_directory_exists(
+        join(get_ipc_directory(config=read_mycroft_config()), "signal"))
+
+
+def _get_signal_watcher(signal_dir: str) -> Optional[_SignalWatcher]:
+    """
+    Get a watcher for an FS signal directory, creating it if necessary
+    :param signal_dir: signal directory to watch
+    :return: _SignalWatcher, None if file watching is unavailable
+    """
+    with _signal_watchers_lock:
+        if signal_dir not in _signal_watchers:
+            try:
+                _signal_watchers[signal_dir] = _SignalWatcher(signal_dir)
+            except ImportError:
+                LOG.error("watchdog not available; FS signals will be "
+                          "polled. pip install neon-utils[signal]")
+                _signal_watchers[signal_dir] = None
+            except OSError as e:
+                # inotify watch limit reached or not supported
+                LOG.warning(f"FS signals will be polled: {e}")
+                _signal_watchers[signal_dir] = None
+        return _signal_watchers[signal_dir]
+
+
+def _fs_wait_for_signal(signal_name: str, timeout: int, is_set: bool) -> bool:
+    """
+    Block until the specified FS signal is set or cleared or timeout is reached
+    :param signal_name: name of signal to check
+    :param timeout: max seconds to wait
+    :param is_set: if True, wait for the signal to be created, else cleared
+    :return: True if signal exists
+    """
     expiration = time() + timeout
-    while not check_for_signal(signal_name, -1) and time() < expiration:
-        sleep(0.1)
-    return check_for_signal(signal_name, -1)
+    signal_dir = _get_signal_dir()
+    watcher = _get_signal_watcher(signal_dir)
+    # Equivalent to `check_for_signal(signal_name, -1)` without re-reading
+    # configuration on every check
+    signal_file = join(signal_dir, signal_name)
+    if not watcher:
+        while isfile(signal_file) != is_set and time() < expiration:
+            sleep(0.1)
+        return isfile(signal_file)
+    with watcher.changed:
+        while isfile(signal_file) != is_set:
+            remaining = expiration - time()
+            if remaining <= 0:
+                break
+            # Re-check periodically in case a file event is missed
+            watcher.changed.wait(min(remaining, 1))
+    return isfile(signal_file)
+
+
+def _fs_wait_for_signal_create(signal_name: str, timeout: int = 30):
+    return _fs_wait_for_signal(signal_name, timeout, True)
 
 
 def _fs_wait_for_signal_clear(signal_name: str, timeout: int = 30):
-    expiration = time() + timeout
-    while check_for_signal(signal_name, -1) and time() < expiration:
-        sleep(0.1)
-    return check_for_signal(signal_name, -1)
+    return _fs_wait_for_signal(signal_name, timeout, False)
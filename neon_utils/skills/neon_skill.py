@@ -26,11 +26,12 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import pathlib
 import pickle
 import os
 import time
-from threading import Event
+from threading import Event, local
 
 import yaml
 import json
@@ -47,8 +48,9 @@ from ovos_utils.xdg_utils import xdg_cache_home
 from ovos_utils.log import deprecated, log_deprecation
 from neon_utils.location_utils import to_system_time
 from neon_utils.logger import LOG
-from neon_utils.message_utils import dig_for_message, resolve_message, get_message_user
-from neon_utils.cache_utils import LRUCache
+from neon_utils.message_utils import dig_for_message, resolve_message, get_message_user, \
+    set_current_message, reset_current_message
+from neon_utils.cache_utils import PersistentLRUCache, SingleFlightCache
 from neon_utils.file_utils import resolve_neon_resource_file
 from neon_utils.user_utils import get_user_prefs
 from neon_utils.hana_utils import request_backend, ServerException
@@ -95,7 +97,7 @@ class NeonSkill(OVOSSkill):
         OVOSSkill.__init__(self, name, bus, **kwargs)
         self.cache_loc = os.path.join(xdg_cache_home(), "neon")
         os.makedirs(self.cache_loc, exist_ok=True)
-        self.lru_cache = LRUCache()
+        self.lru_cache = PersistentLRUCache(ttl=CACHE_TIME_OFFSET)
         self._gui_connected = False
 
         try:
@@ -105,6 +107,7 @@ class NeonSkill(OVOSSkill):
             self._neon_core = False
 
         self._actions_to_confirm = dict()
+        self._event_messages = local()
 
         self._lang_detector = None
         self._translator = None
@@ -115,7 +118,10 @@ class NeonSkill(OVOSSkill):
         self._get_response_timeout = 15  # 10 for listener, 5 for STT, then timeout
 
     def initialize(self):
-        # schedule an event to load the cache on disk every CACHE_TIME_OFFSET seconds
+        # back the LRU cache with a persistent store and load cached entries
+        self.lru_cache.attach_disk(os.path.join(self.cache_loc,
+                                                f"lru_{self.skill_id}.sqlite"))
+        # schedule an event to prune the cache on disk every CACHE_TIME_OFFSET seconds
         self.schedule_event(self._write_cache_on_disk, CACHE_TIME_OFFSET,
                             name="neon.load_cache_on_disk")
 
@@ -461,10 +467,13 @@ class NeonSkill(OVOSSkill):
         else:
             return {}
 
-    def decorate_api_call_use_lru(self, func):
+    def decorate_api_call_use_lru(self, func, negative_ttl: float = 10,
+                                  stale_ttl: float = 0):
         """
         Decorate the API-call function to use LRUcache.
         NOTE: the wrapper adds an additional argument, so decorated functions MUST be called with it!
+        Concurrent calls with the same `lru_query` share a single call to
+        `func`. Coroutine functions are decorated with an async wrapper.
 
         from wikipedia_for_humans import summary
         summary = decorate_api_call_use_lru(summary)
@@ -472,31 +481,59 @@ class NeonSkill(OVOSSkill):
 
         Args:
             func: the function to be decorated
+            negative_ttl: seconds to cache exceptions raised by `func` for
+            stale_ttl: seconds before a cached result expires during which it
+                is returned while being refreshed in the background
         Returns: decorated function
         """
+        cache = SingleFlightCache(self.lru_cache, negative_ttl, stale_ttl)
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(lru_query: str, *args, **kwargs):
+                return await cache.call_async(lru_query, func,
+                                              *args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(lru_query: str, *args, **kwargs):
             # TODO might use an abstract method for cached API call to define a signature
-            result = self.lru_cache.get(lru_query)
-            if not result:
-                result = func(*args, **kwargs)
-                self.lru_cache.put(key=lru_query, value=result)
-            return result
+            return cache.call(lru_query, func, *args, **kwargs)
         return wrapper
 
     def _write_cache_on_disk(self):
         """
-        Write the cache on disk, reset the cache and reschedule the event.
+        Remove expired entries from the cache on disk and reschedule the event.
+        Cached entries are written through to disk as they are added.
         This handler is enabled by scheduling an event in NeonSkill.initialize().
         Returns:
         """
-        filename = f"lru_{self.skill_id}"
-        data_load = self.lru_cache.jsonify()
-        self.update_cached_data(filename=filename, new_element=data_load)
-        self.lru_cache.clear()
+        self.lru_cache.prune()
         self.schedule_event(self._write_cache_on_disk, CACHE_TIME_OFFSET, name="neon.load_cache_on_disk")
         return
 
+    def _on_event_start(self, message, *args, **kwargs):
+        """
+        Set the handled message as the current message so it can be resolved
+        without digging through the stack
+        """
+        if not hasattr(self._event_messages, "tokens"):
+            self._event_messages.tokens = list()
+        self._event_messages.tokens.append((message,
+                                            set_current_message(message)))
+        super()._on_event_start(message, *args, **kwargs)
+
+    def _on_event_end(self, message, *args, **kwargs):
+        """
+        Restore the current message set when handling this message started
+        """
+        try:
+            super()._on_event_end(message, *args, **kwargs)
+        finally:
+            tokens = getattr(self._event_messages, "tokens", None)
+            # `_on_event_end` may be called more than once for a message
+            if tokens and tokens[-1][0] is message:
+                reset_current_message(tokens.pop()[1])
+
     def _register_chat_handler(self, name: str, method: callable):
         """
         Register a chat handler entrypoint. Decorated methods must
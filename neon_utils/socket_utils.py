@@ -26,18 +26,28 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json
-import base64
+import asyncio
+import struct
+
+from typing import Optional, Union
+
+from neon_utils.codec_utils import LEGACY_VERSION, decode, decode_legacy, \
+    encode, encode_legacy, is_legacy
 
 # Limited maximum tcp packet size to 10 MB;
 # Implied by the fact that TCP client aborts the connection once has its packet delivered to server
 # thus preventing from sequential traversing
 MAX_PACKET_SIZE = 10485760
 
+# Frames are prefixed with their length as a 4-byte big-endian integer
+FRAME_HEADER = struct.Struct("!I")
+
 
 def get_packet_data(socket, sequentially=False, batch_size=2048) -> bytes:
     """
-        Gets all packet data by reading TCP socket stream sequentially
+        Gets all packet data by reading TCP socket stream sequentially.
+        See `FrameReader` for reading length-prefixed messages without
+        truncation or per-read allocation.
         :@param socket: TCP socket
         :@param sequentially: marker indicating whether received packet data should be read once or sequentially
         :@param batch_size: size of packet added through one sequence
@@ -59,21 +69,161 @@ def get_packet_data(socket, sequentially=False, batch_size=2048) -> bytes:
 
 def b64_to_dict(data: bytes, charset: str = "utf-8") -> dict:
     """
-        Decodes base64-encoded message to python dictionary
+        Decodes base64-encoded message to python dictionary. Messages encoded
+        with `neon_utils.codec_utils.encode` are also accepted.
         @param data: string bytes to decode
         @param charset: character set encoding to use (https://docs.python.org/3/library/codecs.html#standard-encodings)
 
         @return decoded dictionary
     """
-    return eval(json.loads(base64.b64decode(data).decode(charset)))
+    if is_legacy(data):
+        return decode_legacy(data, charset)
+    return decode(data)
 
 
-def dict_to_b64(data: dict, charset: str = "utf-8") -> bytes:
+def dict_to_b64(data: dict, charset: str = "utf-8",
+                version: int = LEGACY_VERSION,
+                peer_capabilities: int = 0) -> bytes:
     """
-        Encodes python dictionary into base64 message
+        Encodes python dictionary into base64 message, or into a versioned
+        `neon_utils.codec_utils` message if the peer supports it
         @param data: python dictionary to encode
         @param charset: character set encoding to use (https://docs.python.org/3/library/codecs.html#standard-encodings)
+        @param version: codec version the peer supports; messages in versions
+            other than `LEGACY_VERSION` are binary, not base64
+        @param peer_capabilities: `neon_utils.codec_utils.CAPABILITY_*`
+            bitmask advertised by the peer
+
+        @return encoded bytes
+    """
+    if version == LEGACY_VERSION:
+        return encode_legacy(data, charset)
+    return encode(data, version, peer_capabilities=peer_capabilities)
+
+
+class FrameReader:
+    def __init__(self, socket, max_frame_size: int = MAX_PACKET_SIZE,
+                 initial_size: int = 65536):
+        """
+            Reads length-prefixed frames from a blocking socket into a reusable
+            buffer that grows to fit the largest frame received
+            :@param socket: connected TCP socket
+            :@param max_frame_size: max size in bytes of a frame to accept
+            :@param initial_size: initial size in bytes of the receive buffer
+        """
+        self.socket = socket
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray(min(initial_size, max_frame_size))
+        self._header = bytearray(FRAME_HEADER.size)
+
+    def _recv_exactly(self, view: memoryview) -> int:
+        """
+            Fill `view` from the socket
+            :@return number of bytes received, less than `len(view)` at EOF
+        """
+        received = 0
+        while received < len(view):
+            count = self.socket.recv_into(view[received:])
+            if not count:
+                break
+            received += count
+        return received
+
+    def read_frame(self) -> Optional[memoryview]:
+        """
+            Read the next frame. The returned view is only valid until the next
+            call; copy it with `bytes()` to keep it.
+            :@return view of frame data, None if the connection was closed
+            :@raises ValueError if the frame is larger than `max_frame_size`
+            :@raises ConnectionError if the connection closed mid-frame
+        """
+        received = self._recv_exactly(memoryview(self._header))
+        if not received:
+            return None
+        if received < FRAME_HEADER.size:
+            raise ConnectionError("Connection closed reading frame header")
+        size = FRAME_HEADER.unpack(self._header)[0]
+        if size > self.max_frame_size:
+            raise ValueError(f"Frame of {size} bytes exceeds max size of "
+                             f"{self.max_frame_size} bytes")
+        if size > len(self._buffer):
+            self._buffer = bytearray(max(size, min(2 * len(self._buffer),
+                                                   self.max_frame_size)))
+        view = memoryview(self._buffer)[:size]
+        if self._recv_exactly(view) < size:
+            raise ConnectionError(f"Connection closed reading {size} byte "
+                                  f"frame")
+        return view
+
+    def __iter__(self):
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield frame
 
-        @return base64 encoded string
+
+def _frame_header(data: Union[bytes, bytearray, memoryview],
+                  max_frame_size: int) -> bytes:
+    size = memoryview(data).nbytes
+    if size > max_frame_size:
+        raise ValueError(f"Frame of {size} bytes exceeds max size of "
+                         f"{max_frame_size} bytes")
+    return FRAME_HEADER.pack(size)
+
+
+def send_frame(socket, data: Union[bytes, bytearray, memoryview],
+               max_frame_size: int = MAX_PACKET_SIZE):
+    """
+        Send a length-prefixed frame
+        :@param socket: connected TCP socket
+        :@param data: frame data to send
+        :@param max_frame_size: max size in bytes of a frame to send
+    """
+    socket.sendall(_frame_header(data, max_frame_size))
+    socket.sendall(data)
+
+
+async def read_frame_async(reader: asyncio.StreamReader,
+                           max_frame_size: int = MAX_PACKET_SIZE) -> \
+        Optional[bytes]:
+    """
+        Read a length-prefixed frame from an asyncio stream. Each frame is
+        returned as a new `bytes` object, since `StreamReader` cannot read
+        into an existing buffer; only the blocking `FrameReader` reuses its
+        receive buffer.
+        :@param reader: StreamReader to read from
+        :@param max_frame_size: max size in bytes of a frame to accept
+        :@return frame data, None if the stream ended
+        :@raises ValueError if the frame is larger than `max_frame_size`
+        :@raises ConnectionError if the stream ended mid-frame
+    """
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ConnectionError("Connection closed reading frame header") from e
+    size = FRAME_HEADER.unpack(header)[0]
+    if size > max_frame_size:
+        raise ValueError(f"Frame of {size} bytes exceeds max size of "
+                         f"{max_frame_size} bytes")
+    try:
+        return await reader.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        raise ConnectionError(f"Connection closed reading {size} byte "
+                              f"frame") from e
+
+
+async def write_frame_async(writer: asyncio.StreamWriter,
+                            data: Union[bytes, bytearray, memoryview],
+                            max_frame_size: int = MAX_PACKET_SIZE):
+    """
+        Write a length-prefixed frame to an asyncio stream
+        :@param writer: StreamWriter to write to
+        :@param data: frame data to send
+        :@param max_frame_size: max size in bytes of a frame to send
     """
-    return base64.b64encode(json.dumps(str(data)).encode(charset))
+    writer.write(_frame_header(data, max_frame_size))
+    writer.write(data)
+    await writer.drain()
@@ -26,7 +26,13 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import atexit
+
+from copy import deepcopy
 from os.path import isfile, join
+from threading import Lock, Timer
+from typing import Optional
+from weakref import WeakKeyDictionary
 from ovos_bus_client import Message, MessageBusClient
 from ovos_utils.log import LOG
 from ovos_config.locations import get_xdg_config_save_path
@@ -72,22 +78,113 @@ def apply_local_user_profile_updates(updated_profile: dict,
         _DEFAULT_USER_CONFIG = user_config.content
 
 
+class _UserProfileIndex:
+    """
+    Index of the user profiles in a message context by username. Profiles
+    are merged with default values once, when first requested.
+    """
+    def __init__(self, profiles: list, default_config: dict):
+        self.profiles = profiles
+        self.length = len(profiles)
+        self.default_config = default_config
+        self._profiles = dict()
+        self._merged = set()
+        for profile in profiles:
+            try:
+                self._profiles.setdefault(profile["user"]["username"],
+                                          profile)
+            except (KeyError, TypeError):
+                LOG.error(f"Malformed profile in message context: {profile}")
+
+    def is_valid(self, profiles: list, default_config: dict) -> bool:
+        """
+        Check if this index still describes the given profiles and defaults
+        """
+        return profiles is self.profiles and \
+            len(profiles) == self.length and \
+            default_config is self.default_config
+
+    def get(self, username: str) -> Optional[dict]:
+        """
+        Get the profile for a user with any missing default values added.
+        Added values are copies, so profiles never share them with defaults.
+        :param username: username to get a profile for
+        :returns: profile dict if the user has a profile, else None
+        """
+        profile = self._profiles.get(username)
+        if profile is not None and username not in self._merged:
+            dict_update_keys(profile, _get_default_prefs(self.default_config))
+            self._merged.add(username)
+        return profile
+
+
+def _copy_prefs(value):
+    """
+    Copy a preference value. Config is plain dicts, lists and scalars, which
+    are copied directly since this is much faster than `deepcopy`.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_prefs(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [_copy_prefs(val) for val in value]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return deepcopy(value)
+
+
+def _get_default_prefs(default_config: dict) -> dict:
+    """
+    Get a copy of the default user config that callers may modify
+    :param default_config: default user config
+    :returns: dict of default preferences sharing no values with defaults
+    """
+    return _copy_prefs(default_config)
+
+
+def _get_user_profile_index(message: Message, profile_key: str,
+                            default_config: dict) -> _UserProfileIndex:
+    """
+    Get an index of user profiles for a message, building it if the message
+    has no index or the indexed profiles changed
+    :param message: Message with user profiles in its context
+    :param profile_key: context key containing the list of user profiles
+    :param default_config: default user config to merge into profiles
+    :returns: _UserProfileIndex of the profiles in message context
+    """
+    profiles = message.context[profile_key]
+    index = getattr(message, "_user_profile_index", None)
+    if index is None or not index.is_valid(profiles, default_config):
+        index = _UserProfileIndex(profiles, default_config)
+        message._user_profile_index = index
+    return index
+
+
+def _invalidate_user_profile_index(message: Message):
+    """
+    Remove the user profile index from a message after its profiles change
+    :param message: Message with user profiles in its context
+    """
+    if hasattr(message, "_user_profile_index"):
+        del message._user_profile_index
+
+
 @resolve_message
 def get_user_prefs(message: Message = None) -> dict:
     """
     Get a dict of user preferences from the given message. Preferences will
     always return the keys present in default configuration, plus any
-    additional keys present in the message context.
+    additional keys present in the message context. Modifying the returned
+    dict does not modify the default user configuration.
     :param message: Message associated with user request
     :returns: dict configuration following the structure of ngi_user_info
     """
     default_user_config = get_default_user_config()
     if not message:
-        return default_user_config
+        return _get_default_prefs(default_user_config)
 
     username = get_message_user(message)
     if not username:
-        return default_user_config
+        return _get_default_prefs(default_user_config)
 
     # nick_profiles is here for legacy support, spec calls for 'user_profiles'
     profile_key = "user_profiles" if "user_profiles" in message.context else \
@@ -95,31 +192,187 @@ def get_user_prefs(message: Message = None) -> dict:
 
     if not profile_key:
         LOG.debug("No profile data in message, returning default")
-        return default_user_config
+        return _get_default_prefs(default_user_config)
     if not isinstance(message.context[profile_key], list):
         LOG.warning(f"Invalid data found in {profile_key}: "
                     f"{message.context[profile_key]}")
-        return default_user_config
-
-    for profile in message.context.get(profile_key):
-        try:
-            if profile["user"]["username"] == username:
-                return dict(dict_update_keys(profile, default_user_config))
-        except KeyError:
-            LOG.error(f"Malformed profile in message context: {profile}")
+        return _get_default_prefs(default_user_config)
+
+    profile = _get_user_profile_index(message, profile_key,
+                                      default_user_config).get(username)
+    if profile is not None:
+        return dict(profile)
     LOG.warning(f"No preferences found for {username} in {message.context}")
-    default_user_config['user']['username'] = username
-    return default_user_config
+    preferences = _get_default_prefs(default_user_config)
+    preferences['user']['username'] = username
+    return preferences
+
+
+class _ProfileUpdate:
+    """
+    Pending profile update for one user
+    """
+    def __init__(self, message: Message, profile: dict):
+        self.message = message
+        self.profile = profile
+        self.delta = dict()
+
+
+class ProfileUpdateService:
+    def __init__(self, bus: Optional[MessageBusClient] = None,
+                 delay: float = 0.5):
+        """
+        Batches profile updates per user and emits one `neon.profile_update`
+        event per batch with the latest profile and all changed values.
+        :param bus: MessageBusClient to emit updates with. If None, a shared
+            client is connected when the first update is emitted
+        :param delay: seconds to wait for more updates before emitting
+        """
+        self._bus = bus
+        self.delay = delay
+        self._lock = Lock()
+        self._pending = dict()
+        self._timer = None
+
+    @property
+    def bus(self) -> MessageBusClient:
+        if self._bus is None:
+            self._bus = _get_shared_bus()
+        return self._bus
+
+    def update(self, username: str, message: Message, profile: dict,
+               delta: dict):
+        """
+        Queue an updated profile to be emitted
+        :param username: user the profile belongs to
+        :param message: Message associated with the update
+        :param profile: complete updated user profile
+        :param delta: profile values changed by this update
+        """
+        with self._lock:
+            update = self._pending.get(username)
+            if update is None:
+                update = self._pending[username] = \
+                    _ProfileUpdate(message, profile)
+            update.message = message
+            update.profile = profile
+            for section, settings in delta.items():
+                if isinstance(settings, dict) and \
+                        isinstance(update.delta.get(section), dict):
+                    update.delta[section].update(settings)
+                else:
+                    update.delta[section] = deepcopy(settings)
+            if self._timer is None:
+                self._timer = Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self, username: Optional[str] = None):
+        """
+        Emit pending updates now
+        :param username: user to emit an update for, None for all users
+        """
+        with self._lock:
+            if username is not None:
+                pending = {username: self._pending.pop(username)} \
+                    if username in self._pending else dict()
+            else:
+                pending = self._pending
+                self._pending = dict()
+            if self._timer and not self._pending:
+                self._timer.cancel()
+                self._timer = None
+        for username, update in pending.items():
+            LOG.debug(f"Emitting profile update for {username}")
+            self.bus.emit(update.message.forward(
+                "neon.profile_update", {"profile": update.profile,
+                                        "delta": update.delta}))
+
+
+_shared_bus = None
+_shared_bus_lock = Lock()
+_profile_update_lock = Lock()
+_profile_update_services = WeakKeyDictionary()
+_default_profile_update_service = None
+_flush_at_exit = False
+
+
+def _get_shared_bus() -> MessageBusClient:
+    """
+    Get a connected MessageBusClient shared by profile updates
+    """
+    global _shared_bus
+    with _shared_bus_lock:
+        if _shared_bus is None:
+            _shared_bus = MessageBusClient()
+            _shared_bus.run_in_thread()
+        return _shared_bus
+
+
+def get_profile_update_service(
+        bus: Optional[MessageBusClient] = None) -> ProfileUpdateService:
+    """
+    Get the ProfileUpdateService that emits updates on the given bus
+    :param bus: MessageBusClient to emit updates with, None for a shared one
+    :returns: ProfileUpdateService for the requested bus
+    """
+    global _default_profile_update_service, _flush_at_exit
+    with _profile_update_lock:
+        if not _flush_at_exit:
+            atexit.register(flush_profile_updates)
+            _flush_at_exit = True
+        if bus is None:
+            if _default_profile_update_service is None:
+                _default_profile_update_service = ProfileUpdateService()
+            return _default_profile_update_service
+        service = _profile_update_services.get(bus)
+        if service is None:
+            service = _profile_update_services[bus] = \
+                ProfileUpdateService(bus)
+        return service
+
+
+def flush_profile_updates():
+    """
+    Emit all pending profile updates
+    """
+    if _default_profile_update_service is not None:
+        _default_profile_update_service.flush()
+    for service in list(_profile_update_services.values()):
+        service.flush()
+
+
+def _get_profile_delta(new_preferences: dict, old_profile: dict) -> dict:
+    """
+    Get the values in new_preferences that will be applied to a profile
+    :param new_preferences: dict of updated profile values
+    :param old_profile: profile to be updated
+    :returns: dict of valid updated values
+    """
+    delta = dict()
+    for section, settings in new_preferences.items():
+        if section not in old_profile:
+            continue
+        if isinstance(settings, dict) and \
+                isinstance(old_profile[section], dict):
+            settings = {key: val for key, val in settings.items()
+                        if key in old_profile[section]}
+            if not settings:
+                continue
+        delta[section] = deepcopy(settings)
+    return delta
 
 
 @resolve_message
 def update_user_profile(new_preferences: dict, message: Message = None,
-                        bus: MessageBusClient = None):
+                        bus: MessageBusClient = None, batch: bool = False):
     """
     Update a user profile and emit an event for database updates.
     :param new_preferences: dict of updated profile values
     :param message: Message associated with request
     :param bus: Optional MessageBusClient to use to emit update event
+    :param batch: If True, batch this update with other updates for the same
+        user into one `neon.profile_update` event emitted after a short delay
     """
     if not message:
         raise ValueError("No message associated with profile update.")
@@ -127,24 +380,28 @@ def update_user_profile(new_preferences: dict, message: Message = None,
     # Update current message object and get updated profile
     username = get_message_user(message)
     user_profile = None
+    delta = None
     if username and 'nick_profiles' in message.context:
         LOG.warning("nick_profiles found and will be updated")
         old_preferences = message.context["nick_profiles"][username]
+        delta = _get_profile_delta(new_preferences, old_preferences)
         user_profile = dict_make_equal_keys(new_preferences, old_preferences)
         message.context["nick_profiles"][username] = user_profile
     elif username and 'user_profiles' in message.context:
         LOG.debug("updating user_profiles")
         for i, profile in enumerate(message.context['user_profiles']):
             if profile['user']['username'] == username:
+                delta = _get_profile_delta(new_preferences, profile)
                 user_profile = dict_make_equal_keys(new_preferences, profile)
                 message.context['user_profiles'][i] = user_profile
                 break
 
     if not user_profile:
         raise RuntimeError(f"No profile found for user: {username}.")
+    _invalidate_user_profile_index(message)
 
     # Notify connector modules of update
-    bus = bus or MessageBusClient()
-    update_message = message.forward("neon.profile_update",
-                                     {"profile": user_profile})
-    bus.emit(update_message)
+    service = get_profile_update_service(bus)
+    service.update(username, message, user_profile, delta)
+    if not batch:
+        service.flush(username)
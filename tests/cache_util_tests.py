@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import os
 import sys
 import random
@@ -118,5 +119,442 @@ class CacheUtilTests(unittest.TestCase):
         self.assertIsInstance(j, str)
 
 
+class ShardedLRUCacheTests(unittest.TestCase):
+    def test_put_get(self):
+        cache = ShardedLRUCache(capacity=128, shards=4)
+        for i in range(16):
+            cache.put(str(i), i)
+        self.assertEqual(len(cache), 16)
+        for i in range(16):
+            self.assertEqual(cache.get(str(i)), i)
+            self.assertIn(str(i), cache)
+        self.assertIsNone(cache.get("invalid"))
+        self.assertFalse(cache.get("invalid", False))
+        self.assertEqual(cache.hits, 16)
+        self.assertEqual(cache.missed, 2)
+
+        self.assertEqual(cache.pop("0"), 0)
+        self.assertNotIn("0", cache)
+        self.assertIsNone(cache.pop("0"))
+        self.assertEqual(set(dict(cache.items()).keys()),
+                         set(str(i) for i in range(1, 16)))
+        self.assertEqual(json.loads(cache.jsonify()), dict(cache.items()))
+        self.assertIsInstance(json.loads(cache.jsonify_metrics()), dict)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 16)
+        cache.clear_full()
+        self.assertEqual(cache.hits, 0)
+
+    def test_eviction(self):
+        cache = ShardedLRUCache(capacity=8, shards=1)
+        for i in range(8):
+            cache.put(i, i)
+        cache.get(0)
+        cache.put(8, 8)
+        self.assertIn(0, cache)
+        self.assertNotIn(1, cache)
+        self.assertEqual(len(cache), 8)
+        self.assertEqual(cache.evictions, 1)
+
+        cache = ShardedLRUCache(capacity=100, shards=4)
+        for i in range(1000):
+            cache.put(i, i)
+        self.assertLessEqual(len(cache), 100)
+        self.assertEqual(sum(s["evictions"] for s in cache.stats),
+                         1000 - len(cache))
+
+        # Capacity is divided across shards without exceeding the total
+        for capacity, shards in ((10, 16), (10, 4), (100, 3)):
+            cache = ShardedLRUCache(capacity=capacity, shards=shards)
+            for i in range(1000):
+                cache.put(i, i)
+            self.assertEqual(len(cache), capacity)
+        self.assertEqual(len(ShardedLRUCache(capacity=10, shards=16).stats),
+                         10)
+
+    def test_ttl(self):
+        from time import sleep
+        cache = ShardedLRUCache(ttl=0.1)
+        cache.put("default", 1)
+        cache.put("long", 2, ttl=60)
+        cache.put("never", 3, ttl=float("inf"))
+        self.assertEqual(cache.get("default"), 1)
+        sleep(0.15)
+        self.assertNotIn("default", cache)
+        self.assertIsNone(cache.get("default"))
+        self.assertEqual(cache.get("long"), 2)
+        self.assertEqual(cache.get("never"), 3)
+        self.assertEqual(sum(s["expirations"] for s in cache.stats), 1)
+        self.assertEqual(dict(cache.items()), {"long": 2, "never": 3})
+
+    def test_max_bytes(self):
+        cache = ShardedLRUCache(capacity=100, shards=1, max_bytes=100,
+                                sizer=len)
+        cache.put("a", "a" * 40)
+        cache.put("b", "b" * 40)
+        self.assertEqual(cache.stats[0]["bytes"], 80)
+        cache.put("c", "c" * 40)
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.stats[0]["bytes"], 80)
+        cache.put("b", "b")
+        self.assertEqual(cache.stats[0]["bytes"], 41)
+        cache.put("too_big", "x" * 101)
+        self.assertNotIn("too_big", cache)
+        self.assertEqual(cache.stats[0]["bytes"], 41)
+
+    def test_threaded_benchmark(self):
+        from threading import Thread, Lock
+        from time import perf_counter
+        from neon_utils.logger import LOG
+        threads = 8
+        operations = 20000
+        errors = list()
+
+        class LockedLRUCache(LRUCache):
+            # LRUCache guarded by a single lock for a thread-safe baseline
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self._lock = Lock()
+
+            def get(self, key):
+                with self._lock:
+                    return super().get(key)
+
+            def put(self, key, value):
+                with self._lock:
+                    return super().put(key, value)
+
+        def _worker(cache, seed):
+            rand = random.Random(seed)
+            try:
+                for _ in range(operations):
+                    key = rand.randint(0, 512)
+                    if cache.get(key) is None:
+                        cache.put(key, key)
+            except Exception as e:
+                errors.append(e)
+
+        def _ops_per_second(cache):
+            workers = [Thread(target=_worker, args=(cache, i))
+                       for i in range(threads)]
+            start = perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            return threads * operations / (perf_counter() - start)
+
+        lru_rate = _ops_per_second(LRUCache(capacity=256))
+        lru_errors = len(errors)
+        errors.clear()
+        locked_rate = _ops_per_second(LockedLRUCache(capacity=256))
+        sharded_cache = ShardedLRUCache(capacity=256, shards=16)
+        sharded_rate = _ops_per_second(sharded_cache)
+        LOG.info(f"ops/sec: LRUCache={round(lru_rate)} "
+                 f"({lru_errors} errors)|"
+                 f"LRUCache with lock={round(locked_rate)}|"
+                 f"ShardedLRUCache={round(sharded_rate)}")
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(sharded_cache), 256)
+        self.assertEqual(sharded_cache.hits + sharded_cache.missed,
+                         threads * operations)
+
+
+class PersistentLRUCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        from tempfile import mkdtemp
+        self.cache_dir = mkdtemp()
+        self.db_path = os.path.join(self.cache_dir, "cache.sqlite")
+
+    def tearDown(self) -> None:
+        import shutil
+        shutil.rmtree(self.cache_dir)
+
+    def test_disk_store(self):
+        from time import time
+        store = DiskCacheStore(self.db_path)
+        store.put("key", {"value": [1, 2]})
+        store.put("expired", "value", time() - 1)
+        store.put("unpicklable", lambda: None)
+        self.assertEqual(store.get("key"), ({"value": [1, 2]}, None))
+        self.assertEqual(store.get("expired"), (None, None))
+        self.assertEqual(store.get("unpicklable"), (None, None))
+        store.put("expired", "value", time() - 1)
+        self.assertEqual(store.items(), [("key", {"value": [1, 2]}, None)])
+        self.assertEqual(store.prune(), 1)
+        self.assertEqual(len(store), 1)
+        store.pop("key")
+        self.assertEqual(len(store), 0)
+        store.close()
+
+    def test_disk_store_keys(self):
+        store = DiskCacheStore(self.db_path)
+        tuple_key = ("api", (("q", "test"),))
+        store.put(tuple_key, "tuple")
+        store.put(str(tuple_key), "string")
+        store.put(1, "int")
+        store.put(("unpicklable", lambda: None), "value")
+        self.assertEqual(store.get(tuple_key), ("tuple", None))
+        self.assertEqual(store.get(str(tuple_key)), ("string", None))
+        self.assertEqual(store.get(1), ("int", None))
+        self.assertEqual(store.get("1"), (None, None))
+        self.assertEqual(store.get(("unpicklable", lambda: None)),
+                         (None, None))
+        self.assertEqual({key: value for key, value, _ in store.items()},
+                         {tuple_key: "tuple", str(tuple_key): "string",
+                          1: "int"})
+        store.pop(tuple_key)
+        self.assertEqual(store.get(tuple_key), (None, None))
+        self.assertEqual(store.get(str(tuple_key)), ("string", None))
+
+        # Database errors are cache misses
+        store.close()
+        self.assertEqual(store.get(1), (None, None))
+        store.put(2, "value")
+        self.assertEqual(store.items(), [])
+        self.assertEqual(len(store), 0)
+
+        # Keys persist through a cache restart
+        cache = PersistentLRUCache(self.db_path)
+        cache.put(tuple_key, "tuple")
+        cache.disk.close()
+        restarted = PersistentLRUCache(self.db_path)
+        self.assertEqual(restarted.get(tuple_key), "tuple")
+        restarted.clear()
+        self.assertEqual(restarted.get(tuple_key), "tuple")
+        restarted.disk.close()
+
+    def test_persistence(self):
+        cache = PersistentLRUCache(self.db_path, ttl=60)
+        for i in range(8):
+            cache.put(str(i), i)
+        cache.put("never", "value", ttl=float("inf"))
+        cache.put("popped", "value")
+        self.assertEqual(cache.pop("popped"), "value")
+        cache.disk.close()
+
+        restarted = PersistentLRUCache(self.db_path, ttl=60)
+        self.assertEqual(len(restarted), 9)
+        self.assertEqual(dict(restarted.items()),
+                         {**{str(i): i for i in range(8)}, "never": "value"})
+        self.assertEqual(restarted.disk.get("never"), ("value", None))
+        self.assertIsNotNone(restarted.disk.get("0")[1])
+        self.assertNotIn("popped", restarted)
+
+        # Memory misses are read from disk
+        restarted.clear()
+        self.assertEqual(restarted.get("1"), 1)
+        self.assertIn("1", restarted)
+        self.assertIsNone(restarted.get("popped"))
+
+        restarted.clear_disk()
+        self.assertEqual(len(restarted.disk), 0)
+        restarted.disk.close()
+
+    def test_attach_disk(self):
+        cache = PersistentLRUCache(capacity=4, shards=1)
+        self.assertIsNone(cache.disk)
+        cache.put("memory", 1)
+        self.assertEqual(cache.prune(), 0)
+
+        other = PersistentLRUCache(self.db_path)
+        for i in range(8):
+            other.put(str(i), i)
+        other.disk.close()
+
+        # Memory entries are written to disk, recent entries are loaded
+        cache.attach_disk(self.db_path)
+        self.assertEqual(len(cache.disk), 9)
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(set(dict(cache.items())), {"memory", "7", "6", "5"})
+        cache.disk.close()
+
+    def test_ttl(self):
+        from time import sleep
+        cache = PersistentLRUCache(self.db_path, ttl=0.1)
+        cache.put("default", 1)
+        cache.put("long", 2, ttl=60)
+        sleep(0.15)
+        self.assertIsNone(cache.get("default"))
+        self.assertEqual(cache.prune(), 0)
+        cache.put("default", 1)
+        sleep(0.15)
+        self.assertEqual(cache.prune(), 1)
+        self.assertEqual(cache.warm_load(), 1)
+        self.assertEqual(dict(cache.items()), {"long": 2})
+        cache.disk.close()
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_single_flight(self):
+        from threading import Thread
+        from time import sleep
+        flight = SingleFlight()
+        calls = list()
+        results = list()
+
+        def _call(value):
+            calls.append(value)
+            sleep(0.2)
+            if value == "error":
+                raise ValueError(value)
+            return value
+
+        def _worker(value):
+            try:
+                results.append(flight.do(value, _call, value))
+            except ValueError as e:
+                results.append(e)
+
+        threads = [Thread(target=_worker, args=(value,))
+                   for value in ["a"] * 8 + ["error"] * 4]
+        for thread in threads:
+            thread.start()
+        sleep(0.1)
+        self.assertTrue(flight.in_flight("a"))
+        for thread in threads:
+            thread.join()
+        self.assertFalse(flight.in_flight("a"))
+        self.assertEqual(sorted(calls), ["a", "error"])
+        self.assertEqual(results.count("a"), 8)
+        self.assertEqual(len([r for r in results
+                              if isinstance(r, ValueError)]), 4)
+
+        # Calls after the pending call finishes are not coalesced
+        self.assertEqual(flight.do("a", _call, "a"), "a")
+        self.assertEqual(calls.count("a"), 2)
+
+        # Each waiting thread raises its own copy of the exception
+        errors = [r for r in results if isinstance(r, ValueError)]
+        self.assertEqual(len(set(map(id, errors))), 4)
+        self.assertEqual({e.args for e in errors}, {("error",)})
+        leader_error = [e for e in errors if e.__cause__ is None]
+        self.assertEqual(len(leader_error), 1)
+        for error in errors:
+            if error is not leader_error[0]:
+                self.assertIs(error.__cause__, leader_error[0])
+
+        # Waiting threads raise if the call is interrupted
+        def _interrupted():
+            sleep(0.2)
+            raise KeyboardInterrupt()
+
+        def _interrupted_worker():
+            try:
+                results.append(flight.do("interrupt", _interrupted))
+            except BaseException as e:
+                results.append(e)
+
+        results.clear()
+        threads = [Thread(target=_interrupted_worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len([r for r in results
+                              if isinstance(r, KeyboardInterrupt)]), 1)
+        self.assertEqual(len([r for r in results
+                              if isinstance(r, RuntimeError)]), 2)
+
+    def test_async_single_flight(self):
+        flight = AsyncSingleFlight()
+        calls = list()
+
+        async def _call(value):
+            calls.append(value)
+            await asyncio.sleep(0.1)
+            return value
+
+        async def _test():
+            results = await asyncio.gather(
+                *[flight.do("a", _call, "a") for _ in range(8)],
+                flight.do("b", _call, "b"))
+            self.assertEqual(results, ["a"] * 8 + ["b"])
+            self.assertFalse(flight.in_flight("a"))
+
+            # Cancelling one caller does not cancel the shared call
+            first = asyncio.ensure_future(flight.do("c", _call, "c"))
+            second = asyncio.ensure_future(flight.do("c", _call, "c"))
+            await asyncio.sleep(0)
+            first.cancel()
+            self.assertEqual(await second, "c")
+
+        asyncio.run(_test())
+        self.assertEqual(calls, ["a", "b", "c"])
+
+    def test_single_flight_cache(self):
+        from time import sleep
+        calls = list()
+        cache = SingleFlightCache(ShardedLRUCache(ttl=0.2), negative_ttl=0.2,
+                                  stale_ttl=1)
+
+        def _call(value):
+            calls.append(value)
+            if value == "error":
+                raise ValueError(value)
+            return f"{value}_{len(calls)}"
+
+        self.assertEqual(cache.call("a", _call, "a"), "a_1")
+        self.assertEqual(cache.call("a", _call, "a"), "a_1")
+        self.assertEqual(calls, ["a"])
+
+        # Falsy results are not cached
+        self.assertIsNone(cache.call("none", lambda: None))
+        self.assertNotIn("none", cache.cache)
+
+        # Exceptions are cached for `negative_ttl`
+        with self.assertRaises(ValueError) as original:
+            cache.call("error", _call, "error")
+        traceback = original.exception.__traceback__
+        for _ in range(2):
+            with self.assertRaises(ValueError) as cached:
+                cache.call("error", _call, "error")
+            self.assertIsNot(cached.exception, original.exception)
+            self.assertIs(cached.exception.__cause__, original.exception)
+        self.assertIs(original.exception.__traceback__, traceback)
+        self.assertEqual(calls.count("error"), 1)
+        sleep(0.25)
+        with self.assertRaises(ValueError):
+            cache.call("error", _call, "error")
+        self.assertEqual(calls.count("error"), 2)
+
+        # Stale entries are returned and refreshed in the background
+        self.assertEqual(cache.call("a", _call, "a"), "a_1")
+        sleep(0.1)
+        self.assertEqual(calls[-1], "a")
+        self.assertEqual(cache.call("a", _call, "a"), "a_4")
+
+    def test_single_flight_cache_async(self):
+        calls = list()
+        cache = SingleFlightCache(ShardedLRUCache(ttl=0.2), negative_ttl=0.2,
+                                  stale_ttl=1)
+
+        async def _call(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            if value == "error":
+                raise ValueError(value)
+            return f"{value}_{len(calls)}"
+
+        async def _test():
+            results = await asyncio.gather(
+                *[cache.call_async("a", _call, "a") for _ in range(4)])
+            self.assertEqual(results, ["a_1"] * 4)
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    await cache.call_async("error", _call, "error")
+            self.assertEqual(calls, ["a", "error"])
+
+            await asyncio.sleep(0.25)
+            self.assertEqual(await cache.call_async("a", _call, "a"), "a_1")
+            await asyncio.sleep(0.1)
+            self.assertEqual(await cache.call_async("a", _call, "a"), "a_3")
+
+        asyncio.run(_test())
+        self.assertEqual(calls, ["a", "error", "a"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,196 @@
+# NEON AI (TM) SOFTWARE, Software Development Kit & Application Framework
+# All trademark and other rights reserved by their respective owners
+# Copyright 2008-2025 Neongecko.com Inc.
+# Contributors: Daniel McKnight, Guy Daniels, Elon Gasper, Richard Leeds,
+# Regina Bloomstine, Casimiro Ferreira, Andrii Pernatii, Kirill Hrymailo
+# BSD-3 License
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+# 1. Redistributions of source code must retain the above copyright notice,
+#    this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR
+# PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# CONTRIBUTORS  BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL,
+# EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA,
+# OR PROFITS;  OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING
+# NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import base64
+import json
+import os
+import sys
+import unittest
+
+from timeit import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from neon_utils.logger import LOG
+from neon_utils.codec_utils import *
+import neon_utils.codec_utils
+
+TEST_DICT = {"message_id": "7c4fa2a3c2f64d1b9d2b6c8f9a1e0b3d",
+             "routing_key": "8e0c4f9b6a3d4e7f9c1b2a5d6e8f0a1c",
+             "data": {"utterances": ["what time is it in seattle"] * 4,
+                      "lang": "en-us", "score": 0.87, "handled": True,
+                      "skills": [{"name": f"skill-{i}", "ok": i % 2 == 0,
+                                  "confidence": i / 10, "context": None}
+                                 for i in range(50)]},
+             "context": {"client": "test", "timing": {"start": 1.5}}}
+
+LEGACY_DICT = {b"section 1": {"key1": "val1", "key2": "val2"},
+               "section 2": {"key_1": b"val1", "key_2": f"val2"}}
+LEGACY_DICT_B64 = b'IntiJ3NlY3Rpb24gMSc6IHsna2V5MSc6ICd2YWwxJywgJ2tleTInOiAndmFsMid9LCAnc2VjdGlvbiAyJzogeydrZXlfMSc6IGIndmFsMScsICdrZXlfMic6ICd2YWwyJ319Ig=='
+
+
+class CodecUtilTests(unittest.TestCase):
+    def test_encode_decode(self):
+        encoded = encode(TEST_DICT)
+        self.assertTrue(encoded.startswith(MAGIC + bytes((CODEC_VERSION,))))
+        self.assertFalse(is_legacy(encoded))
+        self.assertEqual(decode(encoded), TEST_DICT)
+        self.assertEqual(decode(bytearray(encoded)), TEST_DICT)
+        self.assertEqual(decode(memoryview(encoded)), TEST_DICT)
+
+        # Decode from a view into a larger buffer
+        buffer = bytearray(b"prefix" + encoded + b"suffix")
+        view = memoryview(buffer)[6:6 + len(encoded)]
+        self.assertEqual(decode(view), TEST_DICT)
+
+        with self.assertRaises(ValueError):
+            decode(MAGIC + bytes((CODEC_VERSION + 1, SERIALIZER_JSON)) +
+                   b"{}")
+        with self.assertRaises(ValueError):
+            encode({}, CODEC_VERSION + 1)
+
+    def test_legacy(self):
+        self.assertEqual(encode(LEGACY_DICT, LEGACY_VERSION), LEGACY_DICT_B64)
+        self.assertTrue(is_legacy(LEGACY_DICT_B64))
+        self.assertEqual(decode(LEGACY_DICT_B64), LEGACY_DICT)
+        self.assertEqual(decode_legacy(LEGACY_DICT_B64), LEGACY_DICT)
+        self.assertEqual(decode(encode_legacy(TEST_DICT)), TEST_DICT)
+
+        # Legacy payloads are parsed, not evaluated
+        unsafe = base64.b64encode(json.dumps(
+            "__import__('os').system('exit 1')").encode())
+        with self.assertRaises(ValueError):
+            decode(unsafe)
+
+    def test_unsupported_types(self):
+        data = {"key": b"bytes", 1: "int key"}
+        encoded = encode(data)
+        self.assertEqual(decode(encoded), data)
+        # JSON serializers fall back to the legacy format
+        self.assertTrue(is_legacy(encoded))
+
+        encoded = encode(data, peer_capabilities=CAPABILITY_MSGPACK)
+        self.assertEqual(decode(encoded), data)
+        if neon_utils.codec_utils.msgpack:
+            self.assertEqual(encoded[len(MAGIC) + 1], SERIALIZER_MSGPACK)
+        else:
+            self.assertTrue(is_legacy(encoded))
+
+    def test_stdlib_json(self):
+        from unittest.mock import patch
+        with patch.object(neon_utils.codec_utils, "orjson", None):
+            data = {1: "a", "t": (1, 2)}
+            encoded = encode(data)
+            self.assertTrue(is_legacy(encoded))
+            self.assertEqual(decode(encoded), data)
+
+            encoded = encode({"t": (1, 2), "d": [{2: None}]})
+            self.assertTrue(is_legacy(encoded))
+
+            # Tuples are decoded as lists in the current version
+            encoded = encode({"t": (1, 2)})
+            self.assertEqual(encoded[len(MAGIC) + 1], SERIALIZER_JSON)
+            self.assertEqual(decode(encoded), {"t": [1, 2]})
+        if neon_utils.codec_utils.orjson:
+            self.assertEqual(decode(encode({"t": (1, 2)})), {"t": [1, 2]})
+
+    def test_peer_capabilities(self):
+        from unittest.mock import patch
+        with patch.object(neon_utils.codec_utils, "msgpack", None), \
+                patch.object(neon_utils.codec_utils, "zstandard", None):
+            self.assertEqual(get_capabilities(), 0)
+        with patch.object(neon_utils.codec_utils, "msgpack", object()), \
+                patch.object(neon_utils.codec_utils, "zstandard", object()):
+            self.assertEqual(get_capabilities(),
+                             CAPABILITY_MSGPACK | CAPABILITY_ZSTD)
+
+        # Peers that have not advertised capabilities get uncompressed JSON
+        data = {"data": "a" * 10000}
+        encoded = encode(data, compress_threshold=0)
+        self.assertIn(encoded[len(MAGIC) + 1],
+                      (SERIALIZER_ORJSON, SERIALIZER_JSON))
+        self.assertEqual(json.loads(encoded[len(MAGIC) + 2:]), data)
+        with patch.object(neon_utils.codec_utils, "msgpack", None), \
+                patch.object(neon_utils.codec_utils, "zstandard", None), \
+                patch.object(neon_utils.codec_utils, "orjson", None):
+            self.assertEqual(decode(encoded), data)
+
+    def test_serializers(self):
+        from unittest.mock import patch
+        for serializer in (SERIALIZER_MSGPACK, SERIALIZER_ORJSON,
+                           SERIALIZER_JSON):
+            if serializer == SERIALIZER_MSGPACK and \
+                    not neon_utils.codec_utils.msgpack:
+                continue
+            if serializer == SERIALIZER_ORJSON and \
+                    not neon_utils.codec_utils.orjson:
+                continue
+            with patch("neon_utils.codec_utils._get_serializer",
+                       return_value=serializer):
+                encoded = encode(TEST_DICT)
+            self.assertEqual(encoded[len(MAGIC) + 1], serializer)
+            self.assertEqual(decode(encoded), TEST_DICT)
+
+    @unittest.skipUnless(neon_utils.codec_utils.zstandard,
+                         "zstandard not installed")
+    def test_compression(self):
+        small = encode({"data": "a" * 10}, peer_capabilities=CAPABILITY_ZSTD)
+        self.assertFalse(small[len(MAGIC) + 1] & 0x10)
+        self.assertFalse(encode({"data": "a" * 10000})[len(MAGIC) + 1] & 0x10)
+        large = encode({"data": "a" * 10000},
+                       peer_capabilities=CAPABILITY_ZSTD)
+        self.assertTrue(large[len(MAGIC) + 1] & 0x10)
+        self.assertLess(len(large), 1000)
+        self.assertEqual(decode(large), {"data": "a" * 10000})
+        self.assertEqual(decode(memoryview(large)), {"data": "a" * 10000})
+
+    def test_codec_benchmark(self):
+        import ast
+        from unittest.mock import patch
+        legacy = encode_legacy(TEST_DICT)
+        encoded = encode(TEST_DICT)
+        legacy_encode = timeit(lambda: encode_legacy(TEST_DICT), number=200)
+        legacy_decode = timeit(lambda: decode_legacy(legacy), number=200)
+        with patch("base64.b64encode", wraps=base64.b64encode) as b64encode:
+            new_encode = timeit(lambda: encode(TEST_DICT), number=200)
+        with patch("base64.b64decode", wraps=base64.b64decode) as b64decode:
+            with patch("ast.literal_eval", wraps=ast.literal_eval) as parse:
+                new_decode = timeit(lambda: decode(encoded), number=200)
+        LOG.info(f"Size: legacy={len(legacy)}|new={len(encoded)}")
+        LOG.info(f"Encode: legacy={legacy_encode / 200}s|"
+                 f"new={new_encode / 200}s")
+        LOG.info(f"Decode: legacy={legacy_decode / 200}s|"
+                 f"new={new_decode / 200}s")
+        self.assertLess(len(encoded), len(legacy))
+        # The current version skips base64 and Python literal parsing
+        b64encode.assert_not_called()
+        b64decode.assert_not_called()
+        parse.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
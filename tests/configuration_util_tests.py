@@ -289,6 +289,294 @@ class NGIConfigTests(unittest.TestCase):
         self.assertIsInstance(config.content, dict)
         os.remove(os.path.join(CONFIG_PATH, "temp_conf.yml"))
 
+    def test_watched_config(self):
+        from neon_utils.configuration_utils import NGIConfig
+        watched_file = join(CONFIG_PATH, "watched_conf.yml")
+        shutil.copy(join(CONFIG_PATH, "ngi_local_conf.yml"), watched_file)
+        config = NGIConfig("watched_conf", CONFIG_PATH, True, watch=True)
+        self.assertTrue(config._watched)
+        self.assertTrue(config["prefFlags"]["devMode"])
+
+        # Reads without a file change event do not check the file
+        with mock.patch("os.path.getmtime") as getmtime:
+            self.assertTrue(config["prefFlags"]["devMode"])
+            self.assertTrue(config.get("prefFlags")["devMode"])
+            getmtime.assert_not_called()
+
+        # External changes are loaded after the change event
+        sleep(0.01)
+        with open(watched_file) as f:
+            disk_content = yaml.safe_load(f)
+        disk_content["prefFlags"]["devMode"] = False
+        with open(watched_file, "w") as f:
+            yaml.safe_dump(disk_content, f)
+        timeout = 5
+        while config["prefFlags"]["devMode"] and timeout > 0:
+            sleep(0.1)
+            timeout -= 0.1
+        self.assertFalse(config["prefFlags"]["devMode"])
+
+        # Changes written by this object are not reloaded
+        config.update_yaml_file("prefFlags", "devMode", True)
+        self.assertTrue(config["prefFlags"]["devMode"])
+        config.stop_watching()
+        self.assertFalse(config._watched)
+        self.assertTrue(config["prefFlags"]["devMode"])
+        os.remove(watched_file)
+
+    def test_write_behind_config(self):
+        from neon_utils.configuration_utils import NGIConfig
+        import neon_utils.configuration_utils
+        test_file = join(CONFIG_PATH, "write_behind_conf.yml")
+        shutil.copy(join(CONFIG_PATH, "ngi_local_conf.yml"), test_file)
+        os.chmod(test_file, 0o640)
+
+        def _read_disk():
+            with open(test_file) as f:
+                return yaml.safe_load(f)
+
+        config = NGIConfig("write_behind_conf", CONFIG_PATH, True,
+                           write_delay=30)
+        real_write = config._write_queued_changes
+        config._write_queued_changes = mock.Mock(side_effect=real_write)
+
+        # Changes are queued and written once on flush
+        for i in range(10):
+            config.update_yaml_file("devVars", "devName", f"device_{i}")
+        config + {"new_key": True}
+        config.remove_key("gestures")
+        self.assertTrue(config._pending_write)
+        self.assertIn(config,
+                      neon_utils.configuration_utils._write_behind_configs)
+        self.assertNotEqual(_read_disk()["devVars"]["devName"], "device_9")
+        config._write_queued_changes.assert_not_called()
+
+        self.assertTrue(config.flush())
+        config._write_queued_changes.assert_called_once()
+        self.assertFalse(config._pending_write)
+        self.assertIsNone(config._write_timer)
+        disk = _read_disk()
+        self.assertEqual(disk["devVars"]["devName"], "device_9")
+        self.assertTrue(disk["new_key"])
+        self.assertNotIn("gestures", disk)
+        self.assertEqual(os.stat(test_file).st_mode & 0o777, 0o640)
+        self.assertEqual(glob(join(CONFIG_PATH, ".write_behind_conf*.tmp")),
+                         [])
+        self.assertFalse(config.flush())
+
+        # Changes are written after the delay
+        config._write_delay = 0.2
+        config.update_yaml_file("devVars", "devName", "delayed")
+        config.update_yaml_file("devVars", "devType", "delayed")
+        self.assertIsNotNone(config._write_timer)
+        sleep(0.5)
+        self.assertIsNone(config._write_timer)
+        self.assertEqual(_read_disk()["devVars"]["devName"], "delayed")
+        self.assertEqual(_read_disk()["devVars"]["devType"], "delayed")
+        self.assertEqual(config._write_queued_changes.call_count, 2)
+        self.assertEqual(NGIConfig("write_behind_conf", CONFIG_PATH,
+                                   True).content, config.content)
+
+        def _write_disk(section, key, value):
+            disk = _read_disk()
+            disk.setdefault(section, dict())[key] = value
+            with open(test_file, "w") as f:
+                yaml.safe_dump(disk, f)
+
+        # Reads keep queued changes when the file is modified on disk
+        config._write_delay = 30
+        config.update_yaml_file("devVars", "devName", "merged")
+        config.remove_key("new_key")
+        _write_disk("devVars", "devType", "external")
+        os.utime(test_file, (1, 1))
+        self.assertEqual(config["devVars"]["devName"], "merged")
+        self.assertEqual(config["devVars"]["devType"], "external")
+        self.assertNotIn("new_key", config)
+        self.assertTrue(config._content.dirty)
+
+        # Queued changes are merged with changes made on disk
+        config.update_yaml_file("devVars", "devName", "flushed")
+        _write_disk("external", "key", True)
+        os.utime(test_file, (2, 2))
+        self.assertTrue(config.flush())
+        disk = _read_disk()
+        self.assertEqual(disk["devVars"]["devName"], "flushed")
+        self.assertEqual(disk["devVars"]["devType"], "external")
+        self.assertTrue(disk["external"]["key"])
+        self.assertNotIn("new_key", disk)
+        self.assertEqual(config.content, disk)
+        self.assertFalse(config._content.dirty)
+
+        # Failed writes keep changes queued
+        config.update_yaml_file("devVars", "devName", "failed")
+        with mock.patch("neon_utils.configuration_utils.os.replace",
+                        side_effect=OSError):
+            self.assertFalse(config.flush())
+        self.assertTrue(config._content.dirty)
+        self.assertIn(config,
+                      neon_utils.configuration_utils._write_behind_configs)
+        self.assertNotEqual(_read_disk()["devVars"]["devName"], "failed")
+        self.assertTrue(config.flush())
+        self.assertEqual(_read_disk()["devVars"]["devName"], "failed")
+        os.remove(test_file)
+
+    def test_config_dirty_tracking(self):
+        from neon_utils.configuration_utils import NGIConfig, TrackedDict
+        test_file = join(CONFIG_PATH, "dirty_conf.yml")
+        shutil.copy(join(CONFIG_PATH, "ngi_local_conf.yml"), test_file)
+        config = NGIConfig("dirty_conf", CONFIG_PATH, True)
+        self.assertIsInstance(config.content, TrackedDict)
+        self.assertFalse(config.content.dirty)
+        real_write = config._write_yaml_file
+        config._write_yaml_file = mock.Mock(side_effect=real_write)
+
+        # No changes
+        self.assertFalse(config.write_changes())
+        config["prefFlags"]["devMode"] = config["prefFlags"]["devMode"]
+        config.update_keys({"prefFlags": {"devMode": False}})
+        config.make_equal_by_keys(config.content.to_dict())
+        config.populate({"prefFlags": {"devMode": False}}, True)
+        self.assertFalse(config.content.dirty)
+        config._write_yaml_file.assert_not_called()
+
+        # Nested change
+        config["prefFlags"]["devMode"] = not config["prefFlags"]["devMode"]
+        self.assertEqual(config.content.dirty_keys, {"prefFlags"})
+        self.assertTrue(config.write_changes())
+        self.assertFalse(config.content.dirty)
+        config._write_yaml_file.assert_called_once()
+
+        # Nested list change
+        config["devVars"]["test_list"] = [1, 2]
+        config.write_changes()
+        config["devVars"]["test_list"].append({"three": 3})
+        self.assertEqual(config.content.dirty_keys, {"devVars"})
+        config.write_changes()
+        config["devVars"]["test_list"][2]["three"] = "3"
+        self.assertTrue(config.content.dirty)
+        config.write_changes()
+        self.assertEqual(config._write_yaml_file.call_count, 4)
+        self.assertEqual(NGIConfig("dirty_conf", CONFIG_PATH,
+                                   True)["devVars"]["test_list"],
+                         [1, 2, {"three": "3"}])
+        os.remove(test_file)
+
+    def test_config_yaml_cache(self):
+        from tempfile import mkdtemp
+        from neon_utils.configuration_utils import NGIConfig, \
+            _get_yaml_cache_path
+        cache_dir = mkdtemp()
+        test_file = join(CONFIG_PATH, "cached_conf.yml")
+        shutil.copy(join(CONFIG_PATH, "ngi_local_conf.yml"), test_file)
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir}):
+            cache_file = _get_yaml_cache_path(test_file)
+            self.assertTrue(cache_file.startswith(cache_dir))
+            config = NGIConfig("cached_conf", CONFIG_PATH, True)
+            self.assertTrue(isfile(cache_file))
+
+            # Unchanged file is loaded from cache
+            with mock.patch("yaml.safe_load") as load:
+                cached = NGIConfig("cached_conf", CONFIG_PATH, True)
+                load.assert_not_called()
+            self.assertEqual(cached.content, config.content)
+            self.assertEqual(cached._loaded, config._loaded)
+
+            # Writes update the cache
+            config.update_yaml_file("devVars", "devName", "cached")
+            with mock.patch("yaml.safe_load") as load:
+                cached = NGIConfig("cached_conf", CONFIG_PATH, True)
+                load.assert_not_called()
+            self.assertEqual(cached["devVars"]["devName"], "cached")
+
+            # Modified file is parsed
+            sleep(0.01)
+            with open(test_file, "a") as f:
+                f.write("new_key: true\n")
+            updated = NGIConfig("cached_conf", CONFIG_PATH, True)
+            self.assertTrue(updated["new_key"])
+            self.assertEqual(updated["devVars"]["devName"], "cached")
+
+            # Invalid cache is ignored
+            with open(cache_file, "wb") as f:
+                f.write(b"invalid")
+            self.assertEqual(NGIConfig("cached_conf", CONFIG_PATH,
+                                       True).content, updated.content)
+        shutil.rmtree(cache_dir)
+        os.remove(test_file)
+
+    def test_config_yaml_cache_benchmark(self):
+        from tempfile import mkdtemp
+        from time import perf_counter
+        from neon_utils.configuration_utils import _read_yaml_cache, \
+            _write_yaml_cache
+        cache_dir = mkdtemp()
+        default_config_dir = join(dirname(ROOT_DIR), "neon_utils",
+                                  "default_configurations")
+        config_files = glob(join(default_config_dir, "*.yml"))
+        self.assertTrue(config_files)
+        iterations = 50
+
+        def _time(load_file):
+            start = perf_counter()
+            for _ in range(iterations):
+                for file in config_files:
+                    load_file(file)
+            return (perf_counter() - start) / iterations
+
+        def _load_yaml(file):
+            with open(file) as f:
+                return yaml.safe_load(f)
+
+        def _load_cached(file):
+            return _read_yaml_cache(file, os.stat(file))
+
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_dir}):
+            for file in config_files:
+                _write_yaml_cache(file, os.stat(file), _load_yaml(file))
+                self.assertEqual(_load_cached(file), _load_yaml(file))
+            yaml_time = _time(_load_yaml)
+            with mock.patch("yaml.safe_load", wraps=yaml.safe_load) as load:
+                cached_time = _time(_load_cached)
+        LOG.info(f"Default config load times: yaml={yaml_time}s|"
+                 f"cached={cached_time}s")
+        # Cached loads never parse YAML
+        load.assert_not_called()
+        shutil.rmtree(cache_dir)
+
+    def test_watched_config_read_benchmark(self):
+        from time import perf_counter
+        from neon_utils.configuration_utils import NGIConfig
+        iterations = 10000
+
+        def _lookups_per_second(config):
+            start = perf_counter()
+            for _ in range(iterations):
+                config["prefFlags"]
+            return iterations / (perf_counter() - start)
+
+        def _count_mtime_checks(config):
+            with mock.patch("neon_utils.configuration_utils.os.path.getmtime",
+                            wraps=os.path.getmtime) as getmtime:
+                for _ in range(100):
+                    config["prefFlags"]
+                return getmtime.call_count
+
+        mtime_config = NGIConfig("ngi_local_conf", CONFIG_PATH, True)
+        watched_config = NGIConfig("ngi_local_conf", CONFIG_PATH, True,
+                                   watch=True)
+        self.assertTrue(watched_config._watched)
+        watched_config.check_reload()
+        mtime_rate = _lookups_per_second(mtime_config)
+        watched_rate = _lookups_per_second(watched_config)
+        LOG.info(f"mtime lookups/sec={round(mtime_rate)}|"
+                 f"watched lookups/sec={round(watched_rate)}")
+
+        # Watched reads do not check the file on disk
+        self.assertEqual(_count_mtime_checks(mtime_config), 100)
+        self.assertEqual(_count_mtime_checks(watched_config), 0)
+        watched_config.stop_watching()
+        self.assertEqual(_count_mtime_checks(watched_config), 100)
+
 
 class ConfigurationUtilTests(unittest.TestCase):
     def doCleanups(self) -> None:
@@ -366,6 +654,56 @@ class ConfigurationUtilTests(unittest.TestCase):
         os.environ.pop("OVOS_CONFIG_BASE_FOLDER")
         self.assertIsNone(os.getenv("XDG_CONFIG_HOME"))
 
+    def test_tracked_dict(self):
+        import pickle
+        from neon_utils.configuration_utils import TrackedDict, TrackedList
+        tracked = TrackedDict(deepcopy(TEST_DICT))
+        self.assertEqual(tracked, TEST_DICT)
+        self.assertIsInstance(tracked["section 1"], TrackedDict)
+        self.assertFalse(tracked.dirty)
+        version = tracked.version
+
+        # Unchanged values
+        tracked["section 1"]["key1"] = "val1"
+        tracked["section 1"] = tracked["section 1"]
+        tracked.setdefault("section 2", {})
+        self.assertFalse(tracked.dirty)
+        self.assertEqual(tracked.version, version)
+
+        # Nested changes propagate
+        tracked["section 1"]["key1"] = "new"
+        self.assertEqual(tracked.dirty_keys, {"section 1"})
+        self.assertEqual(tracked["section 1"].dirty_keys, {"key1"})
+        self.assertGreater(tracked.version, version)
+        tracked.clear_dirty()
+        self.assertFalse(tracked.dirty)
+        self.assertFalse(tracked["section 1"].dirty)
+
+        tracked.update({"section 3": {"list": [{"a": 1}]}})
+        self.assertIsInstance(tracked["section 3"]["list"], TrackedList)
+        self.assertIsInstance(tracked["section 3"]["list"][0], TrackedDict)
+        tracked.clear_dirty()
+        tracked["section 3"]["list"][0]["a"] = 2
+        self.assertEqual(tracked.dirty_keys, {"section 3"})
+        tracked.clear_dirty()
+
+        # Removed values no longer notify
+        removed = tracked.pop("section 3")
+        self.assertEqual(tracked.dirty_keys, {"section 3"})
+        tracked.clear_dirty()
+        removed["list"].append(1)
+        self.assertFalse(tracked.dirty)
+
+        # Copies are untracked
+        copied = deepcopy(tracked)
+        self.assertNotIsInstance(copied, TrackedDict)
+        self.assertNotIsInstance(copied["section 1"], TrackedDict)
+        self.assertEqual(copied, tracked)
+        self.assertEqual(type(pickle.loads(pickle.dumps(tracked))), dict)
+        self.assertEqual(type(tracked.to_dict()["section 1"]), dict)
+        self.assertEqual(yaml.safe_load(yaml.safe_dump(tracked)), tracked)
+        self.assertEqual(json.loads(json.dumps(tracked)), tracked)
+
     def test_delete_recursive_dictionary_keys(self):
         from neon_utils.configuration_utils import \
             delete_recursive_dictionary_keys
@@ -545,6 +883,66 @@ class ConfigurationUtilTests(unittest.TestCase):
         except ImportError:
             pass
 
+    def test_get_mycroft_compat_config_single_load(self):
+        from ovos_config.config import Configuration
+        from neon_utils.configuration_utils import \
+            get_mycroft_compatible_config, _get_neon_local_config, \
+            _config_build_context, _ConfigBuildContext, _get_core_config
+        expected = get_mycroft_compatible_config(neon_config_path=CONFIG_PATH)
+        with mock.patch.object(Configuration, "__init__", autospec=True,
+                               side_effect=Configuration.__init__) as config:
+            with mock.patch("neon_utils.configuration_utils."
+                            "_populate_read_only_config") as populate:
+                mycroft_config = get_mycroft_compatible_config(
+                    neon_config_path=CONFIG_PATH)
+                self.assertEqual(mycroft_config, expected)
+                config.assert_called_once()
+                # Local config at `CONFIG_PATH` and default path, user config
+                self.assertEqual(populate.call_count, 3)
+
+        # Callers in a build get independent copies of the core config
+        with _ConfigBuildContext():
+            core_config = _get_core_config()
+            section = next(key for key, val in core_config.items()
+                           if isinstance(val, dict))
+            core_config[section]["modified"] = True
+            self.assertNotIn("modified", _get_core_config()[section])
+
+        # Context is not used outside of a build
+        self.assertIsNone(_config_build_context.get())
+        with mock.patch.object(Configuration, "__init__", autospec=True,
+                               side_effect=Configuration.__init__) as config:
+            _get_neon_local_config(CONFIG_PATH)
+            _get_neon_local_config(CONFIG_PATH)
+            get_mycroft_compatible_config(True)
+            get_mycroft_compatible_config(True)
+            self.assertEqual(config.call_count, 2)
+
+    def test_get_mycroft_compat_config_memoize(self):
+        from ovos_config.config import Configuration
+        from neon_utils.configuration_utils import \
+            get_mycroft_compatible_config
+        config = get_mycroft_compatible_config(neon_config_path=CONFIG_PATH,
+                                               memoize=True)
+        with mock.patch.object(Configuration, "__init__", autospec=True,
+                               side_effect=Configuration.__init__) as core_config:
+            memoized = get_mycroft_compatible_config(
+                neon_config_path=CONFIG_PATH, memoize=True)
+            core_config.assert_not_called()
+            self.assertEqual(memoized, config)
+            memoized["lang"] = "modified"
+            self.assertEqual(get_mycroft_compatible_config(
+                neon_config_path=CONFIG_PATH, memoize=True), config)
+            core_config.assert_not_called()
+
+            # Modified source config is rebuilt
+            local_conf = join(CONFIG_PATH, "ngi_local_conf.yml")
+            os.utime(local_conf, (getmtime(local_conf) + 1,
+                                  getmtime(local_conf) + 1))
+            self.assertEqual(get_mycroft_compatible_config(
+                neon_config_path=CONFIG_PATH, memoize=True), config)
+            core_config.assert_called_once()
+
     def test_make_loaded_config_safe(self):
         from ruamel.yaml import YAML
         from neon_utils.configuration_utils import _make_loaded_config_safe
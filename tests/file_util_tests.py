@@ -58,6 +58,115 @@ class FileUtilTests(unittest.TestCase):
         self.assertEqual(original_text, duplicate_text)
         os.remove(output_file)
 
+    def test_base64_streaming(self):
+        import base64
+        from shutil import rmtree
+        from tempfile import mkdtemp
+        test_dir = mkdtemp()
+        try:
+            for size in (0, 1, 2, 3, 1000, 3 * 65536 + 1, 1024 * 1024 + 2):
+                data = os.urandom(size)
+                input_file = os.path.join(test_dir, f"{size}.bin")
+                with open(input_file, "wb") as f:
+                    f.write(data)
+                expected = base64.b64encode(data).decode()
+                self.assertEqual(encode_file_to_base64_string(input_file),
+                                 expected)
+                chunks = list(iter_file_base64_chunks(input_file, 1000))
+                self.assertTrue(all(len(c) == 1332 for c in chunks[:-1]))
+                self.assertEqual("".join(chunks), expected)
+
+                # Decode from a string, unaligned pieces, and wrapped lines
+                pieces = [expected[i:i + 7] for i in
+                          range(0, len(expected), 7)]
+                wrapped = "\n".join(expected[i:i + 76] for i in
+                                     range(0, len(expected), 76))
+                for i, encoded in enumerate((expected, pieces, iter(pieces),
+                                             wrapped, expected.encode())):
+                    output = os.path.join(test_dir, "out", f"{size}_{i}")
+                    self.assertEqual(decode_base64_stream_to_file(
+                        encoded, output, chunk_size=1001), output)
+                    with open(output, "rb") as f:
+                        self.assertEqual(f.read(), data)
+                output = os.path.join(test_dir, "out", f"{size}_string")
+                decode_base64_string_to_file(expected, output)
+                with open(output, "rb") as f:
+                    self.assertEqual(f.read(), data)
+                with self.assertRaises(FileExistsError):
+                    decode_base64_stream_to_file(expected, output)
+            with self.assertRaises(FileNotFoundError):
+                iter_file_base64_chunks(os.path.join(test_dir, "invalid"))
+        finally:
+            rmtree(test_dir)
+
+    def test_base64_streaming_memory_benchmark(self):
+        import base64
+        import tracemalloc
+        from shutil import rmtree
+        from tempfile import mkdtemp
+        from neon_utils.logger import LOG
+        from neon_utils.process_utils import snapshot_malloc
+
+        def _legacy_encode(path):
+            with open(path, "rb") as file_in:
+                return base64.b64encode(file_in.read()).decode("utf-8")
+
+        def _legacy_decode(encoded_string, output_path):
+            with open(output_path, "wb+") as file_out:
+                file_out.write(base64.b64decode(
+                    encoded_string.encode("utf-8")))
+
+        def _profile(func, *args):
+            tracemalloc.start()
+            try:
+                before = snapshot_malloc()
+                tracemalloc.reset_peak()
+                result = func(*args)
+                peak = tracemalloc.get_traced_memory()[1]
+                after = snapshot_malloc()
+                retained = sum(stat.size_diff for stat in
+                               after.compare_to(before, "filename"))
+            finally:
+                tracemalloc.stop()
+            return peak, retained, result
+
+        test_dir = mkdtemp()
+        try:
+            size = 8 * 1024 * 1024
+            input_file = os.path.join(test_dir, "audio.bin")
+            with open(input_file, "wb") as f:
+                f.write(os.urandom(size))
+
+            legacy_encode, _, encoded = _profile(_legacy_encode, input_file)
+            new_encode, retained, new_encoded = _profile(
+                encode_file_to_base64_string, input_file)
+            self.assertEqual(new_encoded, encoded)
+            del new_encoded
+            stream_encode, _, _ = _profile(
+                lambda: sum(len(c) for c in
+                            iter_file_base64_chunks(input_file)))
+            legacy_decode, _, _ = _profile(
+                _legacy_decode, encoded, os.path.join(test_dir, "legacy"))
+            stream_decode, _, _ = _profile(
+                decode_base64_stream_to_file, encoded,
+                os.path.join(test_dir, "stream"))
+            LOG.info(f"{size} byte file peak memory: "
+                     f"legacy_encode={legacy_encode}|"
+                     f"new_encode={new_encode}|stream_encode={stream_encode}|"
+                     f"legacy_decode={legacy_decode}|"
+                     f"stream_decode={stream_decode}")
+
+            encoded_size = len(encoded)
+            # Result string plus a working buffer, not the whole file
+            self.assertLess(new_encode, 2.2 * encoded_size)
+            self.assertGreaterEqual(retained, encoded_size)
+            # Bounded by chunk size, not file size
+            self.assertLess(stream_encode, size / 8)
+            self.assertLess(stream_decode, size / 8)
+            self.assertGreater(legacy_decode, size)
+        finally:
+            rmtree(test_dir)
+
     def test_get_most_recent_file_in_dir(self):
         newest = get_most_recent_file_in_dir(ROOT_DIR)
         self.assertIsInstance(newest, str)
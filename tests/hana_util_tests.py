@@ -31,14 +31,48 @@ import unittest
 
 from os import remove
 from os.path import join, dirname, isfile
+from http.server import BaseHTTPRequestHandler, HTTPServer, \
+    ThreadingHTTPServer
 from shutil import copy
+from threading import Thread
 from time import time, sleep
+from typing import Callable, Tuple
 from unittest.mock import patch
 
 valid_config = {}
 valid_headers = {}
 
 
+def _start_server(respond: Callable, threaded: bool = False) -> \
+        Tuple[HTTPServer, str]:
+    """
+    Start a local stand-in backend server. POST requests are answered with
+    `respond(handler, body)`, which returns a status code and response dict.
+    :param respond: callback to respond to requests with
+    :param threaded: if True, handle requests concurrently
+    :returns: running server and its URL
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(
+                self.rfile.read(int(self.headers["Content-Length"])))
+            status, data = respond(self, body)
+            resp = json.dumps(data).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(resp)))
+            self.end_headers()
+            self.wfile.write(resp)
+
+        def log_message(self, *args):
+            pass
+
+    server_class = ThreadingHTTPServer if threaded else HTTPServer
+    server = server_class(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
 class HanaUtilTests(unittest.TestCase):
     test_server = "https://hana.neonaibeta.com"
     test_path = join(dirname(__file__), "hana_test.json")
@@ -46,25 +80,25 @@ class HanaUtilTests(unittest.TestCase):
     def tearDown(self) -> None:
         global valid_config
         global valid_headers
-        import neon_utils.hana_utils
+        from neon_utils.hana_utils import get_client
         if isfile(self.test_path):
             remove(self.test_path)
-        if neon_utils.hana_utils._client_config:
-            valid_config = neon_utils.hana_utils._client_config
-        if neon_utils.hana_utils._headers:
-            valid_headers = neon_utils.hana_utils._headers
-        neon_utils.hana_utils._client_config = {}
-        neon_utils.hana_utils._headers = {}
+        client = get_client(self.test_server)
+        if client.client_config:
+            valid_config = client.client_config
+        if client.headers:
+            valid_headers = client.headers
+        client.reset()
 
     @patch("neon_utils.hana_utils._get_client_config_path")
     def test_request_backend(self, config_path):
         config_path.return_value = self.test_path
 
         # Use a valid config and skip extra auth
-        import neon_utils.hana_utils
-        neon_utils.hana_utils._client_config = valid_config
-        neon_utils.hana_utils._headers = valid_headers
-        from neon_utils.hana_utils import request_backend
+        from neon_utils.hana_utils import request_backend, get_client
+        client = get_client(self.test_server)
+        client.client_config = valid_config
+        client.headers = valid_headers
         resp = request_backend("/neon/get_response",
                                {"lang_code": "en-us",
                                 "utterance": "who are you",
@@ -77,8 +111,7 @@ class HanaUtilTests(unittest.TestCase):
         copy(old_token_path, self.test_path)
         with open(self.test_path, 'r') as f:
             old_contents = f.read()
-        neon_utils.hana_utils._client_config = {}
-        neon_utils.hana_utils._headers = {}
+        client.reset()
 
         # Request generates an updated token
         resp = request_backend("/neon/get_response",
@@ -98,52 +131,52 @@ class HanaUtilTests(unittest.TestCase):
         # TODO: Test invalid route, invalid request data
 
     @patch("neon_utils.hana_utils._get_client_config_path")
-    @patch("neon_utils.hana_utils._refresh_token")
+    @patch("neon_utils.hana_utils.HanaClient.refresh_token")
     def test_request_backend_refresh_token(self, refresh_token, config_path):
         config_path.return_value = self.test_path
 
         import neon_utils.hana_utils
-        from neon_utils.hana_utils import request_backend
+        from neon_utils.hana_utils import request_backend, get_client
         neon_utils.hana_utils.set_default_backend_url(self.test_server)
         neon_utils.hana_utils._init_client(self.test_server)
-        real_client_config = neon_utils.hana_utils._client_config
-        neon_utils.hana_utils._client_config['expiration'] = time() + 29
-        neon_utils.hana_utils._refresh_token = refresh_token
+        client = get_client(self.test_server)
+        real_client_config = dict(client.client_config)
+        client.client_config['expiration'] = time() + 29
         resp = request_backend("/neon/get_response",
                                {"lang_code": "en-us",
                                 "utterance": "how are you",
                                 "user_profile": {}}, self.test_server)
         self.assertEqual(resp['lang_code'], "en-us")
         self.assertIsInstance(resp['answer'], str)
-        refresh_token.assert_called_once_with(self.test_server,
-                                              ssl_verify=True)
+        refresh_token.assert_called_once_with()
 
-        neon_utils.hana_utils._client_config = real_client_config
+        client.client_config = real_client_config
 
     @patch("neon_utils.hana_utils._get_client_config_path")
     def test_00_get_token(self, config_path):
         config_path.return_value = self.test_path
-        from neon_utils.hana_utils import _get_token
+        from neon_utils.hana_utils import _get_token, get_client
 
         # Test valid request
         _get_token(self.test_server)
-        from neon_utils.hana_utils import _client_config
         self.assertTrue(isfile(self.test_path))
         with open(self.test_path) as f:
             credentials_on_disk = json.load(f)
-        self.assertEqual(credentials_on_disk, _client_config)
+        self.assertEqual(credentials_on_disk,
+                         get_client(self.test_server).client_config)
         # TODO: Test invalid request, rate-limited request
 
     @patch("neon_utils.hana_utils._get_client_config_path")
-    @patch("neon_utils.hana_utils._get_token")
+    @patch("neon_utils.hana_utils.HanaClient.get_token")
     def test_refresh_token(self, get_token, config_path):
         config_path.return_value = self.test_path
-        import neon_utils.hana_utils
+        from neon_utils.hana_utils import get_client
+        client = get_client(self.test_server)
 
         def _write_token(*_, **__):
             with open(self.test_path, 'w+') as c:
                 json.dump(valid_config, c)
-            neon_utils.hana_utils._client_config = valid_config
+            client.client_config = valid_config
 
         from neon_utils.hana_utils import _refresh_token
         get_token.side_effect = _write_token
@@ -153,11 +186,10 @@ class HanaUtilTests(unittest.TestCase):
         # Test valid request (auth + refresh)
         _refresh_token(self.test_server)
         get_token.assert_called_once()
-        from neon_utils.hana_utils import _client_config
         self.assertTrue(isfile(self.test_path))
         with open(self.test_path) as f:
             credentials_on_disk = json.load(f)
-        self.assertEqual(credentials_on_disk, _client_config)
+        self.assertEqual(credentials_on_disk, client.client_config)
 
         # Test refresh of existing token (no auth)
         sleep(1)  # sleep to ensure new credentials expire later than existing
@@ -189,7 +221,7 @@ class HanaUtilTests(unittest.TestCase):
     @patch("ovos_config.config.Configuration")
     def test_set_default_backend_url(self, config):
         import neon_utils.hana_utils
-        from neon_utils.hana_utils import set_default_backend_url
+        from neon_utils.hana_utils import set_default_backend_url, get_client
         neon_utils.hana_utils._DEFAULT_BACKEND_URL = None
         config.return_value = dict()
 
@@ -200,14 +232,287 @@ class HanaUtilTests(unittest.TestCase):
         set_default_backend_url("https://hana.neonaialpha.com")
         self.assertEqual(neon_utils.hana_utils._DEFAULT_BACKEND_URL,
                          "https://hana.neonaialpha.com")
+        self.assertEqual(get_client().server_url,
+                         "https://hana.neonaialpha.com")
 
         set_default_backend_url()
         self.assertEqual(neon_utils.hana_utils._DEFAULT_BACKEND_URL,
                          "https://hana.neonaiservices.com")
 
+    def test_get_client(self):
+        from neon_utils.hana_utils import get_client, HanaClient
+        client = get_client(self.test_server)
+        self.assertIsInstance(client, HanaClient)
+        self.assertIs(get_client(f"{self.test_server}/"), client)
+        self.assertIsNot(get_client(self.test_server, ssl_verify=False),
+                         client)
+        adapter = client.session.get_adapter(self.test_server)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertIn(502, adapter.max_retries.status_forcelist)
+
+        # Backoff is jittered
+        from urllib3.util.retry import RequestHistory
+        retry = adapter.max_retries.new(
+            history=(RequestHistory("POST", "/", None, 502, None),) * 3)
+        backoff = [retry.get_backoff_time() for _ in range(10)]
+        self.assertTrue(all(1 <= b <= 2 for b in backoff))
+        self.assertGreater(len(set(backoff)), 1)
+
+        client = HanaClient(self.test_server, pool_size=2, timeout=5,
+                            retries=0)
+        adapter = client.session.get_adapter(self.test_server)
+        self.assertEqual(adapter._pool_maxsize, 2)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertEqual(client.timeout, 5)
+        client.close()
+
     @patch("neon_utils.hana_utils._get_client_config_path")
-    @patch("neon_utils.hana_utils._refresh_token")
-    @patch("neon_utils.hana_utils.requests.post")
+    def test_request_backend_retry(self, config_path):
+        from neon_utils.hana_utils import HanaClient, ServerException
+        config_path.return_value = self.test_path
+        requests = list()
+
+        def _respond(handler, body):
+            requests.append((handler.path, handler.headers.get("Connection"),
+                             body))
+            status = 502 if len(requests) == 2 else 200
+            return status, {"access_token": "token",
+                            "expiration": time() + 3600,
+                            "path": handler.path}
+
+        server, server_url = _start_server(_respond)
+        client = HanaClient(server_url, backoff_factor=0.01)
+        # Auth request, then a 502 response that is retried
+        self.assertEqual(client.request("test", {"data": 1})["path"],
+                         "/test")
+        self.assertEqual([r[0] for r in requests],
+                         ["/auth/login", "/test", "/test"])
+        self.assertEqual(requests[-1][2], {"data": 1})
+        self.assertEqual(client.request("/test", {})["path"], "/test")
+        self.assertEqual(len(requests), 4)
+        server.shutdown()
+        server.server_close()
+        client.close()
+
+        with self.assertRaises(ServerException):
+            client.request("test", {})
+
+    @patch("neon_utils.hana_utils._get_client_config_path")
+    def test_background_token_refresh(self, config_path):
+        from os import listdir
+        from neon_utils.hana_utils import HanaClient
+        config_path.return_value = self.test_path
+        requests = list()
+
+        def _respond(handler, _):
+            requests.append((handler.path,
+                             handler.headers.get("Authorization")))
+            if handler.path == "/auth/login":
+                return 200, {"access_token": "login", "refresh_token": "r",
+                             "expiration": time() + 31.5}
+            if handler.path == "/auth/refresh":
+                sleep(0.1)
+                return 200, {"access_token": "refreshed",
+                             "refresh_token": "r",
+                             "expiration": time() + 3600}
+            return 200, {"path": handler.path}
+
+        server, server_url = _start_server(_respond, threaded=True)
+        client = HanaClient(server_url, refresh_margin=31)
+        client.request("test", {})
+        self.assertEqual(requests, [("/auth/login", None),
+                                    ("/test", "Bearer login")])
+        self.assertTrue(client._refresh_timer.is_alive())
+
+        # Token is refreshed in the background before it expires
+        sleep(1)
+        self.assertEqual(requests[-1][0], "/auth/refresh")
+        self.assertEqual(client.headers, {"Authorization": "Bearer refreshed"})
+        with open(self.test_path) as f:
+            self.assertEqual(json.load(f)["access_token"], "refreshed")
+        self.assertFalse([f for f in listdir(dirname(self.test_path))
+                          if f.startswith(".hana_token_")])
+        client.request("test", {})
+        self.assertEqual(requests[-1], ("/test", "Bearer refreshed"))
+        self.assertEqual(len(requests), 4)
+
+        # Concurrent requests with an expiring token refresh only once
+        client.client_config["expiration"] = time() + 10
+        threads = [Thread(target=client.request, args=("test", {}))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([r[0] for r in requests[4:]].count("/auth/refresh"),
+                         1)
+        self.assertEqual(len(requests), 9)
+
+        client.close()
+        self.assertIsNone(client._refresh_timer)
+        server.shutdown()
+        server.server_close()
+
+    def test_response_cache(self):
+        from tempfile import mkdtemp
+        from shutil import rmtree
+        from neon_utils.hana_utils import ResponseCache
+        calls = list()
+
+        def _request(endpoint, data):
+            calls.append((endpoint, data))
+            return {"endpoint": endpoint, "address": {"city": "Seattle"}}
+
+        cache = ResponseCache({"proxy/geolocation/": 60,
+                               "proxy/geolocation/reverse": 0.2})
+        self.assertEqual(cache.get_ttl("/proxy/geolocation/geocode"), 60)
+        self.assertEqual(cache.get_ttl("proxy/geolocation/reverse"), 0.2)
+        self.assertIsNone(cache.get_ttl("neon/get_response"))
+        self.assertEqual(cache.get_key("/proxy/test", {"b": 1.00000001,
+                                                       "a": " Seattle"}),
+                         cache.get_key("proxy/test/", {"a": "Seattle",
+                                                       "b": 1.0}))
+
+        # Equivalent requests are served from cache
+        geocode = "proxy/geolocation/geocode"
+        resp = cache.call(geocode, {"address": "Seattle"}, _request)
+        resp["address"]["city"] = "modified"
+        resp = cache.call(f"/{geocode}", {"address": "Seattle "}, _request)
+        self.assertEqual(resp["address"]["city"], "Seattle")
+        self.assertEqual(len(calls), 1)
+        cache.call(geocode, {"address": "Portland"}, _request)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.metrics, {geocode: {"hits": 1, "misses": 2}})
+
+        # Per-endpoint TTL
+        reverse = "proxy/geolocation/reverse"
+        cache.call(reverse, {"lat": 47.6, "lon": -122.3}, _request)
+        cache.call(reverse, {"lat": 47.6, "lon": -122.3}, _request)
+        self.assertEqual(len(calls), 3)
+        sleep(0.3)
+        cache.call(reverse, {"lat": 47.6, "lon": -122.3}, _request)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(cache.metrics[reverse], {"hits": 1, "misses": 2})
+
+        # Uncached endpoint
+        cache.call("neon/get_response", {}, _request)
+        cache.call("neon/get_response", {}, _request)
+        self.assertEqual(len(calls), 6)
+        self.assertNotIn("neon/get_response", cache.metrics)
+
+        # Disk tier persists responses to a new cache
+        cache_dir = mkdtemp()
+        try:
+            db_path = join(cache_dir, "responses.sqlite")
+            cache.attach_disk(db_path)
+            cache.call(geocode, {"address": "Boston"}, _request)
+            self.assertEqual(len(calls), 7)
+            new_cache = ResponseCache(db_path=db_path)
+            resp = new_cache.call(geocode, {"address": "Boston"}, _request)
+            self.assertEqual(resp["endpoint"], geocode)
+            new_cache.call(geocode, {"address": "Seattle"}, _request)
+            self.assertEqual(len(calls), 7)
+            new_cache.clear()
+            new_cache.call(geocode, {"address": "Seattle"}, _request)
+            self.assertEqual(len(calls), 8)
+        finally:
+            rmtree(cache_dir)
+
+    @patch("neon_utils.hana_utils._get_client_config_path")
+    def test_client_response_cache(self, config_path):
+        from neon_utils.hana_utils import get_client, request_backend
+        config_path.return_value = self.test_path
+        paths = list()
+
+        def _respond(handler, _):
+            paths.append(handler.path)
+            return 200, {"access_token": "token",
+                         "expiration": time() + 3600, "path": handler.path}
+
+        server, server_url = _start_server(_respond)
+        for _ in range(3):
+            request_backend("proxy/geolocation/reverse",
+                            {"lat": 47.6, "lon": -122.3}, server_url)
+            request_backend("neon/get_response", {}, server_url)
+        request_backend("proxy/geolocation/reverse",
+                        {"lat": 47.6, "lon": -122.3}, server_url,
+                        use_cache=False)
+        self.assertEqual(paths, ["/auth/login",
+                                 "/proxy/geolocation/reverse",
+                                 "/neon/get_response", "/neon/get_response",
+                                 "/neon/get_response",
+                                 "/proxy/geolocation/reverse"])
+        self.assertEqual(get_client(server_url).response_cache.metrics,
+                         {"proxy/geolocation/reverse": {"hits": 2,
+                                                        "misses": 1}})
+        server.shutdown()
+        server.server_close()
+
+    @patch("neon_utils.hana_utils._get_client_config_path")
+    def test_async_client(self, config_path):
+        import asyncio
+        from threading import Lock
+        from neon_utils.hana_utils import get_async_client, \
+            request_backend_async, request_many, ServerException
+        config_path.return_value = self.test_path
+        lock = Lock()
+        in_flight = 0
+        max_in_flight = 0
+        paths = list()
+
+        def _respond(handler, body):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                paths.append(handler.path)
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            sleep(0.1)
+            with lock:
+                in_flight -= 1
+            status = 404 if handler.path == "/invalid" else 200
+            return status, {"access_token": "token",
+                            "expiration": time() + 3600,
+                            "path": handler.path, "body": body}
+
+        server, server_url = _start_server(_respond, threaded=True)
+        client = get_async_client(server_url)
+        self.assertIs(get_async_client(server_url), client)
+
+        async def _test():
+            resp = await request_backend_async("proxy/test", {"test": True},
+                                               server_url)
+            self.assertEqual(resp["body"], {"test": True})
+            self.assertEqual(paths, ["/auth/login", "/proxy/test"])
+
+            resps = await request_many(
+                [(f"proxy/{i}", {"i": i}) for i in range(8)], server_url,
+                max_concurrency=4)
+            self.assertEqual([r["body"]["i"] for r in resps], list(range(8)))
+            # Requests run concurrently, up to `max_concurrency` at a time
+            self.assertEqual(max_in_flight, 4)
+
+            resps = await client.request_many(
+                [("proxy/valid", {}), ("invalid", {})],
+                return_exceptions=True)
+            self.assertEqual(resps[0]["path"], "/proxy/valid")
+            self.assertIsInstance(resps[1], ServerException)
+            with self.assertRaises(ServerException):
+                await client.request_many([("invalid", {})])
+
+        asyncio.run(_test())
+        # Tokens are shared with the sync client and cached after one login
+        from neon_utils.hana_utils import get_client, request_backend
+        self.assertIs(client.client, get_client(server_url))
+        self.assertEqual(request_backend("proxy/sync", {}, server_url)["path"],
+                         "/proxy/sync")
+        self.assertEqual(paths.count("/auth/login"), 1)
+        server.shutdown()
+        server.server_close()
+
+    @patch("neon_utils.hana_utils._get_client_config_path")
+    @patch("neon_utils.hana_utils.HanaClient.refresh_token")
+    @patch("neon_utils.hana_utils.requests.Session.post")
     def test_request_backend_ssl_verify(self, mock_post, mock_refresh, config_path):
         config_path.return_value = self.test_path
 
@@ -218,14 +523,15 @@ class HanaUtilTests(unittest.TestCase):
         mock_post.return_value = mock_response
 
         # Use valid config to skip auth and set expiration far in future
-        import neon_utils.hana_utils
+        from neon_utils.hana_utils import request_backend, get_client
         test_config = valid_config.copy() if valid_config else {
             "access_token": "test_token",
             "expiration": time() + 3600
         }
-        neon_utils.hana_utils._client_config = test_config
-        neon_utils.hana_utils._headers = valid_headers
-        from neon_utils.hana_utils import request_backend
+        for ssl_verify in (True, False):
+            client = get_client(self.test_server, ssl_verify)
+            client.client_config = test_config
+            client.headers = valid_headers
 
         # Test default SSL verification (should be True)
         request_backend("/neon/get_response",
@@ -234,6 +540,7 @@ class HanaUtilTests(unittest.TestCase):
         mock_post.assert_called()
         call_kwargs = mock_post.call_args[1]
         self.assertTrue(call_kwargs.get('verify'))
+        self.assertIsNotNone(call_kwargs.get('timeout'))
 
         # Test explicit SSL verification True
         mock_post.reset_mock()
@@ -250,6 +557,7 @@ class HanaUtilTests(unittest.TestCase):
                        self.test_server, ssl_verify=False)
         call_kwargs = mock_post.call_args[1]
         self.assertFalse(call_kwargs.get('verify'))
+        get_client(self.test_server, False).reset()
 
 
 if __name__ == '__main__':
@@ -94,6 +94,148 @@ class LocationUtilTests(unittest.TestCase):
         self.assertEqual(timezone, "Asia/Shanghai")
         self.assertEqual(offset, 8.0)
 
+    def test_get_timezones(self):
+        from neon_utils.location_utils import get_timezones, get_timezone, \
+            init_timezone_finder, _get_timezone_finder
+        coords = [(47.6038321, -122.3300624), (35.0, 103.0),
+                  (47.60383, -122.33006), (35.0, 103.0), (40.7128, -74.006)]
+        timezones = get_timezones(coords)
+        self.assertEqual([tz[0] for tz in timezones],
+                         ["America/Los_Angeles", "Asia/Shanghai",
+                          "America/Los_Angeles", "Asia/Shanghai",
+                          "America/New_York"])
+        self.assertEqual(timezones[1][1], 8.0)
+        self.assertEqual(timezones, [get_timezone(*c) for c in coords])
+        self.assertEqual(get_timezones([]), [])
+
+        finder = _get_timezone_finder()
+        self.assertIs(_get_timezone_finder(), finder)
+        in_memory = init_timezone_finder(in_memory=True)
+        self.assertIsNot(in_memory, finder)
+        self.assertTrue(in_memory.in_memory)
+        self.assertIs(_get_timezone_finder(), in_memory)
+        self.assertEqual(get_timezones(coords), timezones)
+        init_timezone_finder()
+
+    def test_get_timezone_benchmark(self):
+        import pytz
+        from random import uniform
+        from timeit import timeit
+        from timezonefinder import TimezoneFinder
+        from neon_utils.logger import LOG
+        from unittest.mock import patch
+        from neon_utils.location_utils import get_timezones, get_timezone, \
+            init_timezone_finder, _get_timezone_finder
+
+        def _legacy_get_timezone(lat, lng):
+            timezone = TimezoneFinder().timezone_at(lng=float(lng),
+                                                    lat=float(lat))
+            offset = pytz.timezone(timezone).utcoffset(
+                datetime.now()).total_seconds() / 3600
+            return timezone, offset
+
+        # Repeated lookups around a few cities
+        coords = [(lat + uniform(-0.00001, 0.00001),
+                   lng + uniform(-0.00001, 0.00001))
+                  for lat, lng in ((47.6, -122.3), (35.0, 103.0),
+                                   (40.7, -74.0), (51.5, -0.1))
+                  for _ in range(50)]
+        legacy = timeit(lambda: [_legacy_get_timezone(*c) for c in coords],
+                        number=1)
+        init_timezone_finder()
+        with patch("neon_utils.location_utils.TimezoneFinder") as new_finder:
+            with patch("neon_utils.location_utils._get_timezone_finder",
+                       wraps=_get_timezone_finder) as get_finder:
+                single = timeit(lambda: [get_timezone(*c) for c in coords],
+                                number=1)
+                batch = timeit(lambda: get_timezones(coords), number=1)
+        LOG.info(f"{len(coords)} lookups: legacy={legacy}s|single={single}s|"
+                 f"batch={batch}s")
+        # One shared finder, queried once per nearby location
+        new_finder.assert_not_called()
+        self.assertEqual(get_finder.call_count, 4)
+        self.assertEqual(get_timezones(coords),
+                         [_legacy_get_timezone(*c) for c in coords])
+
+    def test_gazetteer(self):
+        from os.path import join
+        from shutil import rmtree
+        from tempfile import mkdtemp
+        from unittest.mock import patch
+        from neon_utils.location_utils import Gazetteer, set_gazetteer, \
+            get_coordinates, get_location
+
+        test_dir = mkdtemp()
+        source = join(test_dir, "cities.csv")
+        with open(source, "w") as f:
+            f.write("name,lat,lon,county,state,country,timezone,population\n"
+                    "Seattle,47.6062,-122.3321,King County,Washington,"
+                    "United States,America/Los_Angeles,737015\n"
+                    "Kirkland,47.6769,-122.206,King County,Washington,"
+                    "United States,America/Los_Angeles,92175\n"
+                    "Portland,45.5152,-122.6784,Multnomah County,Oregon,"
+                    "United States,America/Los_Angeles,652503\n"
+                    "Portland,43.6591,-70.2568,Cumberland County,Maine,"
+                    "United States,America/New_York,68408\n"
+                    "Suva,-18.1416,178.4419,,Central,Fiji,Pacific/Fiji,"
+                    "93970\n"
+                    "Taveuni,-16.8,-179.98,,Northern,Fiji,Pacific/Fiji,"
+                    "9000\n")
+        index = join(test_dir, "index", "gazetteer.sqlite")
+        try:
+            self.assertEqual(Gazetteer.build(source, index), 6)
+            gazetteer = Gazetteer(index)
+
+            # Prefix lookup is case-insensitive and ordered by population
+            self.assertEqual([p["state"] for p in gazetteer.search("port")],
+                             ["Oregon", "Maine"])
+            self.assertEqual(gazetteer.search("k")[0]["name"], "Kirkland")
+            self.assertEqual(gazetteer.search("kirklandia"), [])
+            self.assertEqual(gazetteer.search(""), [])
+
+            # Name lookup
+            self.assertEqual(gazetteer.geocode("portland")["state"], "Oregon")
+            self.assertEqual(gazetteer.geocode("Portland", "maine")["lat"],
+                             43.6591)
+            self.assertIsNone(gazetteer.geocode("Portland", "Washington"))
+            self.assertIsNone(gazetteer.geocode("Portland", None, "Fiji"))
+
+            # Nearest neighbor lookup across grid cells and the antimeridian
+            self.assertEqual(gazetteer.reverse(47.61, -122.33)["name"],
+                             "Seattle")
+            self.assertEqual(gazetteer.reverse(47.68, -122.2)["name"],
+                             "Kirkland")
+            self.assertEqual(gazetteer.reverse(45.49, -122.5)["name"],
+                             "Portland")
+            self.assertEqual(gazetteer.reverse(-16.8, 179.9)["name"],
+                             "Taveuni")
+            self.assertIsNone(gazetteer.reverse(0, 0))
+            self.assertIsNone(gazetteer.reverse(46.5, -122.5))
+            self.assertEqual(gazetteer.reverse(46.5, -122.5, 200)["name"],
+                             "Portland")
+            gazetteer.close()
+
+            # Offline lookups are used before the backend
+            set_gazetteer(index)
+            with patch("neon_utils.location_utils.request_backend") as req:
+                req.return_value = {"lat": "1.0", "lon": "2.0",
+                                    "address": {"city": "Remote"}}
+                self.assertEqual(get_coordinates({"city": "Kirkland",
+                                                  "state": "Washington"}),
+                                 (47.6769, -122.206))
+                self.assertEqual(get_location(47.6, -122.33),
+                                 ("Seattle", "King County", "Washington",
+                                  "United States"))
+                req.assert_not_called()
+                self.assertEqual(get_coordinates({"city": "Tacoma"}),
+                                 (1.0, 2.0))
+                self.assertEqual(get_location(0, 0)[0], "Remote")
+                self.assertEqual(req.call_count, 2)
+            self.assertIsNone(set_gazetteer(None))
+        finally:
+            set_gazetteer(None)
+            rmtree(test_dir)
+
     def test_to_system_time(self):
         from neon_utils.location_utils import to_system_time
         tz_aware_dt = datetime.now(gettz("America/NewYork"))
@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import inspect
 import sys
 import os
 import unittest
@@ -145,6 +146,76 @@ class MessageUtilTests(unittest.TestCase):
         message = Message("test message", {"test": "data"}, {"time": time()})
         self.assertIsNone(dig_for_message())
 
+    def test_dig_for_message_max_records(self):
+        message = Message("test message", {"test": "data"}, {"time": time()})
+
+        def nested(depth, msg=None):
+            if depth:
+                return nested(depth - 1)
+            return dig_for_message(5)
+        self.assertEqual(nested(3, message), message)
+        self.assertIsNone(nested(5, message))
+
+    def test_current_message(self):
+        message = Message("current message")
+        other = Message("other message")
+        self.assertIsNone(get_current_message())
+        token = set_current_message(message)
+        self.assertEqual(get_current_message(), message)
+        self.assertEqual(get_message_no_name(None), message)
+        self.assertEqual(get_message_standard(other), message)
+        reset_current_message(token)
+        self.assertIsNone(get_current_message())
+        self.assertEqual(get_message_standard(other), other)
+
+    def test_dig_for_message_benchmark(self):
+        import inspect
+        from timeit import timeit
+        from mock import patch
+        from neon_utils.logger import LOG
+
+        def _legacy_dig_for_message(max_records=10):
+            stack = inspect.stack()[1:]
+            stack = stack if len(stack) <= max_records \
+                else stack[:max_records]
+            for record in stack:
+                args = inspect.getargvalues(record.frame)
+                if args.args:
+                    for arg in args.args:
+                        if isinstance(args.locals[arg], Message):
+                            return args.locals[arg]
+            return None
+
+        @resolve_message
+        def speak(utterance, message=None):
+            return message
+
+        def handler(message, depth=10):
+            if depth:
+                return handler(None, depth - 1)
+            return speak("test")
+
+        message = Message("test")
+        with patch("inspect.stack", wraps=inspect.stack) as stack, \
+                patch("inspect.getargvalues",
+                      wraps=inspect.getargvalues) as getargvalues:
+            self.assertEqual(handler(message), message)
+            frame_walk = timeit(lambda: handler(message), number=200)
+        # Frames are read directly, never materialized with inspect
+        stack.assert_not_called()
+        getargvalues.assert_not_called()
+        with patch("neon_utils.message_utils.dig_for_message",
+                   _legacy_dig_for_message):
+            self.assertEqual(handler(message), message)
+            legacy = timeit(lambda: handler(message), number=200)
+        token = set_current_message(message)
+        current = timeit(lambda: handler(message), number=200)
+        reset_current_message(token)
+        LOG.info(f"speak() message resolution in ms: "
+                 f"inspect.stack={round(legacy * 5, 3)}|"
+                 f"frame walk={round(frame_walk * 5, 3)}|"
+                 f"current message={round(current * 5, 3)}")
+
     def test_resolve_message(self):
         def wrapper_method(message, function: callable,
                            fn_args: list = None, fn_kwargs: dict = None):
@@ -195,6 +266,81 @@ class MessageUtilTests(unittest.TestCase):
 
         wrapper_method(test_message, nested_get_message)
 
+    def test_resolve_message_signature(self):
+        @resolve_message
+        def decorated(test, message=None):
+            """test docstring"""
+            return message
+
+        @resolve_message
+        def varargs(*args, message=None):
+            return args, message
+
+        def no_message(test):
+            return test
+
+        self.assertEqual(decorated.__name__, "decorated")
+        self.assertEqual(decorated.__doc__, "test docstring")
+        self.assertEqual(list(inspect.signature(decorated).parameters),
+                         ["test", "message"])
+        self.assertIs(resolve_message(no_message), no_message)
+
+        message = Message("test")
+        self.assertEqual(varargs("test", None, message=message),
+                         (("test", None), message))
+        self.assertEqual(varargs("test", message), (("test", message), None))
+
+    def test_resolve_message_benchmark(self):
+        from mock import patch
+        from timeit import timeit
+        from neon_utils.logger import LOG
+
+        def _legacy_resolve_message(function):
+            def wrapper(*args, **kwargs):
+                params = inspect.signature(function).parameters
+                if not any([param in params
+                            for param in ("message", "kwargs")]):
+                    return function(*args, **kwargs)
+                if "message" in params.keys() and len(args):
+                    i = 0
+                    for param in params:
+                        args = list(args)
+                        if param == "message" and i < len(args):
+                            if not args[i]:
+                                args[i] = dig_for_message(50)
+                                return function(*args, **kwargs)
+                        i += 1
+                if not kwargs.get("message") and \
+                        not any([arg for arg in args
+                                 if isinstance(arg, Message)]):
+                    kwargs["message"] = dig_for_message(50)
+                return function(*args, **kwargs)
+            return wrapper
+
+        def speak(utterance, speaker=None, wait=False, message=None):
+            return message
+
+        legacy = _legacy_resolve_message(speak)
+        decorated = resolve_message(speak)
+        message = Message("test")
+        for func in (speak, legacy, decorated):
+            self.assertEqual(func("test", None, False, message), message)
+        number = 20000
+        base = timeit(lambda: speak("test", None, False, message),
+                      number=number)
+        legacy_time = timeit(lambda: legacy("test", None, False, message),
+                             number=number)
+        with patch("inspect.signature", wraps=inspect.signature) as signature:
+            decorated_time = timeit(
+                lambda: decorated("test", None, False, message),
+                number=number)
+        LOG.info(f"resolve_message overhead per call in us: "
+                 f"legacy={round((legacy_time - base) / number * 1E6, 3)}|"
+                 f"cached signature="
+                 f"{round((decorated_time - base) / number * 1E6, 3)}")
+        # The signature is only read when the function is decorated
+        signature.assert_not_called()
+
     def test_request_for_neon(self):
         from neon_utils.message_utils import request_for_neon
 
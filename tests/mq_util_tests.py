@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import json
 import os
 import sys
 import unittest
@@ -34,11 +35,12 @@ from unittest import skip
 import pika
 
 from threading import Thread
-from time import time
+from time import time, sleep
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
 from neon_utils.socket_utils import dict_to_b64
 from neon_utils.mq_utils import *
+from neon_utils.codec_utils import CODEC_VERSION, MAGIC, encode
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 TEST_PATH = os.path.join(ROOT_DIR, "tests", "ccl_files")
@@ -151,5 +153,270 @@ class MqUtilTests(unittest.TestCase):
     #     self.assertFalse(response)
 
 
+class _LocalBroker:
+    """
+    In-memory stand-in for an AMQP broker with a service that responds to
+    requests on `service_queue`
+    """
+    def __init__(self, service_queue: str):
+        from threading import Lock
+        self.service_queue = service_queue
+        self.connections = list()
+        self.declared = list()
+        self.published = list()
+        self.bodies = list()
+        self.consumers = dict()
+        self.delay = dict()
+        self.versioned = False
+        self.capabilities = 0
+        self.headers = list()
+        self._lock = Lock()
+
+    def connect(self, vhost: str):
+        if vhost == "invalid":
+            raise pika.exceptions.ProbableAccessDeniedError()
+        connection = _LocalConnection(self)
+        self.connections.append(connection)
+        return connection
+
+    def publish(self, routing_key: str, body: bytes, properties=None):
+        self.published.append(routing_key)
+        self.bodies.append(body)
+        self.headers.append(getattr(properties, "headers", None))
+        if routing_key == self.service_queue:
+            Thread(target=self._respond, args=(body,), daemon=True).start()
+        elif routing_key in self.consumers:
+            connection, callback = self.consumers[routing_key]
+            connection.events.put(
+                lambda: callback(None, None, properties, body))
+
+    def _respond(self, body: bytes):
+        from types import SimpleNamespace
+        from neon_utils.mq_utils import CODEC_VERSION_HEADER, \
+            CODEC_CAPABILITIES_HEADER
+        from time import sleep
+        request = b64_to_dict(body)
+        if "routing_key" not in request:
+            return
+        sleep(self.delay.get(request["data"], 0))
+        # Unrelated messages on the reply queue are dropped
+        self.publish(request["routing_key"],
+                     dict_to_b64({"message_id": "unrelated"}))
+        response = {"message_id": request["message_id"], "success": True,
+                    "request_data": request["data"]}
+        if self.versioned:
+            self.publish(request["routing_key"], encode(response),
+                         SimpleNamespace(headers={
+                             CODEC_VERSION_HEADER: CODEC_VERSION,
+                             CODEC_CAPABILITIES_HEADER: self.capabilities}))
+        else:
+            self.publish(request["routing_key"], dict_to_b64(response))
+
+
+class _LocalConnection:
+    def __init__(self, broker: _LocalBroker):
+        from queue import Queue
+        from threading import current_thread
+        self.broker = broker
+        self.events = Queue()
+        self.is_open = True
+        self.thread = current_thread()
+
+    def channel(self):
+        return _LocalChannel(self)
+
+    def add_callback_threadsafe(self, callback):
+        self.events.put(callback)
+
+    def process_data_events(self, time_limit: float = 0):
+        from queue import Empty
+        from threading import current_thread
+        assert current_thread() is self.thread
+        try:
+            self.events.get(timeout=time_limit)()
+        except Empty:
+            pass
+
+    def close(self):
+        self.is_open = False
+
+
+class _LocalChannel:
+    def __init__(self, connection: _LocalConnection):
+        self.connection = connection
+
+    def queue_declare(self, queue: str, **kwargs):
+        from types import SimpleNamespace
+        from threading import current_thread
+        assert current_thread() is self.connection.thread
+        queue = queue or f"amq.gen-{len(self.connection.broker.declared)}"
+        self.connection.broker.declared.append((queue, kwargs))
+        return SimpleNamespace(method=SimpleNamespace(queue=queue))
+
+    def basic_consume(self, queue: str, on_message_callback, auto_ack: bool):
+        assert auto_ack
+        self.connection.broker.consumers[queue] = (self.connection,
+                                                   on_message_callback)
+
+    def basic_publish(self, exchange: str, routing_key: str, body: bytes,
+                      properties):
+        from threading import current_thread
+        assert current_thread() is self.connection.thread
+        self.connection.broker.publish(routing_key, body, properties)
+
+
+class MQRPCClientTests(unittest.TestCase):
+    def test_request(self):
+        broker = _LocalBroker("test_service")
+        client = MQRPCClient("/test", {}, connection_factory=broker.connect)
+        self.assertEqual(broker.connections, [])
+
+        response = client.request({"data": "first"}, "test_service")
+        self.assertTrue(response["success"])
+        self.assertEqual(response["request_data"], "first")
+        self.assertEqual(len(response["message_id"]), 32)
+
+        # Concurrent requests share a connection and reply queue
+        responses = dict()
+
+        def _request(i):
+            responses[i] = client.request({"data": i}, "test_service")
+
+        broker.delay = {i: 0.05 * (8 - i) for i in range(8)}
+        threads = [Thread(target=_request, args=(i,)) for i in range(8)]
+        start = time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(time() - start, 1)
+        for i in range(8):
+            self.assertEqual(responses[i]["request_data"], i)
+        self.assertEqual(len(broker.connections), 1)
+        self.assertEqual([q[0] for q in broker.declared],
+                         [client.reply_queue, "test_service"])
+        self.assertEqual(broker.declared[0][1], {"exclusive": True})
+        self.assertEqual(client._pending, {})
+
+        # Specified message_id is preserved
+        response = client.request({"data": "id", "message_id": "test_id"},
+                                  "test_service")
+        self.assertEqual(response["message_id"], "test_id")
+
+        # Requests without responses
+        published = len(broker.published)
+        self.assertEqual(client.send({"data": "sent", "message_id": "sent"},
+                                     "test_service"), "sent")
+        self.assertEqual(len(client.send({"data": "sent"}, "test_service")),
+                         32)
+        timeout = time() + 1
+        while len(broker.published) < published + 2 and time() < timeout:
+            sleep(0.01)
+        self.assertEqual(broker.published[published:],
+                         ["test_service", "test_service"])
+        self.assertEqual(client._pending, {})
+
+        # Timed out request
+        start = time()
+        self.assertEqual(client.request({"data": 1}, "no_service",
+                                        timeout=0.2), {})
+        self.assertLess(time() - start, 1)
+        self.assertEqual(client._pending, {})
+
+        # Closed client reconnects
+        client.close()
+        self.assertFalse(broker.connections[0].is_open)
+        self.assertFalse(client._thread.is_alive())
+        self.assertEqual(client.request({"data": 2}, "test_service")
+                         ["request_data"], 2)
+        self.assertEqual(len(broker.connections), 2)
+        client.close()
+
+    def test_connection_errors(self):
+        broker = _LocalBroker("test_service")
+        client = MQRPCClient("invalid", {}, connection_factory=broker.connect)
+        with self.assertRaises(pika.exceptions.ProbableAccessDeniedError):
+            client.request({"data": 1}, "test_service")
+
+        # Pending requests fail when the connection is lost
+        client = MQRPCClient("/test", {}, connection_factory=broker.connect)
+        broker.delay = {"lost": 0.5}
+        Thread(target=lambda: (sleep(0.1),
+                               broker.connections[0].add_callback_threadsafe(
+                                   broker.connections[0].close)),
+               daemon=True).start()
+        with self.assertRaises(ConnectionError):
+            client.request({"data": "lost"}, "test_service")
+        self.assertEqual(client.request({"data": 1}, "test_service")
+                         ["request_data"], 1)
+        self.assertEqual(len(broker.connections), 2)
+
+        # Requests sent while the I/O thread exits are sent on a new
+        # connection and are not failed by the exiting thread
+        connection = broker.connections[-1]
+        broker.delay = {"slow": 0.5}
+        connection.add_callback_threadsafe(
+            lambda: (connection.close(), sleep(0.2)))
+        while connection.is_open:
+            sleep(0.01)
+        self.assertEqual(client.request({"data": "slow"}, "test_service",
+                                        timeout=5)["request_data"], "slow")
+        self.assertEqual(len(broker.connections), 3)
+        self.assertEqual(client._pending, {})
+        client.close()
+
+    def test_codec_negotiation(self):
+        from unittest.mock import patch
+        from neon_utils.codec_utils import is_legacy, get_capabilities, \
+            CAPABILITY_MSGPACK, CAPABILITY_ZSTD
+        from neon_utils.mq_utils import CODEC_VERSION_HEADER, \
+            CODEC_CAPABILITIES_HEADER
+        broker = _LocalBroker("test_service")
+        client = MQRPCClient("/test", {}, connection_factory=broker.connect)
+
+        # Legacy format until the service responds in the current version
+        client.request({"data": 1}, "test_service")
+        self.assertTrue(is_legacy(broker.bodies[0]))
+        self.assertTrue(is_legacy(broker.bodies[-1]))
+        self.assertEqual(broker.headers[0],
+                         {CODEC_VERSION_HEADER: CODEC_VERSION,
+                          CODEC_CAPABILITIES_HEADER: get_capabilities()})
+        broker.versioned = True
+        self.assertEqual(client.request({"data": 2}, "test_service")
+                         ["request_data"], 2)
+        self.assertTrue(is_legacy(broker.bodies[-3]))
+        self.assertFalse(is_legacy(broker.bodies[-1]))
+        self.assertEqual(client.request({"data": 3}, "test_service")
+                         ["request_data"], 3)
+        self.assertFalse(is_legacy(broker.bodies[-3]))
+
+        # Only formats the service advertised are used
+        broker.capabilities = CAPABILITY_MSGPACK | CAPABILITY_ZSTD
+        with patch("neon_utils.mq_utils.encode", wraps=encode) as encoder:
+            client.request({"data": 4}, "test_service")
+            client.request({"data": 5}, "test_service")
+        self.assertEqual(
+            [call.kwargs["peer_capabilities"] for call in
+             encoder.call_args_list],
+            [0, CAPABILITY_MSGPACK | CAPABILITY_ZSTD])
+        client.close()
+
+        broker.capabilities = 0
+        client = MQRPCClient("/test", {}, connection_factory=broker.connect,
+                             codec_version=CODEC_VERSION)
+        client.request({"data": 6}, "test_service")
+        self.assertFalse(is_legacy(broker.bodies[-3]))
+        self.assertIsInstance(
+            json.loads(bytes(broker.bodies[-3][len(MAGIC) + 2:])), dict)
+        client.close()
+
+    def test_get_mq_client(self):
+        client = get_mq_client("/test")
+        self.assertIsInstance(client, MQRPCClient)
+        self.assertIs(get_mq_client("/test"), client)
+        self.assertIsNot(get_mq_client("/other"), client)
+        self.assertIsNone(client._connection)
+
+
 if __name__ == '__main__':
     unittest.main()
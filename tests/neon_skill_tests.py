@@ -26,6 +26,7 @@
 # NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 # SOFTWARE,  EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import datetime
 import os
 import shutil
@@ -45,7 +46,7 @@ from mock import Mock
 from neon_utils.skills import NeonSkill, CommonMessageSkill, CommonPlaySkill, CommonQuerySkill, NeonFallbackSkill
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-from neon_utils.cache_utils import LRUCache
+from neon_utils.cache_utils import PersistentLRUCache
 from neon_utils.signal_utils import check_for_signal
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 from skills import (PatchedMycroftSkill, TestCMS, TestCPS, TestCQS, TestFBS,
@@ -132,7 +133,7 @@ class SkillObjectTests(unittest.TestCase):
         self.assertIsInstance(skill, NeonSkill)
         self.assertEqual(skill.name, "Test Neon Skill")
 
-        self.assertIsInstance(skill.lru_cache, LRUCache)
+        self.assertIsInstance(skill.lru_cache, PersistentLRUCache)
         self.assertIsInstance(skill.sys_tz, datetime.tzinfo)
         self.assertIsInstance(skill.gui_enabled, bool)
         self.assertIsInstance(skill.neon_core, bool)
@@ -1260,9 +1261,65 @@ class NeonSkillTests(unittest.TestCase):
         self.skill.request_check_timeout(30, ["test_intent_1", f"test_intent"])
         self.assertEqual(set_timeout.call_count, 2)
 
+    def test_current_message(self):
+        from neon_utils.message_utils import get_current_message
+        handled = list()
+
+        def _handler(message):
+            handled.append((message, get_current_message()))
+
+        self.skill.add_event("test.current_message", _handler)
+        message = Message("test.current_message")
+        self.skill.bus.emit(message)
+        self.assertEqual(handled, [(message, message)])
+        self.assertIsNone(get_current_message())
+        self.skill.remove_event("test.current_message")
+
     def test_decorate_api_call_use_lru(self):
-        # TODO
-        pass
+        from tempfile import mkdtemp
+        cache_dir = mkdtemp()
+        db_path = join(cache_dir, "lru_test.sqlite")
+        calls = list()
+
+        def _api_call(query):
+            calls.append(query)
+            return f"result for {query}"
+
+        self.skill.lru_cache.attach_disk(db_path)
+        decorated = self.skill.decorate_api_call_use_lru(_api_call)
+        self.assertEqual(decorated.__name__, "_api_call")
+        self.assertEqual(decorated("neon", query="neon"), "result for neon")
+        self.assertEqual(decorated("neon", query="neon"), "result for neon")
+        self.assertEqual(calls, ["neon"])
+        self.assertIn("neon", self.skill.lru_cache)
+
+        # Cached results persist to a new skill instance
+        skill = get_test_neon_skill(dict())
+        skill.lru_cache.attach_disk(db_path)
+        self.assertIn("neon", skill.lru_cache)
+        decorated = skill.decorate_api_call_use_lru(_api_call)
+        self.assertEqual(decorated("neon", query="neon"), "result for neon")
+        self.assertEqual(calls, ["neon"])
+
+        # Concurrent async calls share one call
+        async def _async_api_call(query):
+            calls.append(query)
+            await asyncio.sleep(0.1)
+            return f"result for {query}"
+
+        async def _call_concurrently():
+            return await asyncio.gather(*[decorated("async", query="async")
+                                          for _ in range(4)])
+
+        decorated = skill.decorate_api_call_use_lru(_async_api_call)
+        self.assertEqual(asyncio.run(_call_concurrently()),
+                         ["result for async"] * 4)
+        self.assertEqual(calls, ["neon", "async"])
+
+        self.skill.lru_cache.clear_disk()
+        skill.lru_cache.disk.close()
+        self.skill.lru_cache.disk.close()
+        shutil.rmtree(cache_dir)
 
 
 class SkillGuiTests(unittest.TestCase):
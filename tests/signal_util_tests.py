@@ -209,6 +209,181 @@ class SignalUtilsTests(unittest.TestCase):
         self.assertIsInstance(neon_utils.signal_utils._BUS, MessageBusClient)
         self.assertIsInstance(neon_utils.signal_utils._MAX_TIMEOUT, int)
 
+    def test_fs_wait_for_signal(self):
+        from threading import Timer
+        from neon_utils.signal_utils import _fs_wait_for_signal_create, \
+            _fs_wait_for_signal_clear, _get_signal_watcher, _get_signal_dir
+        signal_dir = _get_signal_dir()
+        self.assertIsNotNone(_get_signal_watcher(signal_dir))
+        self.assertIs(_get_signal_watcher(signal_dir),
+                      _get_signal_watcher(signal_dir))
+        ovos_utils.signal.check_for_signal("fs_wait_test", 0)
+
+        self.assertFalse(_fs_wait_for_signal_create("fs_wait_test", 0.2))
+        Timer(0.1, ovos_utils.signal.create_signal,
+              ("fs_wait_test",)).start()
+        self.assertTrue(_fs_wait_for_signal_create("fs_wait_test", 5))
+        self.assertTrue(_fs_wait_for_signal_clear("fs_wait_test", 0.2))
+        Timer(0.1, ovos_utils.signal.check_for_signal,
+              ("fs_wait_test", 0)).start()
+        self.assertFalse(_fs_wait_for_signal_clear("fs_wait_test", 5))
+
+    def test_fs_wait_for_signal_benchmark(self):
+        from threading import Timer
+        from time import time, sleep
+        from unittest.mock import patch
+        from neon_utils.logger import LOG
+        from neon_utils.signal_utils import _fs_wait_for_signal_create
+        check_for_signal = ovos_utils.signal.check_for_signal
+
+        def _legacy_wait_for_signal_create(signal_name, timeout=30):
+            expiration = time() + timeout
+            while not check_for_signal(signal_name, -1) and \
+                    time() < expiration:
+                sleep(0.1)
+            return check_for_signal(signal_name, -1)
+
+        def _latency(wait_method):
+            created = None
+            timeout = 5
+
+            def _create():
+                nonlocal created
+                created = time()
+                ovos_utils.signal.create_signal("fs_benchmark")
+
+            check_for_signal("fs_benchmark", 0)
+            start = time()
+            Timer(0.03, _create).start()
+            self.assertTrue(wait_method("fs_benchmark", timeout))
+            # Wait returns when the signal is created, not at the timeout
+            self.assertLess(time() - start, timeout)
+            latency = time() - created
+            check_for_signal("fs_benchmark", 0)
+            return latency
+
+        legacy = [_latency(_legacy_wait_for_signal_create) for _ in range(5)]
+        with patch("neon_utils.signal_utils.sleep") as poll_sleep:
+            event = [_latency(_fs_wait_for_signal_create) for _ in range(5)]
+        LOG.info(f"Signal wait latency: legacy={sum(legacy) / 5}s|"
+                 f"event={sum(event) / 5}s")
+        # Watched waits are woken by file events instead of polling
+        poll_sleep.assert_not_called()
+
+    def test_signal_manager_caller_attribution(self):
+        import inspect
+        from timeit import timeit
+        from unittest.mock import patch
+        from neon_utils.logger import LOG
+        from neon_utils.signal_utils import _get_origin_context
+        messages = list()
+        TestSignalManager(self.test_bus)
+        neon_utils.signal_utils.init_signal_handlers()
+        self.test_bus.on("neon.create_signal", messages.append)
+
+        def _caller():
+            return _get_origin_context(1)
+
+        line = inspect.currentframe().f_lineno + 1
+        context = _caller()
+        self.assertEqual(context, {"origin_module": "tests.signal_util_tests",
+                                   "origin_line": line})
+
+        def _legacy_origin_context():
+            call = inspect.stack()[2]
+            module = inspect.getmodule(call.frame)
+            name = module.__name__ if module else call.filename
+            return {"origin_module": name, "origin_line": call.lineno}
+
+        legacy = timeit(lambda: _legacy_origin_context(), number=100)
+        with patch("inspect.stack", wraps=inspect.stack) as stack:
+            with patch("inspect.getmodule",
+                       wraps=inspect.getmodule) as getmodule:
+                frame = timeit(lambda: _get_origin_context(), number=100)
+        LOG.info(f"Caller attribution: legacy={legacy / 100}s|"
+                 f"frame={frame / 100}s")
+        # Callers are read from frames without building a stack
+        stack.assert_not_called()
+        getmodule.assert_not_called()
+
+        neon_utils.signal_utils._ATTRIBUTE_CALLERS = False
+        try:
+            self.assertEqual(_caller(), {})
+            neon_utils.signal_utils.create_signal("test_signal")
+            self.assertEqual(messages[-1].data, {"signal_name": "test_signal"})
+            self.assertNotIn("origin_module", messages[-1].context)
+        finally:
+            neon_utils.signal_utils._ATTRIBUTE_CALLERS = True
+
+    def test_signal_manager_cache(self):
+        from neon_utils.signal_utils import _init_signal_cache
+        requests = list()
+        manager = TestSignalManager(self.test_bus)
+        neon_utils.signal_utils.init_signal_handlers()
+        self.assertIsNotNone(neon_utils.signal_utils._signal_cache)
+        # FakeBus handles messages synchronously; handle create requests
+        # after local listeners, as they would be by a remote manager
+        self.test_bus.remove("neon.create_signal",
+                             manager._handle_create_signal)
+        self.test_bus.on("neon.create_signal", manager._handle_create_signal)
+        self.test_bus.on("neon.check_for_signal", requests.append)
+        check_for_signal = neon_utils.signal_utils.check_for_signal
+
+        # Persistent checks are answered from cache
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertEqual(len(requests), 1)
+
+        # Checks that may clear a signal are not cached and invalidate it
+        self.assertTrue(check_for_signal("cached", 0))
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertEqual(len(requests), 3)
+
+        # Signal manager responses update the cache
+        self.test_bus.emit(Message("neon.wait_for_signal_clear.cached",
+                                   {"signal_name": "cached",
+                                    "is_set": False}))
+        self.assertFalse(check_for_signal("cached", -1))
+        neon_utils.signal_utils.create_signal("cached")
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertEqual(len(requests), 3)
+
+        # Concurrent callers register state listeners once per signal
+        from threading import Barrier, Thread
+        from time import sleep
+        from unittest.mock import patch
+        from neon_utils.signal_utils import _watch_signal
+
+        class _SlowSet(set):
+            def __contains__(self, item):
+                contained = set.__contains__(self, item)
+                sleep(0.01)
+                return contained
+
+        barrier = Barrier(8)
+        cached_signals = _SlowSet(neon_utils.signal_utils._cached_signals)
+        with patch.object(neon_utils.signal_utils, "_cached_signals",
+                          cached_signals), \
+                patch.object(self.test_bus, "on",
+                             wraps=self.test_bus.on) as on:
+            threads = [Thread(target=lambda: (barrier.wait(),
+                                              _watch_signal("concurrent")))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        neon_utils.signal_utils._cached_signals.update(cached_signals)
+        self.assertEqual(on.call_count, 4)
+
+        # Cache disabled
+        _init_signal_cache(0)
+        self.assertIsNone(neon_utils.signal_utils._signal_cache)
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertTrue(check_for_signal("cached", -1))
+        self.assertEqual(len(requests), 5)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -63,6 +63,12 @@ class SocketUtilsTest(unittest.TestCase):
         self.assertTrue(len(b64_str) > 0)
         self.assertEqual(b64_str, TEST_DICT_B64)
 
+        from neon_utils.codec_utils import CODEC_VERSION, is_legacy
+        data = {"section": {"key": "val", "num": 1}}
+        encoded = dict_to_b64(data, version=CODEC_VERSION)
+        self.assertFalse(is_legacy(encoded))
+        self.assertEqual(b64_to_dict(encoded), data)
+
     def test_02_b64_to_dict(self):
         result_dict = b64_to_dict(TEST_DICT_B64)
         self.assertIsInstance(result_dict, dict)
@@ -80,3 +86,96 @@ class SocketUtilsTest(unittest.TestCase):
                 data = get_packet_data(conn, sequentially=False)
                 self.assertEqual(data, TEST_DICT_B64)
                 conn.sendall(data)
+
+    def test_04_frame_reader(self):
+        sender, receiver = socket.socketpair()
+        frames = [b"", b"small", os.urandom(100000), b"x" * 70000,
+                  os.urandom(5 * 1024 * 1024)]
+
+        def _send():
+            for frame in frames:
+                send_frame(sender, frame)
+            send_frame(sender, memoryview(b"view"))
+            sender.close()
+
+        threading.Thread(target=_send, daemon=True).start()
+        reader = FrameReader(receiver, initial_size=1024)
+        received = list()
+        buffers = list()
+        for frame in reader:
+            self.assertIsInstance(frame, memoryview)
+            received.append(bytes(frame))
+            buffers.append(reader._buffer)
+        self.assertEqual(received, frames + [b"view"])
+        self.assertEqual(len(reader._buffer), 5 * 1024 * 1024)
+        # Buffer is reused once large enough
+        self.assertIs(buffers[-1], buffers[-2])
+        self.assertIs(buffers[0], buffers[1])
+        self.assertIsNone(reader.read_frame())
+        receiver.close()
+
+    def test_05_frame_errors(self):
+        # Oversized frames are rejected
+        sender, receiver = socket.socketpair()
+        with self.assertRaises(ValueError):
+            send_frame(sender, b"x" * 11, max_frame_size=10)
+        send_frame(sender, b"x" * 11)
+        with self.assertRaises(ValueError):
+            FrameReader(receiver, max_frame_size=10).read_frame()
+        sender.close()
+        receiver.close()
+
+        # Connection closed mid-frame
+        for partial in (b"\x00\x00", FRAME_HEADER.pack(10) + b"12345"):
+            sender, receiver = socket.socketpair()
+            sender.sendall(partial)
+            sender.close()
+            with self.assertRaises(ConnectionError):
+                FrameReader(receiver).read_frame()
+            receiver.close()
+
+    def test_06_frame_async(self):
+        import asyncio
+        frames = [b"", b"small", os.urandom(3 * 1024 * 1024)]
+
+        async def _test():
+            sender, receiver = socket.socketpair()
+            reader, receiver_writer = await asyncio.open_connection(
+                sock=receiver)
+            sender_reader, writer = await asyncio.open_connection(sock=sender)
+
+            async def _write():
+                for frame in frames:
+                    await write_frame_async(writer, frame)
+
+            write_task = asyncio.ensure_future(_write())
+            for frame in frames:
+                self.assertEqual(await read_frame_async(reader), frame)
+            await write_task
+
+            # Frames are compatible with the blocking API
+            blocking_sender, blocking_receiver = socket.socketpair()
+            send_frame(blocking_sender, b"blocking")
+            blocking_sender.close()
+            blocking_reader, blocking_writer = await asyncio.open_connection(
+                sock=blocking_receiver)
+            self.assertEqual(await read_frame_async(blocking_reader),
+                             b"blocking")
+            self.assertIsNone(await read_frame_async(blocking_reader))
+            blocking_writer.close()
+
+            await write_frame_async(writer, b"x" * 11)
+            with self.assertRaises(ValueError):
+                await read_frame_async(reader, max_frame_size=10)
+            with self.assertRaises(ValueError):
+                await write_frame_async(writer, b"x" * 11, max_frame_size=10)
+
+            # Connection closed mid-frame
+            await reader.readexactly(11)
+            writer.write(FRAME_HEADER.pack(10) + b"12345")
+            writer.close()
+            with self.assertRaises(ConnectionError):
+                await read_frame_async(reader)
+            receiver_writer.close()
+
+        asyncio.run(_test())
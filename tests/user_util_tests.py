@@ -33,6 +33,7 @@ import unittest
 from copy import deepcopy
 from os.path import join
 from threading import Event
+from time import sleep
 from unittest.mock import patch
 from ovos_bus_client import Message
 
@@ -81,6 +82,75 @@ class UserUtilTests(unittest.TestCase):
         wrapper(test_message_1, user_1)
         wrapper(test_message_2, user_2)
 
+    def test_get_user_prefs_indexed(self):
+        from neon_utils.configuration_utils import dict_update_keys
+        from neon_utils.user_utils import get_user_prefs, \
+            get_default_user_config, _invalidate_user_profile_index
+        profiles = [{"user": {"username": f"user_{i}"}} for i in range(100)]
+        profiles.insert(50, {"invalid": "profile"})
+        message = Message("test", {}, {"username": "user_99",
+                                       "user_profiles": profiles})
+        with patch("neon_utils.user_utils.dict_update_keys",
+                   wraps=dict_update_keys) as update_keys:
+            for _ in range(10):
+                prefs = get_user_prefs(message)
+                self.assertEqual(prefs["user"]["username"], "user_99")
+            update_keys.assert_called_once()
+            self.assertEqual(set(prefs.keys()),
+                             set(get_default_user_config().keys()))
+
+            # Index is rebuilt when profiles change
+            message.context["username"] = "new_user"
+            profiles.append({"user": {"username": "new_user"}})
+            self.assertEqual(get_user_prefs(message)["user"]["username"],
+                             "new_user")
+            self.assertEqual(update_keys.call_count, 2)
+            message.context["user_profiles"] = [{"user": {"username":
+                                                          "new_user",
+                                                          "email": "test"}}]
+            self.assertEqual(get_user_prefs(message)["user"]["email"], "test")
+            self.assertEqual(update_keys.call_count, 3)
+
+            # Index is rebuilt when invalidated
+            message.context["user_profiles"][0] = \
+                {"user": {"username": "new_user", "email": "updated"}}
+            self.assertEqual(get_user_prefs(message)["user"]["email"], "test")
+            _invalidate_user_profile_index(message)
+            self.assertEqual(get_user_prefs(message)["user"]["email"],
+                             "updated")
+
+    def test_preference_copies(self):
+        from copy import deepcopy
+        from neon_utils.user_utils import _get_default_prefs, \
+            get_user_prefs, get_default_user_config
+        defaults = {"user": {"username": "", "email": ""},
+                    "location": {"lat": 1.0, "lng": 2.0},
+                    "units": ["metric"], "tuple": (1, [2])}
+        valid_defaults = deepcopy(defaults)
+
+        # Copies are plain dicts that share no values with defaults
+        prefs = _get_default_prefs(defaults)
+        self.assertEqual(prefs, defaults)
+        prefs["units"].append("imperial")
+        prefs["user"]["username"] = "test"
+        prefs["tuple"][1].append(3)
+        self.assertEqual(defaults, valid_defaults)
+
+        # Preferences for unknown users do not modify defaults
+        default_config = deepcopy(get_default_user_config())
+        prefs = get_user_prefs(Message("", {}, {"username": "unknown",
+                                                "user_profiles": []}))
+        self.assertEqual(prefs["user"]["username"], "unknown")
+        self.assertIsInstance(prefs, dict)
+        prefs["speech"]["tts_language"] = "changed"
+        self.assertEqual(get_default_user_config(), default_config)
+        prefs = get_user_prefs(Message("", {}, {
+            "username": "test",
+            "user_profiles": [{"user": {"username": "test"}}]}))
+        self.assertIsInstance(prefs, dict)
+        prefs["speech"]["tts_language"] = "changed"
+        self.assertEqual(get_default_user_config(), default_config)
+
     @patch("ovos_config.config.Configuration")
     def test_get_default_user_config_from_mycroft_conf(self, config):
         from ovos_config.models import LocalConf
@@ -133,11 +203,16 @@ class UserUtilTests(unittest.TestCase):
             updated.set()
         bus.on("neon.profile_update", _handle_update)
 
+        from neon_utils.user_utils import get_user_prefs
+        self.assertNotEqual(get_user_prefs(test_message)["user"]["email"],
+                            new_email)
         updated.clear()
         update_user_profile({"user": {"email": new_email}}, test_message, bus)
         self.assertEqual(
             test_message.context["user_profiles"][0]["user"]["email"],
             new_email)
+        self.assertEqual(get_user_prefs(test_message)["user"]["email"],
+                         new_email)
         updated.wait(5)
         self.assertIsInstance(update_message, Message)
         self.assertEqual(test_message.context["user_profiles"][0],
@@ -155,6 +230,82 @@ class UserUtilTests(unittest.TestCase):
         updated.wait(5)
         self.assertEqual(update_message.data["profile"], valid_profile)
 
+    def test_profile_update_service(self):
+        from neon_utils.user_utils import update_user_profile, \
+            get_profile_update_service, flush_profile_updates
+        from ovos_utils.messagebus import FakeBus
+
+        profiles = [{"user": {"username": user, "email": "", "name": ""},
+                     "units": {"time": 12, "date": "MDY"}}
+                    for user in ("user_1", "user_2")]
+        messages = [Message("test", {}, {"username": profile["user"]["username"],
+                                         "user_profiles": profiles})
+                    for profile in profiles]
+        updates = list()
+        bus = FakeBus()
+        bus.on("neon.profile_update", updates.append)
+        service = get_profile_update_service(bus)
+        self.assertIs(get_profile_update_service(bus), service)
+        service.delay = 60
+
+        update_user_profile({"user": {"email": "test@neon.ai"}},
+                            messages[0], bus, batch=True)
+        update_user_profile({"user": {"name": "Test"}, "invalid": {}},
+                            messages[0], bus, batch=True)
+        update_user_profile({"units": {"time": 24}}, messages[0], bus,
+                            batch=True)
+        update_user_profile({"units": {"date": "DMY"}}, messages[1], bus,
+                            batch=True)
+        self.assertEqual(profiles[0]["user"]["name"], "Test")
+        self.assertEqual(updates, [])
+
+        flush_profile_updates()
+        self.assertEqual(len(updates), 2)
+        user_1 = [u for u in updates
+                  if u.context["username"] == "user_1"][0]
+        self.assertEqual(user_1.data["profile"], profiles[0])
+        self.assertEqual(user_1.data["delta"],
+                         {"user": {"email": "test@neon.ai", "name": "Test"},
+                          "units": {"time": 24}})
+        user_2 = [u for u in updates
+                  if u.context["username"] == "user_2"][0]
+        self.assertEqual(user_2.data["delta"], {"units": {"date": "DMY"}})
+
+        # Pending updates are emitted after the delay
+        updates.clear()
+        service.delay = 0.1
+        update_user_profile({"user": {"email": ""}}, messages[0], bus,
+                            batch=True)
+        self.assertEqual(updates, [])
+        sleep(0.5)
+        self.assertEqual(len(updates), 1)
+
+        # Unbatched updates emit pending updates for that user immediately
+        updates.clear()
+        service.delay = 60
+        update_user_profile({"user": {"name": ""}}, messages[0], bus,
+                            batch=True)
+        update_user_profile({"units": {"date": "MDY"}}, messages[1], bus,
+                            batch=True)
+        update_user_profile({"user": {"email": "test"}}, messages[0], bus)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0].data["delta"],
+                         {"user": {"name": "", "email": "test"}})
+        flush_profile_updates()
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[1].data["delta"], {"units": {"date": "MDY"}})
+
+        # A shared bus is connected for updates without a bus
+        with patch("neon_utils.user_utils.MessageBusClient") as client:
+            from neon_utils import user_utils
+            user_utils._shared_bus = None
+            update_user_profile({"user": {"email": ""}}, messages[1])
+            update_user_profile({"user": {"email": ""}}, messages[1])
+            client.assert_called_once()
+            client.return_value.run_in_thread.assert_called_once()
+            self.assertEqual(client.return_value.emit.call_count, 2)
+            user_utils._shared_bus = None
+
     def test_update_default_config_on_profile_creation(self):
         test_config_dir = os.path.join(os.path.dirname(__file__),
                                        "user_util_test_config")